@@ -0,0 +1,324 @@
+import asyncio
+import os
+import sys
+import time
+from typing import AsyncIterator, Optional
+
+import serial
+
+if __package__ in (None, ""):
+    # Ejecutado como script (python Cinta_Arduino/async_communication.py): los imports parten de la raíz del repositorio
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Cinta_Arduino.communication import (
+    BINARY_BAUDRATE,
+    DEBOUNCE_MS,
+    FRAME_SENSOR,
+    FRAME_TEXT,
+    MAX_EVENTS,
+    PROTOCOL_BINARY,
+    PROTOCOL_TEXT,
+    TEXT_BAUDRATE,
+    EdgeDetector,
+    EdgeEvent,
+    FrameParser,
+    SerialEvent,
+)
+
+
+class _ArduinoProtocol(asyncio.Protocol):
+    def __init__(self, owner: "AsyncArduinoCommunication"):
+        """Recibe los bytes del puerto en el event loop y los entrega al dueño"""
+        self.owner = owner
+
+    def data_received(self, data: bytes):
+        self.owner._data_received(data, time.monotonic_ns())
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self.owner._connection_lost(exc)
+
+
+class AsyncArduinoCommunication:
+    def __init__(
+        self,
+        port: str = "COM7",
+        baudrate: Optional[int] = None,
+        debounce_ms: float = DEBOUNCE_MS,
+        protocol: str = PROTOCOL_TEXT,
+    ):
+        """
+        Variante asyncio de ArduinoCommunication
+
+        Lee el descriptor del puerto serial con un asyncio.Protocol, sin hilos
+        ni espera activa: todo el estado se modifica dentro del event loop, de
+        modo que la cinta, el brazo y la visión pueden compartir un solo loop.
+        Solo funciona en sistemas POSIX (Linux/Mac).
+
+        Args:
+            port: Puerto serial (ej: '/dev/ttyUSB0')
+            baudrate: Velocidad de comunicación (por defecto según el protocolo)
+            debounce_ms: Tiempo mínimo entre flancos del sensor
+            protocol: PROTOCOL_TEXT o PROTOCOL_BINARY
+        """
+        if protocol not in (PROTOCOL_TEXT, PROTOCOL_BINARY):
+            raise ValueError(f"Protocolo desconocido: {protocol}")
+        if baudrate is None:
+            baudrate = BINARY_BAUDRATE if protocol == PROTOCOL_BINARY else TEXT_BAUDRATE
+        self.port = port
+        self.baudrate = baudrate
+        self.protocol = protocol
+        self.parser = FrameParser()
+        self.edge_detector = EdgeDetector(debounce_ms)
+        self.serial_connection: Optional[serial.Serial] = None
+        self.is_connected = False
+        self.temp_value: Optional[int] = None
+        self.last_update_ns: Optional[int] = None
+        self._read_transport = None
+        self._write_transport = None
+        self._line_buffer = b""
+        self._event_queues: list = []
+        self._edge_queues: list = []
+
+    async def connect(self) -> bool:
+        """
+        Abre el puerto y registra su descriptor en el event loop
+
+        Returns:
+            bool: True si la conexión fue exitosa, False en caso contrario
+        """
+        if os.name != "posix":
+            print("Error: La comunicación asyncio con Arduino solo funciona en POSIX")
+            return False
+
+        loop = asyncio.get_running_loop()
+        try:
+            # pyserial configura la velocidad y el modo raw del terminal
+            self.serial_connection = serial.Serial(
+                port=self.port, baudrate=self.baudrate, timeout=0
+            )
+            fd = self.serial_connection.fileno()
+            self._read_transport, _ = await loop.connect_read_pipe(
+                lambda: _ArduinoProtocol(self), os.fdopen(os.dup(fd), "rb", buffering=0)
+            )
+            self._write_transport, _ = await loop.connect_write_pipe(
+                asyncio.BaseProtocol, os.fdopen(os.dup(fd), "wb", buffering=0)
+            )
+        except (serial.SerialException, OSError) as e:
+            print(f"Error al conectar con Arduino: {e}")
+            self._close_transports()
+            return False
+
+        await asyncio.sleep(2)  # Esperar a que Arduino se reinicie
+        self.is_connected = True
+        print(f"Conectado exitosamente a Arduino en {self.port}")
+        return True
+
+    async def disconnect(self):
+        """Cierra la conexión con Arduino y termina los iteradores abiertos"""
+        if self.serial_connection is None:
+            return
+        self._close_transports()
+        self._connection_lost(None)
+        print("Desconectado de Arduino")
+
+    async def send_command(self, command: str) -> bool:
+        """
+        Envía un comando de texto a Arduino
+
+        Args:
+            command: Comando a enviar
+
+        Returns:
+            bool: True si el comando se envió exitosamente
+        """
+        return await self.send_bytes(f"{command}\n".encode())
+
+    async def send_bytes(self, data: bytes) -> bool:
+        """
+        Envía bytes a Arduino y espera a que el buffer de escritura se vacíe
+
+        Args:
+            data: Bytes a enviar
+
+        Returns:
+            bool: True si los datos se enviaron exitosamente
+        """
+        if not self.is_connected or self._write_transport is None:
+            print("No hay conexión con Arduino")
+            return False
+
+        try:
+            self._write_transport.write(data)
+            while self._write_transport.get_write_buffer_size():
+                await asyncio.sleep(0.001)
+            return True
+        except Exception as e:
+            print(f"Error al enviar comando: {e}")
+            return False
+
+    async def events(self) -> AsyncIterator[SerialEvent]:
+        """
+        Itera sobre los eventos recibidos desde Arduino
+
+        Cada iterador recibe todos los eventos desde el momento en que empieza
+        a iterar; si no los consume, se descartan los más antiguos.
+
+        Yields:
+            SerialEvent: Eventos en orden de llegada
+        """
+        async for event in self._subscribe(self._event_queues):
+            yield event
+
+    async def edges(self) -> AsyncIterator[EdgeEvent]:
+        """
+        Itera sobre los flancos del sensor a medida que llegan
+
+        Yields:
+            EdgeEvent: Flancos ya filtrados por el debounce
+        """
+        async for edge in self._subscribe(self._edge_queues):
+            yield edge
+
+    async def wait_for_edge(
+        self, kind: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Optional[EdgeEvent]:
+        """
+        Espera el próximo flanco del sensor
+
+        Args:
+            kind: "rising", "falling" o None para aceptar cualquiera
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            EdgeEvent: Flanco recibido o None si no llegó ninguno a tiempo
+        """
+
+        async def next_edge():
+            async for edge in self.edges():
+                if kind is None or edge.kind == kind:
+                    return edge
+            return None
+
+        try:
+            return await asyncio.wait_for(next_edge(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def get_temp_value(self) -> Optional[int]:
+        """Obtiene el último valor del sensor"""
+        return self.temp_value
+
+    def get_link_stats(self) -> dict:
+        """Estadísticas del enlace binario (ver ArduinoCommunication.get_link_stats)"""
+        return {
+            "frames": self.parser.frames,
+            "lost_frames": self.parser.lost_frames,
+            "crc_errors": self.parser.crc_errors,
+            "discarded_bytes": self.parser.discarded_bytes,
+        }
+
+    async def _subscribe(self, queues: list):
+        """Registra una cola propia y entrega sus elementos hasta que se cierre la conexión"""
+        cola: asyncio.Queue = asyncio.Queue(maxsize=MAX_EVENTS)
+        queues.append(cola)
+        try:
+            while True:
+                item = await cola.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            queues.remove(cola)
+
+    @staticmethod
+    def _publish(queues: list, item):
+        """Entrega un elemento a cada suscriptor, descartando el más antiguo si está lleno"""
+        for cola in queues:
+            if cola.full():
+                cola.get_nowait()
+            cola.put_nowait(item)
+
+    def _data_received(self, data: bytes, received_ns: int):
+        """Decodifica los bytes recibidos según el protocolo configurado"""
+        if self.protocol == PROTOCOL_BINARY:
+            for frame in self.parser.feed(data, received_ns):
+                if frame.type == FRAME_SENSOR and len(frame.payload) >= 2:
+                    channel, value = frame.payload[0], frame.payload[1]
+                    self._handle_event(
+                        SerialEvent(
+                            "sensor",
+                            value,
+                            frame.payload.hex(),
+                            received_ns,
+                            frame.device_ms,
+                            frame.seq,
+                            channel,
+                        )
+                    )
+                elif frame.type == FRAME_TEXT:
+                    text = frame.payload.decode("ascii", errors="ignore")
+                    self._handle_event(
+                        SerialEvent("text", None, text, received_ns, frame.device_ms, frame.seq)
+                    )
+            return
+
+        self._line_buffer += data
+        *lines, self._line_buffer = self._line_buffer.split(b"\n")
+        for raw in lines:
+            line = raw.decode("utf-8", errors="ignore").strip()
+            if not line:
+                continue
+            if line.isdigit():
+                self._handle_event(SerialEvent("sensor", int(line), line, received_ns))
+            else:
+                self._handle_event(SerialEvent("text", None, line, received_ns))
+
+    def _handle_event(self, event: SerialEvent):
+        """Actualiza el estado del sensor y publica el evento y sus flancos"""
+        self._publish(self._event_queues, event)
+        if event.kind != "sensor" or event.channel != 0:
+            return
+
+        self.temp_value = event.value
+        self.last_update_ns = event.received_ns
+        edge = self.edge_detector.update(event.value, event.received_ns, event.device_ms)
+        if edge is not None:
+            self._publish(self._edge_queues, edge)
+
+    def _connection_lost(self, exc: Optional[Exception]):
+        """Marca la conexión como cerrada y despierta a los iteradores"""
+        if exc is not None:
+            print(f"Error de comunicación serial: {exc}")
+        self.is_connected = False
+        self._publish(self._event_queues, None)
+        self._publish(self._edge_queues, None)
+
+    def _close_transports(self):
+        for transport in (self._read_transport, self._write_transport):
+            if transport is not None:
+                transport.close()
+        self._read_transport = self._write_transport = None
+        if self.serial_connection is not None:
+            self.serial_connection.close()
+            self.serial_connection = None
+
+
+async def example_usage(port: str):
+    """Ejemplo de uso: imprime los flancos del sensor en un solo event loop"""
+    arduino = AsyncArduinoCommunication(port=port)
+    if not await arduino.connect():
+        return
+
+    try:
+        async for edge in arduino.edges():
+            estado = "Luz bloqueada" if edge.kind == "rising" else "Luz presente"
+            print(f"Flanco {edge.kind}: {estado}")
+    finally:
+        await arduino.disconnect()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(example_usage("/dev/ttyUSB0"))
+    except KeyboardInterrupt:
+        print("\nDeteniendo programa...")
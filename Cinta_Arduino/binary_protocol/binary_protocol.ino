@@ -0,0 +1,264 @@
+// Misma lógica que test/test.ino, pero reportando con tramas binarias:
+//   sync (0xA5) | tipo | seq | millis (uint32 LE) | len | payload[len] | crc8
+// El CRC-8 (polinomio 0x07) cubre desde el tipo hasta el final del payload.
+// Ver FrameParser en Cinta_Arduino/communication.py
+//
+// El host puede enviar comandos (FRAME_COMMAND) para arrancar, detener o
+// cambiar la velocidad de la cinta; cada uno se confirma con un FRAME_ACK que
+// devuelve su número de secuencia. El sensor detiene la cinta al instante
+// cuando el haz se interrumpe y la vuelve a arrancar cuando se libera, salvo
+// que el host la haya deshabilitado con CMD_BELT_STOP; en ese caso solo
+// arranca con CMD_BELT_START (de inmediato o en cuanto se libere el haz).
+
+const int ledRojo = 12;
+const int ledVerde = 13;
+const int sensor = 10;
+const int laser = 9;
+const int shutdownButton = 11;
+bool active = true;
+const int PWM1 = 3;
+const int AIN2 = 6;
+const int AIN1 = 5;
+const int STBY = 7;
+int speed = 230;
+
+const byte FRAME_SYNC = 0xA5;
+const byte FRAME_SENSOR = 0x01;
+const byte FRAME_TEXT = 0x02;
+const byte FRAME_COMMAND = 0x10;
+const byte FRAME_ACK = 0x11;
+const byte CANAL_CINTA = 0;
+
+const byte CMD_BELT_START = 0x01;
+const byte CMD_BELT_STOP = 0x02;
+const byte CMD_BELT_SPEED = 0x03;
+const byte ACK_OK = 0x00;
+const byte ACK_UNKNOWN_COMMAND = 0x01;
+
+const byte FRAME_HEADER_SIZE = 8;
+const byte FRAME_MAX_PAYLOAD = 32;
+
+// Además de cada cambio, el nivel del sensor se reenvía periódicamente
+const unsigned long PERIODO_REPORTE_MS = 100;
+
+byte seq = 0;
+int ultimoValor = -1;
+unsigned long ultimoReporte = 0;
+bool cintaHabilitada = true;
+
+byte rx[FRAME_HEADER_SIZE + FRAME_MAX_PAYLOAD + 1];
+byte rxLen = 0;
+
+void setup() {
+  initializePines();
+  initialValues();
+  detenerMotor();
+
+  Serial.begin(115200);
+  enviarTexto("Arduino iniciado");
+}
+
+void loop() {
+  leerComandos();
+  handleButton();
+  if (active == true){
+    if (digitalRead(laser) == LOW) {
+      digitalWrite(laser, HIGH);
+    }
+    handleActivationLogic();
+  } else {
+    stopProgram();
+  }
+}
+
+byte crc8(byte crc, byte data) {
+  crc ^= data;
+  for (byte i = 0; i < 8; i++) {
+    crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+  }
+  return crc;
+}
+
+void enviarTrama(byte tipo, const byte *payload, byte len) {
+  unsigned long ahora = millis();
+  byte cabecera[7] = {
+    tipo,
+    seq++,
+    (byte)(ahora & 0xFF),
+    (byte)((ahora >> 8) & 0xFF),
+    (byte)((ahora >> 16) & 0xFF),
+    (byte)((ahora >> 24) & 0xFF),
+    len
+  };
+
+  byte crc = 0;
+  for (byte i = 0; i < sizeof(cabecera); i++) {
+    crc = crc8(crc, cabecera[i]);
+  }
+  for (byte i = 0; i < len; i++) {
+    crc = crc8(crc, payload[i]);
+  }
+
+  Serial.write(FRAME_SYNC);
+  Serial.write(cabecera, sizeof(cabecera));
+  Serial.write(payload, len);
+  Serial.write(crc);
+}
+
+void enviarSensor(byte canal, byte valor) {
+  byte payload[2] = {canal, valor};
+  enviarTrama(FRAME_SENSOR, payload, sizeof(payload));
+}
+
+void enviarTexto(const char *mensaje) {
+  enviarTrama(FRAME_TEXT, (const byte *)mensaje, strlen(mensaje));
+}
+
+void enviarAck(byte seqComando, byte comando, byte estado) {
+  byte payload[3] = {seqComando, comando, estado};
+  enviarTrama(FRAME_ACK, payload, sizeof(payload));
+}
+
+void ejecutarComando(byte seqComando, byte comando, byte argumento) {
+  if (comando == CMD_BELT_START) {
+    cintaHabilitada = true;
+    if (digitalRead(sensor) == LOW) {
+      girarHorario();
+    }
+  } else if (comando == CMD_BELT_STOP) {
+    cintaHabilitada = false;
+    detenerMotor();
+  } else if (comando == CMD_BELT_SPEED) {
+    speed = argumento;
+    if (cintaHabilitada && digitalRead(sensor) == LOW) {
+      girarHorario();
+    }
+  } else {
+    enviarAck(seqComando, comando, ACK_UNKNOWN_COMMAND);
+    return;
+  }
+  enviarAck(seqComando, comando, ACK_OK);
+}
+
+// Acumula bytes hasta completar una trama; ante sync falso o CRC inválido
+// descarta el primer byte y se resincroniza con el siguiente 0xA5
+void leerComandos() {
+  while (Serial.available() > 0) {
+    byte b = Serial.read();
+    if (rxLen == 0 && b != FRAME_SYNC) {
+      continue;
+    }
+    rx[rxLen++] = b;
+
+    while (rxLen > 0) {
+      if (rxLen < FRAME_HEADER_SIZE) {
+        break;
+      }
+      byte len = rx[7];
+      bool valida = len <= FRAME_MAX_PAYLOAD;
+      if (valida && rxLen < FRAME_HEADER_SIZE + len + 1) {
+        break;
+      }
+      if (valida) {
+        byte crc = 0;
+        for (byte i = 1; i < FRAME_HEADER_SIZE + len; i++) {
+          crc = crc8(crc, rx[i]);
+        }
+        valida = crc == rx[FRAME_HEADER_SIZE + len];
+      }
+      if (valida) {
+        if (rx[1] == FRAME_COMMAND && len >= 2) {
+          ejecutarComando(rx[2], rx[8], rx[9]);
+        }
+        rxLen = 0;
+        break;
+      }
+
+      // Resincronizar a partir del siguiente byte de sync
+      byte inicio = 1;
+      while (inicio < rxLen && rx[inicio] != FRAME_SYNC) {
+        inicio++;
+      }
+      for (byte i = inicio; i < rxLen; i++) {
+        rx[i - inicio] = rx[i];
+      }
+      rxLen -= inicio;
+    }
+  }
+}
+
+void initializePines() {
+  pinMode(sensor,INPUT);
+  pinMode(ledRojo,OUTPUT);
+  pinMode(ledVerde, OUTPUT);
+  pinMode(laser, OUTPUT);
+  pinMode(shutdownButton, INPUT);
+  pinMode(AIN1, OUTPUT);
+  pinMode(AIN2, OUTPUT);
+  pinMode(PWM1, OUTPUT);
+  pinMode(STBY, OUTPUT);
+}
+
+void initialValues() {
+  digitalWrite(laser, HIGH);
+  digitalWrite(ledRojo, LOW);
+  digitalWrite(ledVerde, LOW);
+}
+
+void handleButton() {
+  int buttonState = digitalRead(shutdownButton);
+  if (buttonState == LOW) {
+    active = !active;
+    enviarTexto(active ? "Programa activado" : "Programa desactivado");
+    delay(500);
+  }
+}
+
+void handleActivationLogic() {
+  int temp = digitalRead(sensor);
+  unsigned long ahora = millis();
+
+  // Reportar en cuanto cambia el nivel y como latido cada PERIODO_REPORTE_MS
+  if (temp != ultimoValor || ahora - ultimoReporte >= PERIODO_REPORTE_MS) {
+    enviarSensor(CANAL_CINTA, temp);
+    ultimoReporte = ahora;
+  }
+
+  if (temp != ultimoValor) {
+    if(temp==HIGH) {               //HIGH  means,light got blocked
+      digitalWrite(ledRojo, HIGH);
+      digitalWrite(ledVerde, LOW);
+      detenerMotor();
+    } else {
+      digitalWrite(ledVerde, HIGH);
+      digitalWrite(ledRojo, LOW);
+      // Con la cinta deshabilitada por el host solo arranca con CMD_BELT_START
+      if (cintaHabilitada) {
+        girarHorario();
+      }
+    }
+    ultimoValor = temp;
+  }
+}
+
+void stopProgram() {
+  detenerMotor();
+  digitalWrite(laser, LOW);
+  digitalWrite(ledRojo, LOW);
+  digitalWrite(ledVerde, LOW);
+  ultimoValor = -1;
+}
+
+void girarHorario() {
+  digitalWrite(AIN1, HIGH);
+  digitalWrite(STBY, HIGH);
+  digitalWrite(AIN2, LOW);
+  analogWrite(PWM1, speed);
+}
+
+void detenerMotor() {
+  digitalWrite(AIN1, LOW);
+  digitalWrite(STBY, LOW);
+  digitalWrite(AIN2, LOW);
+  analogWrite(PWM1, 0);
+}
@@ -1,21 +1,283 @@
 import serial
 import time
 import threading
-from typing import Optional, Callable
+import queue
+from collections import deque
+from typing import IO, Optional, Callable, Iterator, NamedTuple
+
+# Capacidad de la cola de eventos; si nadie la consume se descartan los más antiguos
+MAX_EVENTS = 1000
+
+# Tras aceptar un flanco se ignoran los cambios del sensor durante este tiempo.
+# El sketch reenvía el nivel en cada ciclo, así que el primer valor posterior
+# corrige el estado si el rebote terminó en el nivel contrario.
+DEBOUNCE_MS = 30
+
+# Protocolos soportados: líneas de texto (test.ino) o tramas binarias (binary_protocol.ino)
+PROTOCOL_TEXT = "text"
+PROTOCOL_BINARY = "binary"
+TEXT_BAUDRATE = 9600
+BINARY_BAUDRATE = 115200
+
+# Trama binaria:
+#   sync (0xA5) | tipo | seq | millis (uint32 LE) | len | payload[len] | crc8
+# El CRC-8 (polinomio 0x07) cubre desde el tipo hasta el final del payload.
+FRAME_SYNC = 0xA5
+FRAME_HEADER_SIZE = 8
+FRAME_MAX_PAYLOAD = 32
+FRAME_SENSOR = 0x01  # payload: canal (uint8), valor (uint8)
+FRAME_TEXT = 0x02  # payload: mensaje ASCII
+FRAME_COMMAND = 0x10  # host -> Arduino, payload: comando, argumento
+FRAME_ACK = 0x11  # Arduino -> host, payload: seq del comando, comando, estado
+
+# Cabecera de los archivos de grabación (ver start_recording y replay.py)
+RECORDING_HEADER = "# arduino-recording v1"
+
+# Comandos de la cinta (protocolo binario)
+CMD_BELT_START = 0x01
+CMD_BELT_STOP = 0x02
+CMD_BELT_SPEED = 0x03  # argumento: PWM 0-255
+ACK_OK = 0x00
+ACK_UNKNOWN_COMMAND = 0x01
+
+# Tiempo máximo de espera de un ACK y reintentos antes de dar el comando por perdido
+ACK_TIMEOUT = 0.1
+COMMAND_RETRIES = 2
+
+# Intervalo con que quien espera un flanco comprueba que el hilo de monitoreo siga vivo
+EDGE_POLL_INTERVAL = 0.5
+
+
+class SerialEvent(NamedTuple):
+    """Evento recibido desde Arduino con su tiempo de recepción en el host"""
+
+    kind: str  # "sensor" para valores numéricos, "text" para cualquier otra línea
+    value: Optional[int]
+    raw: str
+    received_ns: int  # time.monotonic_ns() al recibir la línea
+    device_ms: Optional[int] = None  # millis() del Arduino (solo protocolo binario)
+    seq: Optional[int] = None  # Número de secuencia de la trama
+    channel: int = 0  # Canal del sensor
+
+
+class EdgeEvent(NamedTuple):
+    """Flanco del sensor ya filtrado por el debounce"""
+
+    kind: str  # "rising" cuando el haz se interrumpe, "falling" cuando se libera
+    value: int
+    received_ns: int  # time.monotonic_ns() al recibir la línea que lo produjo
+    device_ms: Optional[int] = None  # millis() del Arduino al medir el valor
+
+
+class Frame(NamedTuple):
+    """Trama binaria decodificada"""
+
+    type: int
+    seq: int
+    device_ms: int
+    payload: bytes
+    received_ns: int
+
+
+def crc8(data: bytes) -> int:
+    """
+    Calcula el CRC-8 (polinomio 0x07, valor inicial 0) de un bloque de bytes
+
+    Args:
+        data: Bytes a verificar
+
+    Returns:
+        int: CRC de 8 bits
+    """
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def encode_frame(frame_type: int, seq: int, device_ms: int, payload: bytes = b"") -> bytes:
+    """
+    Construye una trama binaria completa
+
+    Args:
+        frame_type: Tipo de trama (FRAME_*)
+        seq: Número de secuencia (0-255)
+        device_ms: Marca de tiempo en milisegundos
+        payload: Datos de la trama (hasta FRAME_MAX_PAYLOAD bytes)
+
+    Returns:
+        bytes: Trama lista para enviar
+    """
+    body = (
+        bytes([frame_type, seq & 0xFF])
+        + (device_ms & 0xFFFFFFFF).to_bytes(4, "little")
+        + bytes([len(payload)])
+        + payload
+    )
+    return bytes([FRAME_SYNC]) + body + bytes([crc8(body)])
+
+
+class FrameParser:
+    def __init__(self):
+        """
+        Decodifica tramas binarias a partir de un flujo de bytes
+
+        Se resincroniza buscando el siguiente byte de sync cuando una trama
+        tiene longitud inválida o CRC incorrecto, y cuenta las tramas perdidas
+        a partir de los saltos en el número de secuencia.
+        """
+        self._buffer = bytearray()
+        self._expected_seq: Optional[int] = None
+        self.frames = 0
+        self.crc_errors = 0
+        self.lost_frames = 0
+        self.discarded_bytes = 0
+
+    def feed(self, data: bytes, received_ns: Optional[int] = None) -> list:
+        """
+        Agrega bytes recibidos y devuelve las tramas completas
+
+        Args:
+            data: Bytes leídos del puerto
+            received_ns: Instante de recepción (time.monotonic_ns())
+
+        Returns:
+            list: Tramas válidas (Frame) en orden de llegada
+        """
+        if received_ns is None:
+            received_ns = time.monotonic_ns()
+        self._buffer += data
+        frames = []
+
+        while True:
+            start = self._buffer.find(FRAME_SYNC)
+            if start < 0:
+                self.discarded_bytes += len(self._buffer)
+                self._buffer.clear()
+                break
+            if start:
+                self.discarded_bytes += start
+                del self._buffer[:start]
+            if len(self._buffer) < FRAME_HEADER_SIZE:
+                break
+
+            length = self._buffer[7]
+            if length > FRAME_MAX_PAYLOAD:
+                # Sync falso: descartar el byte y buscar el siguiente
+                self.discarded_bytes += 1
+                del self._buffer[0]
+                continue
+
+            size = FRAME_HEADER_SIZE + length + 1
+            if len(self._buffer) < size:
+                break
+
+            body = bytes(self._buffer[1 : size - 1])
+            if crc8(body) != self._buffer[size - 1]:
+                self.crc_errors += 1
+                self.discarded_bytes += 1
+                del self._buffer[0]
+                continue
+
+            del self._buffer[:size]
+            frame = Frame(
+                type=body[0],
+                seq=body[1],
+                device_ms=int.from_bytes(body[2:6], "little"),
+                payload=body[7:],
+                received_ns=received_ns,
+            )
+            self._track_sequence(frame.seq)
+            self.frames += 1
+            frames.append(frame)
+
+        return frames
+
+    def _track_sequence(self, seq: int):
+        """Acumula las tramas perdidas según el salto del número de secuencia"""
+        if self._expected_seq is not None:
+            self.lost_frames += (seq - self._expected_seq) & 0xFF
+        self._expected_seq = (seq + 1) & 0xFF
+
+
+class EdgeDetector:
+    def __init__(self, debounce_ms: float = DEBOUNCE_MS):
+        """
+        Convierte valores del sensor en flancos con debounce
+
+        El primer cambio se acepta de inmediato; los cambios dentro de
+        debounce_ms desde el último flanco aceptado se ignoran.
+
+        Args:
+            debounce_ms: Tiempo mínimo entre flancos del sensor
+        """
+        self.debounce_ns = int(debounce_ms * 1_000_000)
+        self.stable_level = 0
+        self.last_edge_ns: Optional[int] = None
+
+    def update(
+        self, value: int, received_ns: int, device_ms: Optional[int] = None
+    ) -> Optional[EdgeEvent]:
+        """
+        Procesa un valor del sensor
+
+        Args:
+            value: Valor leído
+            received_ns: Instante de recepción (time.monotonic_ns())
+            device_ms: millis() del Arduino, si se conoce
+
+        Returns:
+            EdgeEvent: Flanco detectado o None si el nivel no cambió
+        """
+        level = 1 if value else 0
+        if level == self.stable_level:
+            return None
+        if (
+            self.last_edge_ns is not None
+            and received_ns - self.last_edge_ns < self.debounce_ns
+        ):
+            return None
+
+        self.stable_level = level
+        self.last_edge_ns = received_ns
+        return EdgeEvent("rising" if level else "falling", value, received_ns, device_ms)
 
 
 class ArduinoCommunication:
-    def __init__(self, port: str = "COM7", baudrate: int = 9600, timeout: int = 1):
+    def __init__(
+        self,
+        port: str = "COM7",
+        baudrate: Optional[int] = None,
+        timeout: int = 1,
+        debounce_ms: float = DEBOUNCE_MS,
+        protocol: str = PROTOCOL_TEXT,
+    ):
         """
         Inicializa la comunicación con Arduino
 
         Args:
             port: Puerto serial (ej: 'COM3' en Windows, '/dev/ttyUSB0' en Linux)
-            baudrate: Velocidad de comunicación
+            baudrate: Velocidad de comunicación (por defecto según el protocolo)
             timeout: Tiempo de espera para operaciones de lectura
+            debounce_ms: Tiempo mínimo entre flancos del sensor
+            protocol: PROTOCOL_TEXT o PROTOCOL_BINARY
         """
+        if protocol not in (PROTOCOL_TEXT, PROTOCOL_BINARY):
+            raise ValueError(f"Protocolo desconocido: {protocol}")
+        if baudrate is None:
+            baudrate = BINARY_BAUDRATE if protocol == PROTOCOL_BINARY else TEXT_BAUDRATE
         self.port = port
         self.baudrate = baudrate
+        self.protocol = protocol
+        self.parser = FrameParser()
+        self.command_latencies_ns: "deque[int]" = deque(maxlen=MAX_EVENTS)
+        self.command_timeouts = 0
+        self._command_seq = 0
+        self._pending_acks: dict = {}
+        self._command_lock = threading.Lock()
+        self._write_lock = threading.Lock()
         self.timeout = timeout
         self.serial_connection: Optional[serial.Serial] = None
         self.is_connected = False
@@ -23,7 +285,17 @@ class ArduinoCommunication:
         self.monitor_thread: Optional[threading.Thread] = None
         self.temp_value = None
         self.last_update = None
+        self.last_update_ns: Optional[int] = None
         self.callback_function: Optional[Callable] = None
+        self.events: "queue.Queue[SerialEvent]" = queue.Queue(maxsize=MAX_EVENTS)
+        self._read_buffer = b""
+        self._line_received_ns: Optional[int] = None
+        self.edge_detector = EdgeDetector(debounce_ms)
+        self._edge_condition = threading.Condition()
+        self._edges: "deque[tuple[int, EdgeEvent]]" = deque(maxlen=MAX_EVENTS)
+        self._edge_seq = 0
+        self._recording: Optional[IO[str]] = None
+        self._recording_start_ns = 0
 
     def connect(self) -> bool:
         """
@@ -52,6 +324,53 @@ class ArduinoCommunication:
             self.serial_connection.close()
             self.is_connected = False
             print("Desconectado de Arduino")
+        self.stop_recording()
+
+    def start_recording(self, path: str) -> bool:
+        """
+        Graba los bytes recibidos con su instante de recepción
+
+        Cada línea del archivo tiene el tiempo en ns desde el inicio de la
+        grabación y los bytes en hexadecimal, tal como llegaron del puerto; así
+        la grabación sirve para ambos protocolos y se puede reproducir con
+        Cinta_Arduino/replay.py.
+
+        Args:
+            path: Archivo de salida
+
+        Returns:
+            bool: True si la grabación comenzó
+        """
+        self.stop_recording()
+        try:
+            recording = open(path, "w")
+        except OSError as e:
+            print(f"No se pudo abrir el archivo de grabación: {e}")
+            return False
+
+        recording.write(
+            f"{RECORDING_HEADER} protocol={self.protocol} baudrate={self.baudrate}\n"
+        )
+        self._recording_start_ns = time.monotonic_ns()
+        self._recording = recording
+        print(f"Grabando datos de Arduino en {path}")
+        return True
+
+    def stop_recording(self):
+        """Detiene la grabación en curso"""
+        recording, self._recording = self._recording, None
+        if recording is not None:
+            recording.close()
+            print("Grabación detenida")
+
+    def _record(self, data: bytes, received_ns: int):
+        """Agrega un bloque de bytes recibido a la grabación"""
+        recording = self._recording
+        if recording is not None:
+            try:
+                recording.write(f"{received_ns - self._recording_start_ns} {data.hex()}\n")
+            except ValueError:
+                pass  # La grabación se cerró desde otro hilo
 
     def send_command(self, command: str) -> bool:
         """
@@ -68,16 +387,124 @@ class ArduinoCommunication:
             return False
 
         try:
-            self.serial_connection.write(f"{command}\n".encode())
+            with self._write_lock:
+                self.serial_connection.write(f"{command}\n".encode())
             return True
         except Exception as e:
             print(f"Error al enviar comando: {e}")
             return False
 
+    def send_frame_command(
+        self,
+        command: int,
+        argument: int = 0,
+        timeout: float = ACK_TIMEOUT,
+        retries: int = COMMAND_RETRIES,
+    ) -> bool:
+        """
+        Envía un comando binario y espera su ACK
+
+        Cada intento usa un número de secuencia nuevo; el ACK lo devuelve en su
+        payload y el tiempo entre el envío y el ACK se registra como latencia
+        de ida y vuelta.
+
+        Args:
+            command: Código del comando (CMD_BELT_*)
+            argument: Argumento de 8 bits
+            timeout: Tiempo máximo de espera del ACK por intento
+            retries: Reintentos si no llega el ACK
+
+        Returns:
+            bool: True si Arduino confirmó el comando
+        """
+        if self.protocol != PROTOCOL_BINARY:
+            print("Los comandos de la cinta requieren el protocolo binario")
+            return False
+        if not self.is_connected:
+            print("No hay conexión con Arduino")
+            return False
+
+        for _ in range(retries + 1):
+            with self._command_lock:
+                seq = self._command_seq
+                self._command_seq = (seq + 1) & 0xFF
+                ack = threading.Event()
+                self._pending_acks[seq] = [ack, None, None]
+
+            frame = encode_frame(
+                FRAME_COMMAND, seq, time.monotonic_ns() // 1_000_000, bytes([command, argument])
+            )
+            try:
+                sent_ns = time.monotonic_ns()
+                with self._write_lock:
+                    self.serial_connection.write(frame)
+            except Exception as e:
+                print(f"Error al enviar comando: {e}")
+                with self._command_lock:
+                    self._pending_acks.pop(seq, None)
+                return False
+
+            received = ack.wait(timeout)
+            with self._command_lock:
+                _, status, ack_ns = self._pending_acks.pop(seq)
+            if not received:
+                self.command_timeouts += 1
+                print(f"Sin ACK para el comando {command:#04x} (seq {seq}), reintentando...")
+                continue
+
+            self.command_latencies_ns.append(ack_ns - sent_ns)
+            if status != ACK_OK:
+                print(f"Arduino rechazó el comando {command:#04x} (estado {status})")
+                return False
+            return True
+
+        print(f"El comando {command:#04x} no fue confirmado por Arduino")
+        return False
+
+    def start_belt(self) -> bool:
+        """Arranca la cinta transportadora"""
+        return self.send_frame_command(CMD_BELT_START)
+
+    def stop_belt(self) -> bool:
+        """Detiene la cinta transportadora"""
+        return self.send_frame_command(CMD_BELT_STOP)
+
+    def set_belt_speed(self, speed: int) -> bool:
+        """
+        Cambia la velocidad de la cinta
+
+        Args:
+            speed: PWM del motor (0-255)
+        """
+        return self.send_frame_command(CMD_BELT_SPEED, max(0, min(255, int(speed))))
+
+    def get_command_stats(self) -> dict:
+        """
+        Obtiene las latencias de ida y vuelta de los comandos confirmados
+
+        Returns:
+            dict: Cantidad, timeouts y percentiles p50/p99/máximo en milisegundos
+        """
+        latencies = sorted(self.command_latencies_ns)
+        if not latencies:
+            return {"count": 0, "timeouts": self.command_timeouts}
+        return {
+            "count": len(latencies),
+            "timeouts": self.command_timeouts,
+            "p50_ms": latencies[len(latencies) // 2] / 1e6,
+            "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1e6,
+            "max_ms": latencies[-1] / 1e6,
+        }
+
     def read_line(self) -> Optional[str]:
         """
         Lee una línea del puerto serial
 
+        Bloquea en el puerto hasta recibir datos o hasta que se cumpla el
+        timeout de lectura; las líneas incompletas quedan en un buffer interno
+        hasta que llega el resto. El instante de recepción queda en
+        _line_received_ns.
+
         Returns:
             str: Línea leída o None si no hay datos
         """
@@ -85,14 +512,23 @@ class ArduinoCommunication:
             return None
 
         try:
-            # Verificar si hay datos disponibles
-            if self.serial_connection.in_waiting > 0:
-                line = self.serial_connection.readline()
-                if line:
-                    # Decodificar y limpiar la línea
-                    decoded_line = line.decode("utf-8", errors="ignore").strip()
-                    if decoded_line:  # Solo retornar líneas no vacías
-                        return decoded_line
+            while b"\n" not in self._read_buffer:
+                # read(1) bloquea hasta que llega un byte o vence el timeout
+                data = self.serial_connection.read(1)
+                if not data:
+                    return None
+                pending = self.serial_connection.in_waiting
+                if pending:
+                    data += self.serial_connection.read(pending)
+                self._line_received_ns = time.monotonic_ns()
+                self._record(data, self._line_received_ns)
+                self._read_buffer += data
+
+            line, self._read_buffer = self._read_buffer.split(b"\n", 1)
+            # Decodificar y limpiar la línea
+            decoded_line = line.decode("utf-8", errors="ignore").strip()
+            if decoded_line:  # Solo retornar líneas no vacías
+                return decoded_line
         except serial.SerialException as e:
             print(f"Error de comunicación serial: {e}")
             self.is_connected = False
@@ -103,6 +539,50 @@ class ArduinoCommunication:
 
         return None
 
+    def read_frames(self) -> list:
+        """
+        Lee tramas binarias del puerto serial
+
+        Bloquea hasta recibir datos o hasta que se cumpla el timeout de lectura.
+
+        Returns:
+            list: Tramas completas recibidas (vacía si no llegó ninguna)
+        """
+        if not self.is_connected or not self.serial_connection:
+            return []
+
+        try:
+            data = self.serial_connection.read(1)
+            if not data:
+                return []
+            pending = self.serial_connection.in_waiting
+            if pending:
+                data += self.serial_connection.read(pending)
+            received_ns = time.monotonic_ns()
+            self._record(data, received_ns)
+            return self.parser.feed(data, received_ns)
+        except serial.SerialException as e:
+            print(f"Error de comunicación serial: {e}")
+            self.is_connected = False
+        except Exception as e:
+            print(f"Error inesperado al leer datos: {e}")
+
+        return []
+
+    def get_link_stats(self) -> dict:
+        """
+        Obtiene las estadísticas del enlace binario
+
+        Returns:
+            dict: Tramas recibidas, perdidas, con CRC inválido y bytes descartados
+        """
+        return {
+            "frames": self.parser.frames,
+            "lost_frames": self.parser.lost_frames,
+            "crc_errors": self.parser.crc_errors,
+            "discarded_bytes": self.parser.discarded_bytes,
+        }
+
     def get_temp_value(self) -> Optional[int]:
         """
         Obtiene el valor actual de la variable temp
@@ -112,6 +592,100 @@ class ArduinoCommunication:
         """
         return self.temp_value
 
+    def get_event(self, timeout: Optional[float] = None) -> Optional[SerialEvent]:
+        """
+        Obtiene el siguiente evento recibido
+
+        Args:
+            timeout: Tiempo máximo de espera en segundos (None espera indefinidamente)
+
+        Returns:
+            SerialEvent: Evento o None si no llegó ninguno a tiempo
+        """
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def wait_for_edge(
+        self, kind: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Optional[EdgeEvent]:
+        """
+        Bloquea hasta el próximo flanco del sensor
+
+        Args:
+            kind: "rising", "falling" o None para aceptar cualquiera
+            timeout: Tiempo máximo de espera en segundos (None espera indefinidamente)
+
+        Returns:
+            EdgeEvent: Flanco recibido, o None si no llegó ninguno a tiempo o el
+            monitoreo terminó
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._edge_condition:
+            cursor = self._edge_seq
+            while True:
+                for seq, edge in self._edges:
+                    if seq > cursor and (kind is None or edge.kind == kind):
+                        return edge
+                cursor = self._edge_seq
+                if not self._monitor_alive():
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._edge_condition.wait(self._edge_wait_time(remaining))
+
+    def edges(self, timeout: Optional[float] = None) -> Iterator[EdgeEvent]:
+        """
+        Itera sobre los flancos del sensor a medida que llegan
+
+        Cada iterador mantiene su propia posición, de modo que no pierde flancos
+        aunque tarde en consumirlos (hasta MAX_EVENTS pendientes).
+
+        La iteración también termina cuando se detiene el monitoreo o el hilo
+        de monitoreo muere, tras entregar los flancos que quedaban pendientes.
+
+        Args:
+            timeout: Termina la iteración si no llega ningún flanco en este tiempo
+
+        Yields:
+            EdgeEvent: Flancos en orden de llegada
+        """
+        with self._edge_condition:
+            cursor = self._edge_seq
+
+        while True:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            with self._edge_condition:
+                while self._edge_seq <= cursor and self._monitor_alive():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return
+                    self._edge_condition.wait(self._edge_wait_time(remaining))
+                pending = [(seq, edge) for seq, edge in self._edges if seq > cursor]
+                if not pending:
+                    return
+                cursor = self._edge_seq
+
+            for _, edge in pending:
+                yield edge
+
+    def _monitor_alive(self) -> bool:
+        """Indica si el monitoreo sigue activo y su hilo no terminó"""
+        return (
+            self.is_monitoring
+            and self.monitor_thread is not None
+            and self.monitor_thread.is_alive()
+        )
+
+    @staticmethod
+    def _edge_wait_time(remaining: Optional[float]) -> float:
+        """Tiempo de espera de la condición; acotado para revisar el hilo de monitoreo"""
+        if remaining is None:
+            return EDGE_POLL_INTERVAL
+        return min(remaining, EDGE_POLL_INTERVAL)
+
     def get_last_update(self) -> Optional[float]:
         """
         Obtiene el timestamp de la última actualización
@@ -141,24 +715,43 @@ class ArduinoCommunication:
     def stop_monitoring(self):
         """Detiene el monitoreo continuo"""
         self.is_monitoring = False
+        with self._edge_condition:
+            # Despertar a quien esté iterando sobre los flancos
+            self._edge_condition.notify_all()
         if self.monitor_thread:
-            self.monitor_thread.join(timeout=1)
+            # El hilo sale a más tardar cuando vence el timeout de lectura
+            self.monitor_thread.join(timeout=self.timeout + 1)
         print("Monitoreo detenido")
 
     def _monitor_loop(self):
         """Bucle interno para monitorear datos de Arduino"""
+        try:
+            self._monitor_loop_body()
+        finally:
+            # Despertar a quien espere flancos aunque el hilo termine por un error
+            if self.monitor_thread is threading.current_thread():
+                self.is_monitoring = False
+            with self._edge_condition:
+                self._edge_condition.notify_all()
+
+    def _monitor_loop_body(self):
+        """Lee el puerto hasta que se detiene el monitoreo o se acumulan errores"""
         consecutive_errors = 0
         max_consecutive_errors = 5
 
         while self.is_monitoring and self.is_connected:
             try:
+                # Bloquea en el puerto; no hay espera activa cuando no llegan datos
+                if self.protocol == PROTOCOL_BINARY:
+                    for frame in self.read_frames():
+                        self._process_frame(frame)
+                        consecutive_errors = 0
+                    continue
+
                 line = self.read_line()
                 if line:
-                    self._process_line(line)
+                    self._process_line(line, self._line_received_ns)
                     consecutive_errors = 0  # Resetear contador de errores
-                else:
-                    # Si no hay datos, esperar un poco más
-                    time.sleep(0.05)
 
             except Exception as e:
                 consecutive_errors += 1
@@ -173,40 +766,127 @@ class ArduinoCommunication:
 
                 time.sleep(0.5)  # Esperar más tiempo después de un error
 
-    def _process_line(self, line: str):
+    def _publish_event(self, event: SerialEvent):
+        """Publica un evento en la cola, descartando el más antiguo si está llena"""
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                pass
+            self.events.put_nowait(event)
+
+    def _update_edges(self, value: int, received_ns: int, device_ms: Optional[int] = None):
+        """Detecta flancos del sensor aplicando el debounce y notifica a los que esperan"""
+        edge = self.edge_detector.update(value, received_ns, device_ms)
+        if edge is None:
+            return
+        with self._edge_condition:
+            self._edge_seq += 1
+            self._edges.append((self._edge_seq, edge))
+            self._edge_condition.notify_all()
+
+    def _process_line(self, line: str, received_ns: Optional[int] = None):
         """
         Procesa una línea recibida de Arduino
 
         Args:
             line: Línea de texto recibida
+            received_ns: Instante de recepción (time.monotonic_ns())
         """
+        if received_ns is None:
+            received_ns = time.monotonic_ns()
+
         try:
             # Intentar convertir directamente a número
             if line.strip().isdigit():
-                new_temp_value = int(line.strip())
-
-                # Solo actualizar si el valor cambió
-                if self.temp_value != new_temp_value:
-                    self.temp_value = new_temp_value
-                    self.last_update = time.time()
-
-                    print(f"Temp actualizado: {self.temp_value}")
-
-                    # Ejecutar callback si está definido
-                    if self.callback_function:
-                        try:
-                            self.callback_function(self.temp_value)
-                        except Exception as e:
-                            print(f"Error en callback: {e}")
-                else:
-                    # Valor repetido, solo actualizar timestamp
-                    self.last_update = time.time()
+                self._process_sensor_value(
+                    SerialEvent("sensor", int(line.strip()), line, received_ns)
+                )
+            else:
+                self._publish_event(SerialEvent("text", None, line, received_ns))
 
         except ValueError as e:
             print(f"No se pudo convertir el valor de temp: {line} - Error: {e}")
         except Exception as e:
             print(f"Error al procesar línea '{line}': {e}")
 
+    def _process_frame(self, frame: Frame):
+        """
+        Procesa una trama binaria recibida de Arduino
+
+        Args:
+            frame: Trama decodificada por FrameParser
+        """
+        try:
+            if frame.type == FRAME_SENSOR and len(frame.payload) >= 2:
+                channel, value = frame.payload[0], frame.payload[1]
+                self._process_sensor_value(
+                    SerialEvent(
+                        "sensor",
+                        value,
+                        frame.payload.hex(),
+                        frame.received_ns,
+                        frame.device_ms,
+                        frame.seq,
+                        channel,
+                    )
+                )
+            elif frame.type == FRAME_ACK and len(frame.payload) >= 3:
+                seq, status = frame.payload[0], frame.payload[2]
+                with self._command_lock:
+                    pending = self._pending_acks.get(seq)
+                    if pending is not None:
+                        pending[1:] = [status, frame.received_ns]
+                        pending[0].set()
+            elif frame.type == FRAME_TEXT:
+                text = frame.payload.decode("ascii", errors="ignore")
+                self._publish_event(
+                    SerialEvent(
+                        "text", None, text, frame.received_ns, frame.device_ms, frame.seq
+                    )
+                )
+            else:
+                print(f"Trama desconocida: tipo {frame.type:#04x}")
+        except Exception as e:
+            print(f"Error al procesar trama {frame}: {e}")
+
+    def _process_sensor_value(self, event: SerialEvent):
+        """
+        Actualiza el valor del sensor, los flancos y el callback
+
+        Solo el canal 0 (sensor de la cinta) alimenta temp_value y los flancos;
+        el resto de canales se publican únicamente como eventos.
+
+        Args:
+            event: Evento de tipo "sensor"
+        """
+        self._publish_event(event)
+        if event.channel != 0:
+            return
+
+        new_temp_value = event.value
+        self.last_update_ns = event.received_ns
+        self._update_edges(new_temp_value, event.received_ns, event.device_ms)
+
+        # Solo actualizar si el valor cambió
+        if self.temp_value != new_temp_value:
+            self.temp_value = new_temp_value
+            self.last_update = time.time()
+
+            print(f"Temp actualizado: {self.temp_value}")
+
+            # Ejecutar callback si está definido
+            if self.callback_function:
+                try:
+                    self.callback_function(self.temp_value)
+                except Exception as e:
+                    print(f"Error en callback: {e}")
+        else:
+            # Valor repetido, solo actualizar timestamp
+            self.last_update = time.time()
+
 
 # Funciones de utilidad
 def list_available_ports():
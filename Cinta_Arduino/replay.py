@@ -0,0 +1,341 @@
+import argparse
+import os
+import pty
+import queue
+import random
+import sys
+import threading
+import time
+import tty
+
+if __package__ in (None, ""):
+    # Ejecutado como script (python Cinta_Arduino/replay.py): los imports parten de la raíz del repositorio
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Cinta_Arduino.communication import (
+    DEBOUNCE_MS,
+    PROTOCOL_BINARY,
+    PROTOCOL_TEXT,
+    RECORDING_HEADER,
+    ArduinoCommunication,
+)
+
+# Capacidad de la cola de disparos; la misma que MAX_DISPAROS_EN_COLA de main.py
+MAX_DISPAROS_EN_COLA = 5
+# Duración supuesta de un ciclo de clasificación (agarre, traslado y vuelta a
+# home). main.py no la fija: depende de las poses y de las trayectorias del
+# brazo, así que conviene medirla en el robot y pasarla con --ciclo
+DURACION_CICLO = 8.0
+
+
+def grabar(port, path, duracion=None, protocol=PROTOCOL_TEXT):
+    """
+    Graba el flujo de un Arduino real en un archivo.
+
+    Args:
+        port (str): Puerto serial del Arduino
+        path (str): Archivo de salida
+        duracion (float): Segundos a grabar; None graba hasta Ctrl+C
+        protocol (str): Protocolo del sketch cargado
+    """
+    arduino = ArduinoCommunication(port=port, protocol=protocol)
+    if not arduino.connect():
+        return
+    arduino.start_recording(path)
+    arduino.start_monitoring()
+
+    try:
+        inicio = time.monotonic()
+        while duracion is None or time.monotonic() - inicio < duracion:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nDeteniendo grabación...")
+    finally:
+        arduino.disconnect()
+
+
+def cargar_grabacion(path):
+    """
+    Lee un archivo generado con start_recording.
+
+    Args:
+        path (str): Archivo de grabación
+
+    Returns:
+        tuple: (metadatos de la cabecera, lista de (tiempo en ns, bytes))
+    """
+    metadatos = {"protocol": PROTOCOL_TEXT, "baudrate": "9600"}
+    bloques = []
+    with open(path, "r") as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            if linea.startswith(RECORDING_HEADER):
+                for campo in linea[len(RECORDING_HEADER) :].split():
+                    clave, _, valor = campo.partition("=")
+                    metadatos[clave] = valor
+                continue
+            tiempo, datos = linea.split(" ", 1)
+            bloques.append((int(tiempo), bytes.fromhex(datos)))
+    return metadatos, bloques
+
+
+def generar_sintetico(path, duracion=600.0, objetos_por_minuto=12, semilla=0):
+    """
+    Genera una grabación sintética en formato de texto con rebotes y ruido.
+
+    El sketch de test.ino envía el nivel del sensor aproximadamente cada 2 ms
+    junto con mensajes de estado; cada objeto interrumpe el haz entre 0.3 y
+    2 s y los bordes rebotan durante unos milisegundos.
+
+    Args:
+        path (str): Archivo de salida
+        duracion (float): Segundos de tráfico a generar
+        objetos_por_minuto (float): Tasa media de llegada de objetos
+        semilla (int): Semilla del generador aleatorio
+    """
+    rng = random.Random(semilla)
+    periodo_ns = 2_000_000
+    llegadas = []
+    t = rng.expovariate(objetos_por_minuto / 60)
+    while t < duracion:
+        bloqueo = rng.uniform(0.3, 2.0)
+        llegadas.append((t, t + bloqueo))
+        t += bloqueo + rng.expovariate(objetos_por_minuto / 60)
+
+    with open(path, "w") as f:
+        f.write(f"{RECORDING_HEADER} protocol={PROTOCOL_TEXT} baudrate=9600\n")
+        indice = 0
+        for paso in range(int(duracion * 1e9 / periodo_ns)):
+            t_ns = paso * periodo_ns
+            t = t_ns / 1e9
+            while indice < len(llegadas) and llegadas[indice][1] < t:
+                indice += 1
+            nivel = 0
+            if indice < len(llegadas):
+                inicio, fin = llegadas[indice]
+                if inicio <= t <= fin:
+                    nivel = 1
+                # Rebote de ~10 ms en cada borde
+                if min(abs(t - inicio), abs(t - fin)) < 0.01:
+                    nivel = rng.randint(0, 1)
+            mensaje = f"{nivel}\r\n"
+            mensaje += "Encendiendo led rojo\r\n" if nivel else "Encendiendo led verde\r\n"
+            if rng.random() < 0.001:
+                mensaje += "\x00\xff#\r\n"  # Ruido en la línea
+            f.write(f"{t_ns} {mensaje.encode('latin-1').hex()}\n")
+    print(f"Grabación sintética de {duracion:.0f} s con {len(llegadas)} objetos en {path}")
+
+
+class Reproductor:
+    def __init__(self, bloques, velocidad=1.0):
+        """
+        Reproduce una grabación a través de un pseudo-terminal
+
+        Los bloques se escriben en el pty sobre plazos monotónicos divididos
+        por el factor de velocidad. Solo funciona en sistemas POSIX.
+
+        Args:
+            bloques: Lista de (tiempo en ns, bytes) de cargar_grabacion
+            velocidad: Factor de aceleración (1.0 = tiempo real)
+        """
+        self.bloques = bloques
+        self.velocidad = velocidad
+        self.port = None
+        self.bytes_enviados = 0
+        self.retraso_maximo = 0.0
+        self.terminado = threading.Event()
+        self._master_fd = None
+        self._slave_fd = None
+        self._hilo = None
+        self._activo = False
+
+    def start(self):
+        """
+        Abre el pseudo-terminal. La reproducción empieza con reproducir().
+
+        Returns:
+            str: Ruta del puerto serial emulado
+        """
+        self._master_fd, self._slave_fd = pty.openpty()
+        tty.setraw(self._master_fd)
+        self.port = os.ttyname(self._slave_fd)
+        return self.port
+
+    def reproducir(self):
+        """Inicia el hilo que escribe la grabación en el pty"""
+        self._activo = True
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    def stop(self):
+        """Detiene la reproducción y cierra el pseudo-terminal"""
+        self._activo = False
+        if self._hilo is not None:
+            self._hilo.join(timeout=1)
+        for fd in (self._master_fd, self._slave_fd):
+            if fd is not None:
+                os.close(fd)
+        self._master_fd = self._slave_fd = None
+
+    def _bucle(self):
+        inicio = time.monotonic()
+        for tiempo_ns, datos in self.bloques:
+            if not self._activo:
+                break
+            plazo = inicio + tiempo_ns / 1e9 / self.velocidad
+            espera = plazo - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+            else:
+                self.retraso_maximo = max(self.retraso_maximo, -espera)
+            try:
+                os.write(self._master_fd, datos)
+            except OSError:
+                break
+            self.bytes_enviados += len(datos)
+        self.terminado.set()
+
+
+def probar_disparos(path, velocidad=1.0, duracion_ciclo=DURACION_CICLO, max_cola=MAX_DISPAROS_EN_COLA):
+    """
+    Reproduce una grabación contra ArduinoCommunication y simula el ciclo de main.
+
+    Replica la ruta de disparo de main.py: un hilo recorre arduino.edges() y
+    encola un disparo por cada flanco de subida, y un trabajador ocupa el
+    brazo durante duracion_ciclo por disparo. Los tiempos del ciclo y del
+    debounce se escalan con la velocidad de reproducción.
+
+    Args:
+        path (str): Archivo de grabación
+        velocidad (float): Factor de aceleración de la reproducción
+        duracion_ciclo (float): Segundos de un ciclo de clasificación real
+        max_cola (int): Capacidad de la cola de disparos
+
+    Returns:
+        dict: Resumen de la prueba
+    """
+    metadatos, bloques = cargar_grabacion(path)
+    if not bloques:
+        print("La grabación está vacía")
+        return None
+
+    reproductor = Reproductor(bloques, velocidad)
+    port = reproductor.start()
+    arduino = ArduinoCommunication(
+        port=port,
+        baudrate=int(metadatos["baudrate"]),
+        timeout=0.1,
+        debounce_ms=DEBOUNCE_MS / velocidad,
+        protocol=metadatos["protocol"],
+    )
+    if not arduino.connect():
+        reproductor.stop()
+        return None
+    arduino.start_monitoring()
+
+    cola = queue.Queue(maxsize=max_cola)
+    lock = threading.Lock()
+    resultado = {
+        "flancos": 0,
+        "disparos": 0,
+        "en_espera": 0,
+        "descartados": 0,
+        "procesados": 0,
+        "latencia_max_ms": 0.0,
+    }
+    ocupado = threading.Event()
+
+    def escuchar():
+        for flanco in arduino.edges():
+            with lock:
+                resultado["flancos"] += 1
+            if flanco.kind != "rising":
+                continue
+            latencia = (time.monotonic_ns() - flanco.received_ns) / 1e6
+            with lock:
+                resultado["disparos"] += 1
+                resultado["latencia_max_ms"] = max(resultado["latencia_max_ms"], latencia)
+                if ocupado.is_set():
+                    resultado["en_espera"] += 1
+            try:
+                cola.put_nowait(flanco.received_ns)
+            except queue.Full:
+                with lock:
+                    resultado["descartados"] += 1
+
+    def trabajar():
+        while True:
+            cola.get()
+            ocupado.set()
+            time.sleep(duracion_ciclo / velocidad)
+            ocupado.clear()
+            with lock:
+                resultado["procesados"] += 1
+            cola.task_done()
+
+    for objetivo in (escuchar, trabajar):
+        threading.Thread(target=objetivo, daemon=True).start()
+
+    duracion = bloques[-1][0] / 1e9
+    print(f"Reproduciendo {duracion:.1f} s de grabación a x{velocidad:g}...")
+    inicio = time.monotonic()
+    reproductor.reproducir()
+    try:
+        reproductor.terminado.wait()
+        # Dar tiempo al monitor para procesar los últimos bytes
+        time.sleep(0.2)
+    except KeyboardInterrupt:
+        print("\nDeteniendo reproducción...")
+    finally:
+        transcurrido = time.monotonic() - inicio
+        arduino.disconnect()
+        reproductor.stop()
+
+    resultado["pendientes"] = cola.qsize()
+    resultado["retraso_reproduccion_ms"] = reproductor.retraso_maximo * 1000
+    resultado["eventos_en_cola"] = arduino.events.qsize()
+    resultado.update(arduino.get_link_stats() if arduino.protocol == PROTOCOL_BINARY else {})
+
+    print("\n=== REPRODUCCIÓN DE SENSOR ===")
+    print(f"Grabación: {duracion:.1f} s reproducidos en {transcurrido:.1f} s")
+    for clave, valor in resultado.items():
+        print(f"{clave:<25} {valor:.2f}" if isinstance(valor, float) else f"{clave:<25} {valor}")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grabación y reproducción del sensor de la cinta")
+    sub = parser.add_subparsers(dest="accion", required=True)
+
+    p_grabar = sub.add_parser("grabar", help="Grabar el flujo de un Arduino real")
+    p_grabar.add_argument("archivo")
+    p_grabar.add_argument("--port", default="COM7")
+    p_grabar.add_argument("--duracion", type=float, help="Segundos a grabar")
+    p_grabar.add_argument(
+        "--protocol", choices=[PROTOCOL_TEXT, PROTOCOL_BINARY], default=PROTOCOL_TEXT
+    )
+
+    p_reproducir = sub.add_parser("reproducir", help="Reproducir una grabación y medir los disparos")
+    p_reproducir.add_argument("archivo")
+    p_reproducir.add_argument("--velocidad", type=float, default=1.0)
+    p_reproducir.add_argument("--ciclo", type=float, default=DURACION_CICLO)
+    p_reproducir.add_argument("--cola", type=int, default=MAX_DISPAROS_EN_COLA)
+
+    p_sintetico = sub.add_parser("sintetico", help="Generar una grabación sintética")
+    p_sintetico.add_argument("archivo")
+    p_sintetico.add_argument("--duracion", type=float, default=600.0)
+    p_sintetico.add_argument("--objetos-por-minuto", type=float, default=12)
+
+    args = parser.parse_args()
+    if args.accion == "grabar":
+        grabar(args.port, args.archivo, args.duracion, args.protocol)
+    elif args.accion == "reproducir":
+        probar_disparos(args.archivo, args.velocidad, args.ciclo, args.cola)
+    else:
+        generar_sintetico(args.archivo, args.duracion, args.objetos_por_minuto)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,24 @@
+import argparse
 import cv2
 import numpy as np
-from rembg import remove, new_session
-from PIL import Image
-import io
 import threading
 from queue import Queue
 import time
 
+# Modos de localización: MODO_RAPIDO resta un fondo estático aprendido y
+# MODO_REMBG segmenta con U²-Net (más preciso, mucho más lento; requiere rembg)
+MODO_RAPIDO = "rapido"
+MODO_REMBG = "rembg"
+
+# Frames de la cinta vacía con los que se aprende el fondo
+FRAMES_FONDO = 30
+# Diferencia por canal a partir de la cual un píxel no es fondo
+UMBRAL_FONDO = 30
+# Velocidad con la que el fondo absorbe cambios de luz en los píxeles de fondo
+TASA_FONDO = 0.02
+# Área mínima del contorno en píxeles del frame redimensionado
+AREA_MINIMA = 1000
+
 def redimensionar_imagen(imagen, ancho_maximo=300):
     # Obtener las dimensiones originales
     alto, ancho = imagen.shape[:2]
@@ -18,7 +30,17 @@ def redimensionar_imagen(imagen, ancho_maximo=300):
     # Redimensionar la imagen
     return cv2.resize(imagen, (ancho_maximo, nuevo_alto))
 
+def crear_sesion_rembg():
+    """Crea la sesión de rembg; la importación se hace solo si se usa este modo."""
+    from rembg import new_session
+
+    return new_session()
+
 def procesar_frame(frame, session):
+    """Localiza el objeto con rembg (U²-Net). Retorna (x, y, w, h, cx, cy) o None."""
+    from rembg import remove
+    from PIL import Image
+
     try:
         # Redimensionar el frame
         frame = redimensionar_imagen(frame)
@@ -44,39 +66,199 @@ def procesar_frame(frame, session):
         # Encontrar contornos
         contornos, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        # Filtrar contornos por área mínima
-        area_minima = 1000  # Ajustar este valor según sea necesario
-        contornos_filtrados = [cnt for cnt in contornos if cv2.contourArea(cnt) > area_minima]
-        
-        if contornos_filtrados:
-            # Encontrar el contorno más grande
-            contorno_max = max(contornos_filtrados, key=cv2.contourArea)
-            x, y, w, h = cv2.boundingRect(contorno_max)
-            
-            # Calcular el centroide del rectángulo
-            centro_x = x + w // 2
-            centro_y = y + h // 2
-            
-            return (x, y, w, h, centro_x, centro_y)
+        return contorno_mayor(contornos)
     except Exception as e:
         print(f"Error en procesamiento: {e}")
     
     return None
 
-def worker_thread(frame_queue, result_queue, session):
+def contorno_mayor(contornos, area_minima=AREA_MINIMA):
+    """Retorna (x, y, w, h, cx, cy) del contorno más grande sobre el área mínima, o None."""
+    # Filtrar contornos por área mínima
+    contornos_filtrados = [cnt for cnt in contornos if cv2.contourArea(cnt) > area_minima]
+    if not contornos_filtrados:
+        return None
+
+    # Encontrar el contorno más grande
+    contorno_max = max(contornos_filtrados, key=cv2.contourArea)
+    x, y, w, h = cv2.boundingRect(contorno_max)
+
+    # Calcular el centroide del rectángulo
+    centro_x = x + w // 2
+    centro_y = y + h // 2
+
+    return (x, y, w, h, centro_x, centro_y)
+
+class LocalizadorFondo:
+    def __init__(self, umbral=UMBRAL_FONDO, tasa=TASA_FONDO, area_minima=AREA_MINIMA):
+        """
+        Localización rápida por resta de un fondo estático aprendido
+
+        La cinta y la cámara están fijas, así que basta comparar cada frame
+        (redimensionado como en procesar_frame) contra un fondo aprendido con
+        la cinta vacía. El fondo se sigue adaptando lentamente solo en los
+        píxeles que no son objeto, para absorber cambios de luz. Los buffers se
+        reservan una vez y se reutilizan en cada frame.
+
+        Args:
+            umbral: Diferencia por canal a partir de la cual un píxel no es fondo
+            tasa: Velocidad de adaptación del fondo
+            area_minima: Área mínima del contorno del objeto
+        """
+        self.umbral = umbral
+        self.tasa = tasa
+        self.area_minima = area_minima
+        self.frames_fondo = 0
+        self.kernel = np.ones((5, 5), np.uint8)
+        self._fondo = None
+
+    @property
+    def listo(self):
+        """True cuando ya se aprendió el fondo"""
+        return self.frames_fondo >= FRAMES_FONDO
+
+    def _reservar(self, pequeno):
+        self._fondo = pequeno.astype(np.float32)
+        self._fondo_u8 = np.empty_like(pequeno)
+        self._diferencia = np.empty_like(pequeno)
+        self._mascara = np.empty(pequeno.shape[:2], dtype=np.uint8)
+        self._mascara_fondo = np.empty_like(self._mascara)
+
+    def _preparar(self, frame):
+        pequeno = redimensionar_imagen(frame)
+        return cv2.GaussianBlur(pequeno, (5, 5), 0, dst=pequeno)
+
+    def aprender(self, frame):
+        """
+        Acumula un frame de la cinta vacía en el fondo.
+
+        Args:
+            frame: Imagen BGR sin objetos
+        """
+        pequeno = self._preparar(frame)
+        if self._fondo is None or self._fondo.shape != pequeno.shape:
+            self._reservar(pequeno)
+            self.frames_fondo = 0
+        # Promedio acumulado durante el aprendizaje
+        cv2.accumulateWeighted(pequeno, self._fondo, 1 / (self.frames_fondo + 1))
+        cv2.convertScaleAbs(self._fondo, dst=self._fondo_u8)
+        self.frames_fondo += 1
+
+    def localizar(self, frame):
+        """
+        Localiza el objeto más grande que no es fondo.
+
+        Args:
+            frame: Imagen BGR
+
+        Returns:
+            tuple: (x, y, w, h, cx, cy) en el frame redimensionado, o None
+        """
+        if self._fondo is None:
+            return None
+        pequeno = self._preparar(frame)
+
+        # Distancia al fondo: la mayor diferencia entre canales, para no perder
+        # objetos de color distinto pero brillo parecido al de la cinta
+        cv2.absdiff(pequeno, self._fondo_u8, dst=self._diferencia)
+        np.max(self._diferencia, axis=2, out=self._mascara)
+        cv2.threshold(self._mascara, self.umbral, 255, cv2.THRESH_BINARY, dst=self._mascara)
+        cv2.morphologyEx(self._mascara, cv2.MORPH_CLOSE, self.kernel, dst=self._mascara)
+        cv2.morphologyEx(self._mascara, cv2.MORPH_OPEN, self.kernel, dst=self._mascara)
+
+        # Adaptar el fondo solo donde no hay objeto
+        cv2.bitwise_not(self._mascara, dst=self._mascara_fondo)
+        cv2.accumulateWeighted(pequeno, self._fondo, self.tasa, mask=self._mascara_fondo)
+        cv2.convertScaleAbs(self._fondo, dst=self._fondo_u8)
+
+        contornos, _ = cv2.findContours(self._mascara, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return contorno_mayor(contornos, self.area_minima)
+
+def worker_thread(frame_queue, result_queue, localizar):
     while True:
-        if not frame_queue.empty():
-            frame = frame_queue.get()
-            if frame is None:
-                break
-            resultado = procesar_frame(frame, session)
-            if resultado:
-                result_queue.put(resultado)
-            frame_queue.task_done()
-
-def main():
+        frame = frame_queue.get()
+        if frame is None:
+            break
+        resultado = localizar(frame)
+        if resultado:
+            result_queue.put(resultado)
+        frame_queue.task_done()
+
+def iou(a, b):
+    """Intersección sobre unión de dos tuplas (x, y, w, h, ...)"""
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    interseccion = max(0, x2 - x1) * max(0, y2 - y1)
+    union = a[2] * a[3] + b[2] * b[3] - interseccion
+    return interseccion / union if union else 0.0
+
+def benchmark(fuente, cantidad=200, frames_fondo=FRAMES_FONDO):
+    """
+    Compara fps e IoU del modo rápido contra rembg sobre los mismos frames.
+
+    Los primeros frames_fondo frames deben mostrar la cinta vacía.
+
+    Args:
+        fuente: Índice de cámara o ruta de un video
+        cantidad: Frames a comparar después de aprender el fondo
+        frames_fondo: Frames usados para aprender el fondo
+
+    Returns:
+        dict: fps de cada modo, IoU medio y frames en que solo uno detectó objeto
+    """
+    cap = cv2.VideoCapture(fuente)
+    if not cap.isOpened():
+        print(f"Error: No se pudo abrir {fuente}")
+        return None
+
+    localizador = LocalizadorFondo()
+    session = crear_sesion_rembg()
+    tiempo_rapido = tiempo_rembg = 0.0
+    ious = []
+    discrepancias = 0
+    frames = 0
+
+    while frames < cantidad:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if localizador.frames_fondo < frames_fondo:
+            localizador.aprender(frame)
+            continue
+
+        inicio = time.perf_counter()
+        rapido = localizador.localizar(frame)
+        tiempo_rapido += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        referencia = procesar_frame(frame, session)
+        tiempo_rembg += time.perf_counter() - inicio
+
+        if rapido and referencia:
+            ious.append(iou(rapido, referencia))
+        elif rapido or referencia:
+            discrepancias += 1
+        frames += 1
+    cap.release()
+
+    if frames == 0:
+        print("Error: No hubo frames para comparar")
+        return None
+    resultado = {
+        "frames": frames,
+        "fps_rapido": frames / tiempo_rapido if tiempo_rapido else float("inf"),
+        "fps_rembg": frames / tiempo_rembg if tiempo_rembg else float("inf"),
+        "iou_medio": float(np.mean(ious)) if ious else 0.0,
+        "discrepancias": discrepancias,
+    }
+    print("\n=== LOCALIZACION: RAPIDO VS REMBG ===")
+    for clave, valor in resultado.items():
+        print(f"{clave:<15} {valor:.3f}" if isinstance(valor, float) else f"{clave:<15} {valor}")
+    return resultado
+
+def main(modo=MODO_RAPIDO, camara=1):
     # Iniciar la captura de video
-    cap = cv2.VideoCapture(1)
+    cap = cv2.VideoCapture(camara)
     
     # Configurar la resolución de captura
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
@@ -91,11 +273,25 @@ def main():
     frame_queue = Queue(maxsize=2)
     result_queue = Queue(maxsize=2)
     
-    # Crear una sesión reutilizable para rembg
-    session = new_session()  # Volvemos al modelo por defecto
+    if modo == MODO_REMBG:
+        # Crear una sesión reutilizable para rembg
+        session = crear_sesion_rembg()  # Modelo por defecto
+        localizar = lambda frame: procesar_frame(frame, session)
+    else:
+        localizador = LocalizadorFondo()
+        localizar = localizador.localizar
+        print(f"Aprendiendo el fondo con {FRAMES_FONDO} frames, deja la cinta vacía...")
+        while not localizador.listo:
+            ret, frame = cap.read()
+            if not ret:
+                print("Error al capturar el video")
+                cap.release()
+                return
+            localizador.aprender(frame)
+        print("Fondo aprendido")
     
     # Iniciar el hilo de procesamiento
-    worker = threading.Thread(target=worker_thread, args=(frame_queue, result_queue, session))
+    worker = threading.Thread(target=worker_thread, args=(frame_queue, result_queue, localizar))
     worker.daemon = True
     worker.start()
     
@@ -164,4 +360,14 @@ def main():
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Localización del objeto en la cinta")
+    parser.add_argument("--modo", choices=[MODO_RAPIDO, MODO_REMBG], default=MODO_RAPIDO)
+    parser.add_argument("--camara", type=int, default=1)
+    parser.add_argument("--benchmark", metavar="VIDEO", help="Comparar ambos modos sobre un video")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.frames)
+    else:
+        main(args.modo, args.camara)
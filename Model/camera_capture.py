@@ -0,0 +1,334 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Cantidad de frames que guarda el buffer circular (~1 s a 30 fps)
+CAPACIDAD_BUFFER = 32
+
+# Fallos consecutivos de lectura antes de marcar la cámara como caída
+MAX_FALLOS_CONSECUTIVOS = 10
+
+
+class CameraCapture:
+    def __init__(self, camara, capacidad=CAPACIDAD_BUFFER):
+        """
+        Hilo único de captura con buffer circular de frames preasignados
+
+        Un solo hilo lee la cámara y escribe cada frame directamente en el
+        siguiente espacio del buffer, junto con el instante monotónico en que
+        se obtuvo. Los consumidores piden el último frame o el más cercano a
+        un instante dado, sin competir por cv2.VideoCapture ni recibir frames
+        viejos acumulados en el buffer del driver.
+
+        Args:
+            camara: Índice de la cámara o cv2.VideoCapture ya abierto
+            capacidad: Cantidad de frames del buffer circular
+        """
+        self.cap = cv2.VideoCapture(camara) if isinstance(camara, int) else camara
+        self.capacidad = capacidad
+        self.frames = None
+        self.timestamps = np.zeros(capacidad, dtype=np.int64)
+        self.secuencias = np.zeros(capacidad, dtype=np.int64)
+        self.frames_capturados = 0
+        self.fallos_consecutivos = 0
+        self.observadores = []
+        self._escritos = 0
+        self._condicion = threading.Condition()
+        self._hilo = None
+        self._activo = False
+
+    def start(self):
+        """
+        Lee un primer frame para dimensionar el buffer e inicia el hilo de captura
+
+        Returns:
+            bool: True si la cámara entregó un frame y el hilo quedó corriendo
+        """
+        if not self.cap.isOpened():
+            print("Error: La cámara no está abierta")
+            return False
+
+        ret, frame = self.cap.read()
+        if not ret or frame is None:
+            print("Error: La cámara no entregó el primer frame")
+            return False
+
+        self.frames = np.empty((self.capacidad,) + frame.shape, dtype=frame.dtype)
+        self._guardar(frame, time.monotonic_ns())
+
+        self._activo = True
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+        print(f"Captura iniciada: {frame.shape[1]}x{frame.shape[0]}, buffer de {self.capacidad} frames")
+        return True
+
+    def stop(self, liberar=True):
+        """
+        Detiene el hilo de captura
+
+        Args:
+            liberar: Si es True también libera la cámara
+        """
+        self._activo = False
+        if self._hilo is not None:
+            self._hilo.join(timeout=1)
+            self._hilo = None
+        with self._condicion:
+            self._condicion.notify_all()
+        if liberar:
+            self.cap.release()
+
+    def agregar_observador(self, funcion):
+        """
+        Registra una función que el hilo de captura llama con cada frame nuevo.
+
+        La función recibe (frame, instante_ns), donde frame es una vista del
+        buffer válida solo durante la llamada. Debe ser rápida: mientras corre
+        no se captura el siguiente frame.
+
+        Args:
+            funcion: Invocable (frame, instante_ns)
+        """
+        self.observadores.append(funcion)
+
+    @property
+    def activa(self):
+        """True mientras el hilo corre y la cámara sigue entregando frames"""
+        return self._activo and self.fallos_consecutivos < MAX_FALLOS_CONSECUTIVOS
+
+    def latest(self, copiar=True):
+        """
+        Devuelve el último frame capturado.
+
+        Args:
+            copiar: Si es False devuelve una vista del buffer, que el hilo
+                sobrescribirá después de `capacidad` frames
+
+        Returns:
+            tuple: (frame, instante en ns de time.monotonic_ns()) o (None, None)
+        """
+        with self._condicion:
+            if self._escritos == 0:
+                return None, None
+            indice = (self._escritos - 1) % self.capacidad
+        return self._leer(indice, copiar)
+
+    def siguiente(self, despues_ns, timeout=1.0, copiar=True):
+        """
+        Espera un frame posterior a un instante y devuelve el más reciente.
+
+        Args:
+            despues_ns: Instante del último frame ya consumido
+            timeout: Tiempo máximo de espera en segundos
+            copiar: Si es False devuelve una vista del buffer
+
+        Returns:
+            tuple: (frame, instante en ns) o (None, None) si no llegó uno nuevo
+        """
+        with self._condicion:
+            hay_nuevo = self._condicion.wait_for(
+                lambda: not self._activo
+                or (self._escritos > 0 and self._ultimo_timestamp() > despues_ns),
+                timeout,
+            )
+            if not hay_nuevo or self._escritos == 0 or self._ultimo_timestamp() <= despues_ns:
+                return None, None
+            indice = (self._escritos - 1) % self.capacidad
+        return self._leer(indice, copiar)
+
+    def posteriores(self, despues_ns, cantidad, timeout=1.0, copiar=True):
+        """
+        Espera `cantidad` frames capturados después de un instante y los devuelve.
+
+        Args:
+            despues_ns: Instante del último frame ya usado
+            cantidad: Cantidad de frames nuevos
+            timeout: Tiempo máximo de espera en segundos
+            copiar: Si es False devuelve vistas del buffer
+
+        Returns:
+            tuple: (lista de frames, lista de instantes en ns) en orden
+            cronológico; puede traer menos frames si no llegaron a tiempo
+        """
+        with self._condicion:
+            self._condicion.wait_for(
+                lambda: not self._activo or len(self._indices_desde(despues_ns + 1)) >= cantidad,
+                timeout,
+            )
+            indices = self._indices_desde(despues_ns + 1)[:cantidad]
+        return self._leer_varios(indices, copiar)
+
+    def at(self, instante_ns, timeout=1.0, copiar=True):
+        """
+        Devuelve el frame capturado más cerca de un instante.
+
+        Si el instante todavía no llegó, espera hasta que haya un frame
+        posterior a él (o hasta el timeout) antes de elegir.
+
+        Args:
+            instante_ns: Instante buscado en ns de time.monotonic_ns()
+            timeout: Tiempo máximo de espera en segundos si el instante es futuro
+            copiar: Si es False devuelve una vista del buffer
+
+        Returns:
+            tuple: (frame, instante en ns del frame) o (None, None)
+        """
+        frames, instantes = self.rafaga(instante_ns, 1, timeout, copiar)
+        if not frames:
+            return None, None
+        return frames[0], instantes[0]
+
+    def rafaga(self, instante_ns, cantidad, timeout=1.0, copiar=True, tolerancia_ns=None):
+        """
+        Devuelve los `cantidad` frames capturados más cerca de un instante.
+
+        Si el instante es futuro espera hasta que haya la mitad de la ráfaga
+        (redondeada hacia arriba) capturada a partir de él, y elige del buffer
+        los frames con menor distancia al instante, de modo que la ráfaga
+        queda centrada en él.
+
+        Si el frame más cercano está a más de `tolerancia_ns` del instante
+        (el instante ya salió del buffer o la cámara dejó de entregar frames)
+        no se devuelve nada: los frames disponibles no muestran ese momento.
+
+        Args:
+            instante_ns: Instante buscado en ns de time.monotonic_ns()
+            cantidad: Cantidad de frames de la ráfaga
+            timeout: Tiempo máximo de espera en segundos si el instante es futuro
+            copiar: Si es False devuelve vistas del buffer
+            tolerancia_ns: Distancia máxima aceptada al frame más cercano;
+                None usa un período de frame estimado del buffer
+
+        Returns:
+            tuple: (lista de frames, lista de instantes en ns) en orden
+            cronológico; puede traer menos frames si el buffer no los tiene,
+            y ninguno si el instante no está cubierto por el buffer
+        """
+        posteriores = (cantidad + 1) // 2
+        with self._condicion:
+            self._condicion.wait_for(
+                lambda: not self._activo or len(self._indices_desde(instante_ns)) >= posteriores,
+                timeout,
+            )
+            if self._escritos == 0:
+                return [], []
+
+            disponibles = min(self._escritos, self.capacidad)
+            indices = [
+                indice
+                for indice in (
+                    (self._escritos - 1 - i) % self.capacidad for i in range(disponibles)
+                )
+                if self.secuencias[indice] >= 0
+            ]
+            indices = sorted(indices, key=lambda i: abs(int(self.timestamps[i]) - instante_ns))[:cantidad]
+            if not indices:
+                return [], []
+
+            if tolerancia_ns is None:
+                tolerancia_ns = self._periodo_ns()
+            distancia = abs(int(self.timestamps[indices[0]]) - instante_ns)
+            if tolerancia_ns is not None and distancia > tolerancia_ns:
+                return [], []
+            indices.sort(key=lambda i: int(self.secuencias[i]))
+
+        return self._leer_varios(indices, copiar)
+
+    def _indices_desde(self, instante_ns):
+        """Espacios válidos con frames capturados desde un instante, en orden cronológico"""
+        disponibles = min(self._escritos, self.capacidad)
+        indices = [
+            (self._escritos - disponibles + i) % self.capacidad for i in range(disponibles)
+        ]
+        return [
+            indice
+            for indice in indices
+            if self.secuencias[indice] >= 0 and int(self.timestamps[indice]) >= instante_ns
+        ]
+
+    def _leer_varios(self, indices, copiar):
+        """Lee varios espacios del buffer descartando los que se sobrescribieron"""
+        frames, instantes = [], []
+        for indice in indices:
+            frame, instante = self._leer(indice, copiar)
+            if frame is not None:
+                frames.append(frame)
+                instantes.append(instante)
+        return frames, instantes
+
+    def _periodo_ns(self):
+        """Período medio entre los frames del buffer, o None si hay menos de dos"""
+        instantes = [
+            int(self.timestamps[indice])
+            for indice in range(min(self._escritos, self.capacidad))
+            if self.secuencias[indice] >= 0
+        ]
+        if len(instantes) < 2:
+            return None
+        return (max(instantes) - min(instantes)) // (len(instantes) - 1)
+
+    def _ultimo_timestamp(self):
+        return int(self.timestamps[(self._escritos - 1) % self.capacidad])
+
+    def _leer(self, indice, copiar):
+        """Lee un espacio del buffer verificando que no se sobrescribió durante la copia"""
+        for _ in range(100):
+            secuencia = int(self.secuencias[indice])
+            if copiar and secuencia < 0:
+                # El hilo de captura está escribiendo este espacio
+                time.sleep(0.001)
+                continue
+            instante = int(self.timestamps[indice])
+            frame = self.frames[indice].copy() if copiar else self.frames[indice]
+            if not copiar or int(self.secuencias[indice]) == secuencia:
+                return frame, instante
+        return None, None
+
+    def _guardar(self, frame, instante_ns):
+        """Copia un frame en el siguiente espacio del buffer"""
+        indice = self._escritos % self.capacidad
+        np.copyto(self.frames[indice], frame)
+        self._publicar(indice, instante_ns)
+
+    def _publicar(self, indice, instante_ns):
+        with self._condicion:
+            self.timestamps[indice] = instante_ns
+            self.secuencias[indice] = self._escritos
+            self._escritos += 1
+            self.frames_capturados += 1
+            self._condicion.notify_all()
+
+    def _bucle(self):
+        """Captura frames continuamente escribiendo directo en el buffer"""
+        while self._activo:
+            if not self.cap.grab():
+                self.fallos_consecutivos += 1
+                time.sleep(0.05)
+                continue
+            instante = time.monotonic_ns()
+
+            indice = self._escritos % self.capacidad
+            espacio = self.frames[indice]
+            # Invalidar el espacio antes de escribirlo para que _leer detecte la colisión
+            self.secuencias[indice] = -1
+            ret, frame = self.cap.retrieve(espacio)
+            if not ret or frame is None or frame.shape != espacio.shape:
+                self.fallos_consecutivos += 1
+                continue
+            if not np.shares_memory(frame, espacio):
+                # El backend no escribió en el buffer entregado; copiar
+                np.copyto(espacio, frame)
+
+            self.fallos_consecutivos = 0
+            self._publicar(indice, instante)
+            self._notificar(espacio, instante)
+
+    def _notificar(self, frame, instante_ns):
+        """Entrega el frame recién capturado a los observadores"""
+        for funcion in self.observadores:
+            try:
+                funcion(frame, instante_ns)
+            except Exception as e:
+                print(f"Error en observador de captura: {e}")
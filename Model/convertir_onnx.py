@@ -0,0 +1,112 @@
+"""
+Exporta keras_model.h5 a ONNX y verifica el modelo en cv2.dnn.
+
+La exportación necesita tf2onnx, que no es una dependencia del proyecto
+porque solo se usa aquí; instalarlo con `pip install -e .[onnx]`. La
+inferencia con el .onnx resultante solo requiere OpenCV.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from Model.convertir_tflite import DIRECTORIO_CALIBRACION, MUESTRAS_CALIBRACION, cargar_frames
+from Model.inferencia import (
+    BACKEND_KERAS,
+    BACKEND_ONNX,
+    MODEL_IMAGE_SIZE,
+    MODEL_PATH,
+    ONNX_PATH,
+    crear_motor,
+)
+
+OPSET = 13
+
+# Tolerancias para aceptar el modelo exportado frente a las salidas de Keras
+ERROR_MAXIMO_PERMITIDO = 1e-3
+COINCIDENCIA_MINIMA = 1.0
+
+
+def exportar(model_path=MODEL_PATH, salida=ONNX_PATH, tamano=MODEL_IMAGE_SIZE):
+    """
+    Exporta el modelo Keras a ONNX con entrada NCHW.
+
+    Args:
+        model_path (str): Modelo Keras de origen
+        salida (str): Archivo .onnx de salida
+        tamano (int): Lado de la imagen de entrada del modelo
+    """
+    import tensorflow as tf
+    import tf2onnx
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+    firma = [tf.TensorSpec((None, tamano, tamano, 3), tf.float32, name="entrada")]
+    # inputs_as_nchw agrega la transposición dentro del grafo, de modo que la
+    # entrada coincide con el blob NCHW de cv2.dnn.blobFromImages
+    tf2onnx.convert.from_keras(
+        model,
+        input_signature=firma,
+        opset=OPSET,
+        inputs_as_nchw=["entrada"],
+        output_path=salida,
+    )
+    print(f"Modelo ONNX: {salida} ({os.path.getsize(salida) / 1e6:.2f} MB)")
+
+
+def verificar(frames, model_path=MODEL_PATH, onnx_path=ONNX_PATH):
+    """
+    Compara las salidas del modelo ONNX en cv2.dnn contra las de Keras.
+
+    Ambos motores reciben los mismos frames BGR sin preparar por
+    predict_frames, de modo que la comparación cubre la ruta de producción
+    del ONNX (reducción INTER_AREA, blobFromImages con su normalización y
+    swapRB) y no solo el grafo exportado.
+
+    Args:
+        frames (list): Imágenes BGR como las entrega la cámara
+        model_path (str): Modelo Keras de referencia
+        onnx_path (str): Modelo ONNX exportado
+
+    Returns:
+        bool: True si el error y la coincidencia top-1 están dentro de tolerancia
+    """
+    esperado = crear_motor(BACKEND_KERAS, model_path).predict_frames(frames)
+
+    inicio = time.perf_counter()
+    motor = crear_motor(BACKEND_ONNX, onnx_path)
+    print(f"Carga del modelo ONNX en cv2.dnn: {time.perf_counter() - inicio:.3f} s")
+    motor.warmup()
+    obtenido = np.concatenate([motor.predict_frames(frames[i : i + 1]) for i in range(len(frames))])
+
+    error = float(np.abs(obtenido - esperado).max())
+    coincidencia = float(np.mean(obtenido.argmax(axis=1) == esperado.argmax(axis=1)))
+    print(f"Error máximo: {error:.2e}, coincidencia top-1: {coincidencia:.1%}")
+    print(f"Latencia cv2.dnn: {motor.estadisticas()}")
+
+    if error > ERROR_MAXIMO_PERMITIDO or coincidencia < COINCIDENCIA_MINIMA:
+        print("Error: El modelo ONNX no reproduce las salidas de Keras")
+        return False
+    print("Modelo ONNX verificado")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta keras_model.h5 a ONNX para cv2.dnn")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--salida", default=ONNX_PATH)
+    parser.add_argument("--calibracion", default=DIRECTORIO_CALIBRACION, help="Carpeta de imágenes de verificación")
+    parser.add_argument("--muestras", type=int, default=MUESTRAS_CALIBRACION)
+    parser.add_argument("--solo-verificar", action="store_true", help="No exportar, solo comparar")
+    args = parser.parse_args()
+
+    if not args.solo_verificar:
+        exportar(args.modelo, args.salida)
+    frames = cargar_frames(args.calibracion, args.muestras)
+    if not verificar(frames, args.modelo, args.salida):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+from Model.inferencia import (
+    MODEL_IMAGE_SIZE,
+    MODEL_PATH,
+    TFLITE_FP16_PATH,
+    TFLITE_INT8_PATH,
+    BACKEND_KERAS,
+    BACKEND_TFLITE_FP16,
+    BACKEND_TFLITE_INT8,
+    crear_motor,
+    preparar_imagen,
+)
+
+DIRECTORIO_CALIBRACION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Images")
+EXTENSIONES_IMAGEN = (".jpg", ".jpeg", ".png", ".bmp")
+
+# Muestras del dataset representativo. Con pocas fotos se agregan variantes
+# volteadas y con brillo ajustado para cubrir mejor el rango de activaciones.
+MUESTRAS_CALIBRACION = 100
+
+
+def cargar_frames(directorio=DIRECTORIO_CALIBRACION, muestras=MUESTRAS_CALIBRACION):
+    """
+    Carga los frames BGR del dataset representativo tal como llegarían de la cámara.
+
+    Args:
+        directorio (str): Carpeta con fotos de la cinta (se recorre recursivamente)
+        muestras (int): Cantidad de frames a generar
+
+    Returns:
+        list: Lista de `muestras` imágenes BGR uint8
+    """
+    rutas = sorted(
+        os.path.join(raiz, nombre)
+        for raiz, _, archivos in os.walk(directorio)
+        for nombre in archivos
+        if nombre.lower().endswith(EXTENSIONES_IMAGEN)
+    )
+    originales = [f for f in (cv2.imread(r) for r in rutas) if f is not None]
+    if not originales:
+        raise ValueError(f"No hay imágenes de calibración en {directorio}")
+    print(f"Calibrando con {len(originales)} imágenes de {directorio}")
+
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(muestras):
+        frame = originales[i % len(originales)]
+        if i >= len(originales):
+            if rng.random() < 0.5:
+                frame = cv2.flip(frame, 1)
+            frame = cv2.convertScaleAbs(frame, alpha=rng.uniform(0.7, 1.3), beta=rng.uniform(-20, 20))
+        frames.append(frame)
+    return frames
+
+
+def cargar_calibracion(directorio=DIRECTORIO_CALIBRACION, muestras=MUESTRAS_CALIBRACION, tamano=MODEL_IMAGE_SIZE):
+    """
+    Prepara las imágenes del dataset representativo.
+
+    Args:
+        directorio (str): Carpeta con fotos de la cinta (se recorre recursivamente)
+        muestras (int): Cantidad de imágenes a generar
+        tamano (int): Lado de la imagen de entrada del modelo
+
+    Returns:
+        np.ndarray: Arreglo (muestras, tamano, tamano, 3) float32 en [-1, 1]
+    """
+    frames = cargar_frames(directorio, muestras)
+    imagenes = np.empty((muestras, tamano, tamano, 3), dtype=np.float32)
+    for i, frame in enumerate(frames):
+        imagenes[i] = preparar_imagen(frame, tamano)
+    return imagenes
+
+
+def convertir(model_path=MODEL_PATH, salida_fp16=TFLITE_FP16_PATH, salida_int8=TFLITE_INT8_PATH, calibracion=None):
+    """
+    Convierte el modelo Keras a .tflite en float16 e int8.
+
+    Args:
+        model_path (str): Modelo Keras de origen
+        salida_fp16 (str): Archivo de salida float16
+        salida_int8 (str): Archivo de salida int8 (entrada y salida cuantizadas)
+        calibracion (np.ndarray): Imágenes del dataset representativo
+    """
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+
+    # Float16: pesos en media precisión, cálculo en float32 sobre CPU
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    with open(salida_fp16, "wb") as f:
+        f.write(converter.convert())
+    print(f"Modelo float16: {salida_fp16} ({os.path.getsize(salida_fp16) / 1e6:.2f} MB)")
+
+    # Int8 completo: pesos, activaciones, entrada y salida cuantizadas
+    def dataset_representativo():
+        for imagen in calibracion:
+            yield [imagen[np.newaxis]]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = dataset_representativo
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    with open(salida_int8, "wb") as f:
+        f.write(converter.convert())
+    print(f"Modelo int8: {salida_int8} ({os.path.getsize(salida_int8) / 1e6:.2f} MB)")
+
+
+def comparar(imagenes, rutas, model_path=MODEL_PATH):
+    """
+    Compara cada modelo convertido contra el modelo Keras.
+
+    Args:
+        imagenes (np.ndarray): Imágenes preparadas
+        rutas (dict): {backend: archivo .tflite}
+        model_path (str): Modelo Keras de referencia
+    """
+    referencia = crear_motor(BACKEND_KERAS, model_path)
+    esperado = referencia.predict_batch(imagenes)
+
+    for backend, ruta in rutas.items():
+        motor = crear_motor(backend, ruta)
+        motor.warmup()
+        obtenido = np.concatenate([motor.predict_batch(imagenes[i : i + 1]) for i in range(len(imagenes))])
+        coincidencia = np.mean(obtenido.argmax(axis=1) == esperado.argmax(axis=1))
+        error = np.abs(obtenido - esperado).max()
+        print(
+            f"{backend}: coincidencia top-1 {coincidencia:.1%}, error máximo {error:.4f}, "
+            f"latencia {motor.estadisticas()}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte keras_model.h5 a TFLite float16 e int8")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--calibracion", default=DIRECTORIO_CALIBRACION, help="Carpeta de imágenes representativas")
+    parser.add_argument("--muestras", type=int, default=MUESTRAS_CALIBRACION)
+    parser.add_argument("--salida-fp16", default=TFLITE_FP16_PATH)
+    parser.add_argument("--salida-int8", default=TFLITE_INT8_PATH)
+    args = parser.parse_args()
+
+    calibracion = cargar_calibracion(args.calibracion, args.muestras)
+    convertir(args.modelo, args.salida_fp16, args.salida_int8, calibracion)
+    comparar(
+        calibracion,
+        {BACKEND_TFLITE_FP16: args.salida_fp16, BACKEND_TFLITE_INT8: args.salida_int8},
+        args.modelo,
+    )
+
+
+if __name__ == "__main__":
+    main()
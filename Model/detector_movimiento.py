@@ -0,0 +1,337 @@
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+from Model.zona_deteccion import recortar_zona
+
+# Métodos para decidir si hay un objeto en la zona
+METODO_DIFERENCIA = "diferencia"  # Diferencia contra un fondo promediado
+METODO_MOG2 = "mog2"  # cv2.createBackgroundSubtractorMOG2
+
+# Eventos que emite el detector, uno de cada tipo por objeto
+EVENTO_LLEGADA = "llegada"
+EVENTO_QUIETO = "quieto"
+EVENTO_SALIDA = "salida"
+
+# Estados del objeto en la zona
+ESTADO_VACIO = "vacio"
+ESTADO_MOVIMIENTO = "movimiento"
+ESTADO_QUIETO = "quieto"
+
+# Factor de reducción del frame (o de la zona) antes de analizarlo
+ESCALA_MOVIMIENTO = 0.25
+# Diferencia de gris a partir de la cual un píxel cambió
+UMBRAL_PIXEL = 25
+# Fracción de píxeles distintos del fondo para considerar que hay un objeto
+FRACCION_PRESENCIA = 0.02
+# Fracción de píxeles que cambian entre frames por debajo de la cual no hay movimiento
+FRACCION_MOVIMIENTO = 0.005
+# Frames consecutivos sin movimiento para declarar el objeto quieto
+FRAMES_QUIETO = 5
+# Frames consecutivos sin presencia para declarar la zona vacía
+FRAMES_VACIO = 5
+# Frames con los que se aprende el fondo al iniciar, sin emitir eventos
+FRAMES_APRENDIZAJE = 30
+# Segundos con "objeto presente" y sin ningún movimiento tras los que el fondo
+# se considera obsoleto (p. ej. se aprendió con un objeto en la zona) y se reaprende
+TIEMPO_FONDO_OBSOLETO = 30.0
+# Velocidad con la que el fondo se adapta a cambios de luz mientras la zona está vacía
+TASA_APRENDIZAJE = 0.05
+
+# Cantidad de eventos y tiempos de procesamiento guardados
+MAX_EVENTOS = 100
+MAX_MUESTRAS_TIEMPO = 1000
+
+
+class EventoMovimiento(NamedTuple):
+    """Cambio de estado del objeto en la zona de detección"""
+
+    tipo: str  # EVENTO_LLEGADA, EVENTO_QUIETO o EVENTO_SALIDA
+    instante_ns: int  # Instante del frame que produjo el evento (time.monotonic_ns())
+    presencia: float  # Fracción de la zona distinta del fondo
+    movimiento: float  # Fracción de la zona que cambió respecto al frame anterior
+
+
+class DetectorMovimiento:
+    def __init__(
+        self,
+        zona=None,
+        metodo=METODO_DIFERENCIA,
+        escala=ESCALA_MOVIMIENTO,
+        umbral_pixel=UMBRAL_PIXEL,
+        fraccion_presencia=FRACCION_PRESENCIA,
+        fraccion_movimiento=FRACCION_MOVIMIENTO,
+        frames_quieto=FRAMES_QUIETO,
+        frames_vacio=FRAMES_VACIO,
+        tiempo_fondo_obsoleto=TIEMPO_FONDO_OBSOLETO,
+    ):
+        """
+        Disparo por visión: detecta la llegada de un objeto y cuándo queda quieto
+
+        Se conecta al hilo de captura con CameraCapture.agregar_observador y
+        analiza cada frame en gris y reducido. La presencia se mide contra un
+        fondo aprendido mientras la zona está vacía y el movimiento contra el
+        frame anterior. Cada objeto produce exactamente un EVENTO_QUIETO, el
+        frame estable en el que conviene clasificarlo, y no vuelve a disparar
+        hasta que la zona queda vacía.
+
+        El fondo se aprende con los primeros FRAMES_APRENDIZAJE frames. Si aun
+        así queda aprendido con algo en la zona (un objeto o el brazo al
+        arrancar), la zona vacía se verá "ocupada" y sin movimiento; pasado
+        tiempo_fondo_obsoleto en ese estado el fondo se reaprende con el
+        frame actual y se emite EVENTO_SALIDA.
+
+        Args:
+            zona: Zona de detección de cargar_zona; None analiza el frame completo
+            metodo: METODO_DIFERENCIA o METODO_MOG2
+            escala: Factor de reducción antes de analizar
+            umbral_pixel: Diferencia de gris a partir de la cual un píxel cambió
+            fraccion_presencia: Fracción de la zona que indica un objeto
+            fraccion_movimiento: Fracción de cambio por debajo de la cual no hay movimiento
+            frames_quieto: Frames sin movimiento para declarar el objeto quieto
+            frames_vacio: Frames sin presencia para declarar la zona vacía
+            tiempo_fondo_obsoleto: Segundos presente y sin movimiento antes de reaprender el fondo
+        """
+        if metodo not in (METODO_DIFERENCIA, METODO_MOG2):
+            raise ValueError(f"Método de detección desconocido: {metodo}")
+        self.zona = zona
+        self.metodo = metodo
+        self.escala = escala
+        self.umbral_pixel = umbral_pixel
+        self.fraccion_presencia = fraccion_presencia
+        self.fraccion_movimiento = fraccion_movimiento
+        self.frames_quieto = frames_quieto
+        self.frames_vacio = frames_vacio
+        self.tiempo_fondo_obsoleto_ns = int(tiempo_fondo_obsoleto * 1e9)
+
+        self.estado = ESTADO_VACIO
+        self.frames_procesados = 0
+        self.tiempos_ns = deque(maxlen=MAX_MUESTRAS_TIEMPO)
+        self._condicion = threading.Condition()
+        self._eventos = deque(maxlen=MAX_EVENTOS)
+        self._secuencia = 0
+        self._activo = True
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Olvida el fondo aprendido; se vuelve a aprender con los próximos frames"""
+        self.estado = ESTADO_VACIO
+        self._quietos = 0
+        self._vacios = 0
+        self._aprendidos = 0
+        self._sin_movimiento_desde = None
+        self._reducido = None
+        self._gris = None
+        self._anterior = None
+        self._fondo = None
+        self._fondo_gris = None
+        self._diferencia = None
+        self._mascara = None
+        self._mog2 = None
+
+    def detener(self):
+        """Libera a los hilos que esperan eventos"""
+        with self._condicion:
+            self._activo = False
+            self._condicion.notify_all()
+
+    def _reservar(self, zona):
+        """Reserva los buffers de análisis según el tamaño de la zona"""
+        alto, ancho = zona.shape[:2]
+        tamano = (max(1, round(ancho * self.escala)), max(1, round(alto * self.escala)))
+        self._reducido = np.empty((tamano[1], tamano[0], 3), dtype=np.uint8)
+        self._gris = np.empty((tamano[1], tamano[0]), dtype=np.uint8)
+        self._anterior = np.empty_like(self._gris)
+        self._diferencia = np.empty_like(self._gris)
+        self._mascara = np.empty_like(self._gris)
+        self._fondo_gris = np.empty_like(self._gris)
+        self._fondo = np.empty(self._gris.shape, dtype=np.float32)
+        if self.metodo == METODO_MOG2:
+            self._mog2 = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+
+    def _fraccion_distinta(self, a, b):
+        """Fracción de píxeles cuya diferencia supera umbral_pixel"""
+        cv2.absdiff(a, b, dst=self._diferencia)
+        cv2.threshold(self._diferencia, self.umbral_pixel, 255, cv2.THRESH_BINARY, dst=self._mascara)
+        return cv2.countNonZero(self._mascara) / self._mascara.size
+
+    def procesar(self, frame, instante_ns):
+        """
+        Analiza un frame; pensado para llamarse desde el hilo de captura.
+
+        Args:
+            frame: Imagen BGR (puede ser una vista del buffer de captura)
+            instante_ns: Instante de captura en ns de time.monotonic_ns()
+        """
+        inicio = time.perf_counter_ns()
+        zona = recortar_zona(frame, self.zona)
+        if self._gris is None:
+            self._reservar(zona)
+
+        alto, ancho = self._gris.shape
+        cv2.resize(zona, (ancho, alto), dst=self._reducido, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._reducido, cv2.COLOR_BGR2GRAY, dst=self._gris)
+        cv2.GaussianBlur(self._gris, (5, 5), 0, dst=self._gris)
+
+        if self._aprendidos < FRAMES_APRENDIZAJE:
+            # Fondo inicial: promedio de los primeros frames, sin emitir eventos
+            self._aprendidos += 1
+            if self._mog2 is not None:
+                self._mog2.apply(self._gris)
+            else:
+                cv2.accumulateWeighted(self._gris, self._fondo, 1 / self._aprendidos)
+                cv2.convertScaleAbs(self._fondo, dst=self._fondo_gris)
+            np.copyto(self._anterior, self._gris)
+            return
+
+        movimiento = self._fraccion_distinta(self._gris, self._anterior)
+        if self._mog2 is not None:
+            # El fondo solo se aprende con la zona vacía, para no absorber al objeto quieto
+            tasa = -1 if self.estado == ESTADO_VACIO else 0
+            self._mog2.apply(self._gris, self._mascara, tasa)
+            presencia = cv2.countNonZero(self._mascara) / self._mascara.size
+        else:
+            presencia = self._fraccion_distinta(self._gris, self._fondo_gris)
+            if self.estado == ESTADO_VACIO:
+                cv2.accumulateWeighted(self._gris, self._fondo, TASA_APRENDIZAJE)
+                cv2.convertScaleAbs(self._fondo, dst=self._fondo_gris)
+        np.copyto(self._anterior, self._gris)
+
+        self._actualizar_estado(presencia, movimiento, instante_ns)
+        self.frames_procesados += 1
+        self.tiempos_ns.append(time.perf_counter_ns() - inicio)
+
+    def _reaprender_fondo(self):
+        """Reemplaza el fondo por el frame actual"""
+        if self._mog2 is not None:
+            self._mog2 = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+            self._mog2.apply(self._gris, self._mascara, 1)
+        else:
+            np.copyto(self._fondo, self._gris)
+            np.copyto(self._fondo_gris, self._gris)
+
+    def _actualizar_estado(self, presencia, movimiento, instante_ns):
+        """Máquina de estados vacío -> movimiento -> quieto -> vacío"""
+        hay_objeto = presencia >= self.fraccion_presencia
+
+        if self.estado == ESTADO_VACIO:
+            if hay_objeto:
+                self.estado = ESTADO_MOVIMIENTO
+                self._quietos = 0
+                self._vacios = 0
+                self._sin_movimiento_desde = None
+                self._emitir(EVENTO_LLEGADA, instante_ns, presencia, movimiento)
+            return
+
+        # Presente pero inmóvil durante demasiado tiempo: el fondo está obsoleto
+        if movimiento >= self.fraccion_movimiento:
+            self._sin_movimiento_desde = None
+        elif self._sin_movimiento_desde is None:
+            self._sin_movimiento_desde = instante_ns
+        elif instante_ns - self._sin_movimiento_desde >= self.tiempo_fondo_obsoleto_ns:
+            print("Fondo del detector de movimiento obsoleto, reaprendiendo")
+            self._reaprender_fondo()
+            self.estado = ESTADO_VACIO
+            self._emitir(EVENTO_SALIDA, instante_ns, presencia, movimiento)
+            return
+
+        self._vacios = 0 if hay_objeto else self._vacios + 1
+        if self._vacios >= self.frames_vacio:
+            self.estado = ESTADO_VACIO
+            self._emitir(EVENTO_SALIDA, instante_ns, presencia, movimiento)
+            return
+
+        if self.estado == ESTADO_MOVIMIENTO and hay_objeto:
+            self._quietos = self._quietos + 1 if movimiento < self.fraccion_movimiento else 0
+            if self._quietos >= self.frames_quieto:
+                self.estado = ESTADO_QUIETO
+                self._emitir(EVENTO_QUIETO, instante_ns, presencia, movimiento)
+
+    def _emitir(self, tipo, instante_ns, presencia, movimiento):
+        with self._condicion:
+            self._secuencia += 1
+            self._eventos.append((self._secuencia, EventoMovimiento(tipo, instante_ns, presencia, movimiento)))
+            self._condicion.notify_all()
+
+    @property
+    def objeto_presente(self):
+        """True mientras haya un objeto en la zona"""
+        return self.estado != ESTADO_VACIO
+
+    def esperar_evento(self, tipo=None, timeout=None, despues_ns=None):
+        """
+        Bloquea hasta un evento del detector.
+
+        Args:
+            tipo: EVENTO_LLEGADA, EVENTO_QUIETO, EVENTO_SALIDA o None para cualquiera
+            timeout: Tiempo máximo de espera en segundos (None espera indefinidamente)
+            despues_ns: Si se indica, también acepta eventos ya emitidos cuyo
+                frame sea posterior a este instante
+
+        Returns:
+            EventoMovimiento: Evento recibido o None si no llegó ninguno a tiempo
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._condicion:
+            cursor = 0 if despues_ns is not None else self._secuencia
+            while self._activo:
+                for secuencia, evento in self._eventos:
+                    if (
+                        secuencia > cursor
+                        and (tipo is None or evento.tipo == tipo)
+                        and (despues_ns is None or evento.instante_ns >= despues_ns)
+                    ):
+                        return evento
+                cursor = self._secuencia
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return None
+                self._condicion.wait(restante)
+        return None
+
+    def eventos(self, timeout=None):
+        """
+        Itera sobre los eventos del detector a medida que ocurren.
+
+        Args:
+            timeout: Termina la iteración si no ocurre ningún evento en este tiempo
+
+        Yields:
+            EventoMovimiento: Eventos en orden
+        """
+        with self._condicion:
+            cursor = self._secuencia
+
+        while True:
+            with self._condicion:
+                if not self._condicion.wait_for(
+                    lambda: self._secuencia > cursor or not self._activo, timeout
+                ):
+                    return
+                pendientes = [evento for secuencia, evento in self._eventos if secuencia > cursor]
+                if not pendientes and not self._activo:
+                    return
+                cursor = self._secuencia
+
+            for evento in pendientes:
+                yield evento
+
+    def estadisticas(self):
+        """
+        Resume el costo del análisis por frame.
+
+        Returns:
+            dict: Frames procesados y tiempos p50/p99 en milisegundos
+        """
+        tiempos = sorted(self.tiempos_ns)
+        if not tiempos:
+            return {"frames": self.frames_procesados}
+        return {
+            "frames": self.frames_procesados,
+            "p50_ms": tiempos[len(tiempos) // 2] / 1e6,
+            "p99_ms": tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.99))] / 1e6,
+        }
@@ -0,0 +1,701 @@
+import os
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(DIRECTORIO, "keras_model.h5")
+TFLITE_FP16_PATH = os.path.join(DIRECTORIO, "keras_model_fp16.tflite")
+TFLITE_INT8_PATH = os.path.join(DIRECTORIO, "keras_model_int8.tflite")
+ONNX_PATH = os.path.join(DIRECTORIO, "keras_model.onnx")
+MODEL_IMAGE_SIZE = 224
+
+# Backends disponibles y el modelo que usa cada uno por defecto
+# (los .tflite se generan con Model/convertir_tflite.py y el .onnx con
+# Model/convertir_onnx.py)
+BACKEND_KERAS = "keras"
+BACKEND_TFLITE_FP16 = "tflite_fp16"
+BACKEND_TFLITE_INT8 = "tflite_int8"
+BACKEND_ONNX = "onnx"
+MODELOS = {
+    BACKEND_KERAS: MODEL_PATH,
+    BACKEND_TFLITE_FP16: TFLITE_FP16_PATH,
+    BACKEND_TFLITE_INT8: TFLITE_INT8_PATH,
+    BACKEND_ONNX: ONNX_PATH,
+}
+
+# Orden de canales que espera el modelo. Los frames de OpenCV llegan en BGR y
+# keras_model.h5 siempre se alimentó así; True los convierte a RGB en todas
+# las rutas de preprocesamiento (Preprocesador, preparar_imagen y cv2.dnn).
+SWAP_RB = False
+
+# Hilos del intérprete TFLite; None deja que XNNPACK use todos los núcleos
+TFLITE_HILOS = None
+
+# Formas de combinar las predicciones de una ráfaga de frames
+AGREGACION_MEDIA = "media"
+AGREGACION_VOTO = "voto"
+
+# Confianza top-1 con la que un nivel de la cascada responde sin escalar
+UMBRAL_CASCADA = 0.9
+
+# Cantidad de latencias guardadas para calcular percentiles
+MAX_MUESTRAS_LATENCIA = 1000
+ITERACIONES_CALENTAMIENTO = 3
+
+
+def preparar_imagen(frame, tamano=MODEL_IMAGE_SIZE, swap_rb=SWAP_RB):
+    """
+    Redimensiona un frame y lo normaliza a [-1, 1] como espera keras_model.h5.
+
+    Devuelve un arreglo nuevo; en el camino caliente se usa Preprocesador,
+    que da el mismo resultado sin reservar memoria por frame.
+
+    Args:
+        frame: Imagen BGR de la cámara
+        tamano: Lado de la imagen de entrada del modelo
+        swap_rb: Si es True convierte a RGB
+
+    Returns:
+        np.ndarray: Arreglo float32 de forma (tamano, tamano, 3)
+    """
+    image = cv2.resize(frame, (tamano, tamano), interpolation=cv2.INTER_AREA)
+    if swap_rb:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return np.asarray(image, dtype=np.float32) / 127.5 - 1
+
+
+def agregar_predicciones(predicciones, modo=AGREGACION_MEDIA):
+    """
+    Combina las probabilidades de varios frames del mismo objeto.
+
+    Con AGREGACION_MEDIA promedia las log-probabilidades y vuelve a aplicar
+    softmax, que equivale a promediar los logits del modelo. Con
+    AGREGACION_VOTO cada frame vota por su clase más probable y se devuelve la
+    fracción de votos de cada clase.
+
+    Args:
+        predicciones: Probabilidades de forma (N, clases)
+        modo: AGREGACION_MEDIA o AGREGACION_VOTO
+
+    Returns:
+        np.ndarray: Vector de forma (clases,) que suma 1
+    """
+    predicciones = np.asarray(predicciones, dtype=np.float32)
+    if modo == AGREGACION_VOTO:
+        votos = np.bincount(predicciones.argmax(axis=1), minlength=predicciones.shape[1])
+        return votos / len(predicciones)
+    if modo != AGREGACION_MEDIA:
+        raise ValueError(f"Agregación desconocida: {modo}")
+
+    logits = np.log(np.maximum(predicciones, 1e-7)).mean(axis=0)
+    probabilidades = np.exp(logits - logits.max())
+    return probabilidades / probabilidades.sum()
+
+
+class Preprocesador:
+    def __init__(self, tamano=MODEL_IMAGE_SIZE, escala=1 / 127.5, desplazamiento=-1.0, swap_rb=SWAP_RB, lote=1):
+        """
+        Prepara frames sobre buffers preasignados y reutilizados
+
+        Cada frame se redimensiona directo en un buffer uint8 y se convierte y
+        normaliza en su lugar dentro de un tensor float32 persistente, así que
+        preparar un lote no reserva memoria. El tensor devuelto se sobrescribe
+        en la siguiente llamada: no es seguro compartir una instancia entre hilos.
+
+        Args:
+            tamano: Lado de la imagen de entrada del modelo
+            escala: Factor aplicado a cada píxel (1/127.5 para [-1, 1], 1/255 para [0, 1])
+            desplazamiento: Valor sumado después de escalar
+            swap_rb: Si es True convierte los frames BGR a RGB
+            lote: Cantidad de frames reservada inicialmente
+        """
+        self.tamano = tamano
+        self.escala = escala
+        self.desplazamiento = desplazamiento
+        self.swap_rb = swap_rb
+        self.redimensionados = None
+        self.entrada = None
+        self.reservar(lote)
+
+    def reservar(self, lote):
+        """Asegura buffers para al menos `lote` frames; solo reserva si crecen"""
+        if self.entrada is not None and len(self.entrada) >= lote:
+            return
+        self.redimensionados = np.empty((lote, self.tamano, self.tamano, 3), dtype=np.uint8)
+        self.entrada = np.empty((lote, self.tamano, self.tamano, 3), dtype=np.float32)
+
+    def redimensionar(self, frame, indice=0):
+        """
+        Redimensiona un frame con INTER_AREA dentro del buffer uint8.
+
+        Args:
+            frame: Imagen BGR
+            indice: Posición del frame dentro del lote
+
+        Returns:
+            np.ndarray: Vista (tamano, tamano, 3) uint8 del buffer
+        """
+        destino = self.redimensionados[indice]
+        cv2.resize(frame, (self.tamano, self.tamano), dst=destino, interpolation=cv2.INTER_AREA)
+        return destino
+
+    def preparar(self, frames):
+        """
+        Prepara un lote de frames en el tensor de entrada.
+
+        Args:
+            frames: Lista de imágenes BGR
+
+        Returns:
+            np.ndarray: Vista (N, tamano, tamano, 3) float32 del tensor persistente
+        """
+        self.reservar(len(frames))
+        for i, frame in enumerate(frames):
+            imagen = self.redimensionar(frame, i)
+            np.copyto(self.entrada[i], imagen[..., ::-1] if self.swap_rb else imagen)
+
+        lote = self.entrada[: len(frames)]
+        np.multiply(lote, self.escala, out=lote)
+        np.add(lote, self.desplazamiento, out=lote)
+        return lote
+
+
+class KerasBackend:
+    def __init__(self, model_path=MODEL_PATH, tamano=MODEL_IMAGE_SIZE):
+        """
+        Ejecuta un modelo Keras con un tf.function de firma fija
+
+        La firma (None, tamano, tamano, 3) float32 hace que el grafo se trace
+        una sola vez para cualquier tamaño de lote, sin pasar por la
+        maquinaria de model.predict en cada llamada.
+
+        Args:
+            model_path: Archivo .h5 o .keras del modelo
+            tamano: Lado de la imagen de entrada del modelo
+        """
+        import tensorflow as tf
+
+        self.nombre = "keras"
+        self.model = tf.keras.models.load_model(model_path, compile=False)
+        self._predecir = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec([None, tamano, tamano, 3], tf.float32)],
+        )
+
+    def __call__(self, lote):
+        return self._predecir(lote).numpy()
+
+
+class TFLiteBackend:
+    def __init__(self, model_path=TFLITE_INT8_PATH, hilos=TFLITE_HILOS):
+        """
+        Ejecuta un modelo .tflite (float16 o int8) en CPU
+
+        Usa tflite_runtime si está instalado y si no tf.lite.Interpreter; en
+        ambos casos XNNPACK es el delegado por defecto en CPU. Si el modelo
+        tiene entrada/salida cuantizada, las imágenes en [-1, 1] se cuantizan
+        y las probabilidades se decuantizan aquí.
+
+        Args:
+            model_path: Archivo .tflite
+            hilos: Hilos del intérprete
+        """
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+
+            Interpreter = tf.lite.Interpreter
+
+        self.nombre = "tflite"
+        self.interpreter = Interpreter(model_path=model_path, num_threads=hilos)
+        self.interpreter.allocate_tensors()
+        self._entrada = self.interpreter.get_input_details()[0]
+        self._salida = self.interpreter.get_output_details()[0]
+        self._lote = int(self._entrada["shape"][0])
+
+    def _redimensionar(self, lote):
+        """Ajusta el tamaño de lote del intérprete si cambió desde la última llamada"""
+        if lote == self._lote:
+            return
+        forma = list(self._entrada["shape"])
+        forma[0] = lote
+        self.interpreter.resize_tensor_input(self._entrada["index"], forma)
+        self.interpreter.allocate_tensors()
+        self._entrada = self.interpreter.get_input_details()[0]
+        self._salida = self.interpreter.get_output_details()[0]
+        self._lote = lote
+
+    def __call__(self, lote):
+        self._redimensionar(len(lote))
+
+        tipo = self._entrada["dtype"]
+        if tipo != np.float32:
+            escala, cero = self._entrada["quantization"]
+            info = np.iinfo(tipo)
+            lote = np.clip(np.round(lote / escala + cero), info.min, info.max).astype(tipo)
+        self.interpreter.set_tensor(self._entrada["index"], lote)
+        self.interpreter.invoke()
+
+        salida = self.interpreter.get_tensor(self._salida["index"])
+        if salida.dtype != np.float32:
+            escala, cero = self._salida["quantization"]
+            salida = (salida.astype(np.float32) - cero) * escala
+        return salida
+
+
+class OnnxBackend:
+    def __init__(self, model_path=ONNX_PATH, tamano=MODEL_IMAGE_SIZE, swap_rb=SWAP_RB):
+        """
+        Ejecuta el modelo exportado a ONNX con cv2.dnn, sin TensorFlow
+
+        El modelo se exporta con entrada NCHW, que es el formato que produce
+        cv2.dnn.blobFromImages; así los frames se normalizan y reordenan en
+        una sola llamada nativa.
+
+        Args:
+            model_path: Archivo .onnx
+            tamano: Lado de la imagen de entrada del modelo
+            swap_rb: Si es True convierte los frames BGR a RGB
+        """
+        self.nombre = "onnx"
+        self.tamano = tamano
+        self.swap_rb = swap_rb
+        self._preprocesador = Preprocesador(tamano, swap_rb=swap_rb)
+        self.net = cv2.dnn.readNetFromONNX(model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def preparar_frames(self, frames, preprocesador=None):
+        """
+        Convierte frames BGR en un blob NCHW normalizado como indica el preprocesador
+
+        blobFromImages calcula (pixel - mean) * scalefactor, así que la
+        normalización pixel * escala + desplazamiento del Preprocesador se
+        traduce a mean = -desplazamiento / escala.
+
+        Args:
+            frames: Lista de imágenes BGR de la cámara
+            preprocesador: Preprocesador con la normalización y el orden de
+                canales del modelo; None normaliza a [-1, 1] con swap_rb
+
+        Returns:
+            np.ndarray: Blob (N, 3, tamano, tamano) float32
+        """
+        preprocesador = preprocesador or self._preprocesador
+        if preprocesador.tamano != self.tamano:
+            raise ValueError(
+                f"El preprocesador prepara {preprocesador.tamano}x{preprocesador.tamano} "
+                f"y el modelo ONNX espera {self.tamano}x{self.tamano}"
+            )
+        if preprocesador.escala == 0:
+            raise ValueError("La escala del preprocesador no puede ser 0")
+        media = -preprocesador.desplazamiento / preprocesador.escala
+
+        # blobFromImages redimensiona con interpolación bilineal, que en una
+        # reducción grande difiere bastante de INTER_AREA (la de
+        # preparar_imagen); se reduce antes con INTER_AREA en buffers reutilizados
+        preprocesador.reservar(len(frames))
+        frames = [preprocesador.redimensionar(f, i) for i, f in enumerate(frames)]
+        return cv2.dnn.blobFromImages(
+            frames,
+            scalefactor=preprocesador.escala,
+            size=(self.tamano, self.tamano),
+            mean=(media, media, media),
+            swapRB=preprocesador.swap_rb,
+            crop=False,
+        )
+
+    def ejecutar_blob(self, blob):
+        """Ejecuta la red sobre un blob NCHW"""
+        self.net.setInput(blob)
+        return self.net.forward()
+
+    def __call__(self, lote):
+        return self.ejecutar_blob(np.ascontiguousarray(lote.transpose(0, 3, 1, 2)))
+
+
+class InferenceEngine:
+    def __init__(self, backend, tamano=MODEL_IMAGE_SIZE, preprocesador=None):
+        """
+        Motor de inferencia con calentamiento y medición de latencia
+
+        Args:
+            backend: Objeto invocable que recibe un lote (N, tamano, tamano, 3)
+                float32 y devuelve las probabilidades (N, clases)
+            tamano: Lado de la imagen de entrada del modelo
+            preprocesador: Preprocesador de los frames; None normaliza a
+                [-1, 1] como keras_model.h5
+        """
+        self.backend = backend
+        self.tamano = tamano
+        self.preprocesador = preprocesador or Preprocesador(tamano)
+        self.latencias_ns = deque(maxlen=MAX_MUESTRAS_LATENCIA)
+
+    def warmup(self, iteraciones=ITERACIONES_CALENTAMIENTO, lote=1):
+        """
+        Ejecuta lotes vacíos para que el trazado y la reserva de memoria ocurran al inicio
+
+        Args:
+            iteraciones: Cantidad de pasadas
+            lote: Tamaño de lote que se usará en producción (p. ej. el de la ráfaga)
+        """
+        inicio = time.perf_counter()
+        self.preprocesador.reservar(lote)
+        entrada = np.zeros((lote, self.tamano, self.tamano, 3), dtype=np.float32)
+        for _ in range(iteraciones):
+            self.backend(entrada)
+        print(f"Modelo calentado en {time.perf_counter() - inicio:.2f} s")
+
+    def predict_batch(self, imagenes):
+        """
+        Clasifica un lote de imágenes ya preparadas.
+
+        Args:
+            imagenes: Arreglo (N, tamano, tamano, 3) float32
+
+        Returns:
+            np.ndarray: Probabilidades de forma (N, clases)
+        """
+        lote = np.asarray(imagenes, dtype=np.float32)
+        inicio = time.perf_counter_ns()
+        predicciones = self.backend(lote)
+        self.latencias_ns.append(time.perf_counter_ns() - inicio)
+        return predicciones
+
+    def predict_frames(self, frames):
+        """
+        Prepara y clasifica frames de la cámara.
+
+        Si el backend tiene su propio preprocesamiento nativo (cv2.dnn) se usa
+        ese con la normalización del Preprocesador del motor; si no, los
+        frames se preparan en el tensor persistente del Preprocesador sin
+        reservar memoria.
+
+        Args:
+            frames: Lista de imágenes BGR
+
+        Returns:
+            np.ndarray: Probabilidades de forma (N, clases)
+        """
+        if hasattr(self.backend, "preparar_frames"):
+            blob = self.backend.preparar_frames(frames, self.preprocesador)
+            inicio = time.perf_counter_ns()
+            predicciones = self.backend.ejecutar_blob(blob)
+            self.latencias_ns.append(time.perf_counter_ns() - inicio)
+            return predicciones
+        return self.predict_batch(self.preprocesador.preparar(frames))
+
+    def predict_frame(self, frame):
+        """
+        Prepara y clasifica un frame de la cámara.
+
+        Args:
+            frame: Imagen BGR
+
+        Returns:
+            np.ndarray: Probabilidades de cada clase
+        """
+        return self.predict_frames([frame])[0]
+
+    def predict_burst(self, frames, modo=AGREGACION_MEDIA):
+        """
+        Clasifica una ráfaga de frames del mismo objeto en un solo lote.
+
+        Args:
+            frames: Lista de imágenes BGR
+            modo: AGREGACION_MEDIA o AGREGACION_VOTO
+
+        Returns:
+            np.ndarray: Probabilidades agregadas de cada clase
+        """
+        return agregar_predicciones(self.predict_frames(frames), modo)
+
+    def predict_one(self, imagen):
+        """
+        Clasifica una imagen ya preparada.
+
+        Args:
+            imagen: Arreglo (tamano, tamano, 3) float32
+
+        Returns:
+            np.ndarray: Probabilidades de cada clase
+        """
+        return self.predict_batch(imagen[np.newaxis])[0]
+
+    def estadisticas(self):
+        """
+        Calcula los percentiles de latencia de las llamadas medidas.
+
+        Returns:
+            dict: Cantidad de llamadas y latencias p50/p99 en milisegundos
+        """
+        latencias = sorted(self.latencias_ns)
+        if not latencias:
+            return {"llamadas": 0}
+        return {
+            "llamadas": len(latencias),
+            "p50_ms": latencias[len(latencias) // 2] / 1e6,
+            "p99_ms": latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))] / 1e6,
+        }
+
+
+def crear_motor(backend=BACKEND_KERAS, model_path=None, tamano=MODEL_IMAGE_SIZE, preprocesador=None):
+    """
+    Crea un motor de inferencia con el backend indicado.
+
+    Args:
+        backend: BACKEND_KERAS, BACKEND_TFLITE_FP16, BACKEND_TFLITE_INT8 o BACKEND_ONNX
+        model_path: Archivo del modelo; None usa el de MODELOS
+        tamano: Lado de la imagen de entrada del modelo
+        preprocesador: Preprocesador de los frames; None normaliza a [-1, 1]
+
+    Returns:
+        InferenceEngine: Motor sin calentar
+    """
+    if backend not in MODELOS:
+        raise ValueError(f"Backend desconocido: {backend}")
+    model_path = model_path or MODELOS[backend]
+
+    if backend == BACKEND_KERAS:
+        return InferenceEngine(KerasBackend(model_path, tamano), tamano, preprocesador)
+    if backend == BACKEND_ONNX:
+        return InferenceEngine(OnnxBackend(model_path, tamano, SWAP_RB), tamano, preprocesador)
+    return InferenceEngine(TFLiteBackend(model_path), tamano, preprocesador)
+
+
+def cargar_motor(model_path=None, tamano=MODEL_IMAGE_SIZE, backend=BACKEND_KERAS, lote=1):
+    """
+    Carga el modelo y devuelve un motor de inferencia ya calentado.
+
+    Args:
+        model_path: Archivo del modelo; None usa el del backend
+        tamano: Lado de la imagen de entrada del modelo
+        backend: BACKEND_KERAS, BACKEND_TFLITE_FP16, BACKEND_TFLITE_INT8 o BACKEND_ONNX
+        lote: Tamaño de lote con el que se calienta el motor
+
+    Returns:
+        InferenceEngine: Motor listo para usar, o None si no se pudo cargar
+    """
+    try:
+        print(f"Cargando modelo ({backend})...")
+        motor = crear_motor(backend, model_path, tamano)
+        motor.warmup(lote=lote)
+        print("Modelo cargado exitosamente")
+        return motor
+    except Exception as e:
+        print(f"Error al cargar el modelo: {e}")
+        return None
+
+
+class NivelCascada(NamedTuple):
+    """Un modelo de la cascada y la confianza con la que responde sin escalar"""
+
+    nombre: str
+    motor: InferenceEngine
+    umbral: float = UMBRAL_CASCADA
+    etiquetas: Optional[list] = None  # Nombre de cada salida; None = mismo orden que el primer nivel
+
+
+class CascadeEngine:
+    def __init__(self, niveles):
+        """
+        Cascada de modelos con salida temprana en predicciones seguras
+
+        Cada nivel clasifica solo los frames que el anterior no resolvió con
+        confianza top-1 >= su umbral; el último nivel responde siempre. Las
+        salidas de cada nivel se reordenan a las clases del primero según sus
+        etiquetas, así se pueden combinar modelos con distinto orden de clases.
+
+        Args:
+            niveles: Lista de NivelCascada, del más rápido al más preciso
+        """
+        if not niveles:
+            raise ValueError("La cascada necesita al menos un nivel")
+        self.niveles = niveles
+        self.tamano = niveles[0].motor.tamano
+        referencia = niveles[0].etiquetas
+        self._columnas = [
+            None if referencia is None or nivel.etiquetas is None
+            else np.array([nivel.etiquetas.index(etiqueta) for etiqueta in referencia])
+            for nivel in niveles
+        ]
+        self.evaluados = [0] * len(niveles)
+        self.aceptados = [0] * len(niveles)
+        self.latencias_ns = deque(maxlen=MAX_MUESTRAS_LATENCIA)
+
+    def warmup(self, iteraciones=ITERACIONES_CALENTAMIENTO, lote=1):
+        """Calienta todos los niveles con el tamaño de lote de producción"""
+        for nivel in self.niveles:
+            nivel.motor.warmup(iteraciones, lote)
+
+    def _clasificar(self, indice, frames):
+        """Clasifica frames con un nivel y reordena sus clases a las del primero"""
+        predicciones = self.niveles[indice].motor.predict_frames(frames)
+        self.evaluados[indice] += len(frames)
+        if self._columnas[indice] is not None:
+            predicciones = predicciones[:, self._columnas[indice]]
+        return predicciones
+
+    def predict_frames(self, frames):
+        """
+        Clasifica cada frame con el primer nivel que lo resuelva con confianza.
+
+        Args:
+            frames: Lista de imágenes BGR
+
+        Returns:
+            np.ndarray: Probabilidades de forma (N, clases)
+        """
+        inicio = time.perf_counter_ns()
+        pendientes = np.arange(len(frames))
+        resultado = None
+        for i, nivel in enumerate(self.niveles):
+            predicciones = self._clasificar(i, [frames[j] for j in pendientes])
+            if resultado is None:
+                resultado = np.empty((len(frames), predicciones.shape[1]), dtype=np.float32)
+
+            seguros = predicciones.max(axis=1) >= nivel.umbral
+            if i == len(self.niveles) - 1:
+                seguros[:] = True
+            resultado[pendientes[seguros]] = predicciones[seguros]
+            self.aceptados[i] += int(seguros.sum())
+            pendientes = pendientes[~seguros]
+            if len(pendientes) == 0:
+                break
+        self.latencias_ns.append(time.perf_counter_ns() - inicio)
+        return resultado
+
+    def predict_frame(self, frame):
+        """
+        Clasifica un frame con la cascada.
+
+        Args:
+            frame: Imagen BGR
+
+        Returns:
+            np.ndarray: Probabilidades de cada clase
+        """
+        return self.predict_frames([frame])[0]
+
+    def predict_burst(self, frames, modo=AGREGACION_MEDIA):
+        """
+        Clasifica una ráfaga del mismo objeto decidiendo sobre la predicción agregada.
+
+        La ráfaga completa pasa por un nivel en un solo lote y solo escala al
+        siguiente si la agregación no alcanza el umbral.
+
+        Args:
+            frames: Lista de imágenes BGR
+            modo: AGREGACION_MEDIA o AGREGACION_VOTO
+
+        Returns:
+            np.ndarray: Probabilidades agregadas de cada clase
+        """
+        inicio = time.perf_counter_ns()
+        for i, nivel in enumerate(self.niveles):
+            agregado = agregar_predicciones(self._clasificar(i, frames), modo)
+            if agregado.max() >= nivel.umbral or i == len(self.niveles) - 1:
+                self.aceptados[i] += len(frames)
+                break
+        self.latencias_ns.append(time.perf_counter_ns() - inicio)
+        return agregado
+
+    def estadisticas(self):
+        """
+        Resume cuánto resolvió cada nivel y su latencia.
+
+        Returns:
+            dict: Latencia total p50/p99 y, por nivel, frames evaluados,
+            aceptados, tasa de aceptación y latencia del modelo
+        """
+        latencias = sorted(self.latencias_ns)
+        resumen = {"llamadas": len(latencias)}
+        if latencias:
+            resumen["p50_ms"] = latencias[len(latencias) // 2] / 1e6
+            resumen["p99_ms"] = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))] / 1e6
+
+        for i, nivel in enumerate(self.niveles):
+            resumen[nivel.nombre] = {
+                "evaluados": self.evaluados[i],
+                "aceptados": self.aceptados[i],
+                "tasa_aceptacion": self.aceptados[i] / self.evaluados[i] if self.evaluados[i] else 0.0,
+                **nivel.motor.estadisticas(),
+            }
+        return resumen
+
+
+def cargar_cascada(configuracion, lote=1):
+    """
+    Carga y calienta una cascada a partir de una lista de configuraciones.
+
+    Cada configuración es un dict con 'backend' y opcionalmente 'model_path',
+    'tamano', 'umbral', 'etiquetas', 'escala' y 'desplazamiento' (los dos
+    últimos para modelos que no esperan píxeles en [-1, 1]).
+
+    Args:
+        configuracion: Lista de dicts, del modelo más rápido al más preciso
+        lote: Tamaño de lote con el que se calientan los motores
+
+    Returns:
+        CascadeEngine: Cascada lista para usar, o None si algún nivel no cargó
+    """
+    try:
+        niveles = []
+        for config in configuracion:
+            backend = config["backend"]
+            tamano = config.get("tamano", MODEL_IMAGE_SIZE)
+            preprocesador = Preprocesador(
+                tamano,
+                escala=config.get("escala", 1 / 127.5),
+                desplazamiento=config.get("desplazamiento", -1.0),
+            )
+            print(f"Cargando nivel de cascada ({backend}, {tamano}x{tamano})...")
+            motor = crear_motor(backend, config.get("model_path"), tamano, preprocesador)
+            niveles.append(
+                NivelCascada(
+                    config.get("nombre", backend),
+                    motor,
+                    config.get("umbral", UMBRAL_CASCADA),
+                    config.get("etiquetas"),
+                )
+            )
+        cascada = CascadeEngine(niveles)
+        cascada.warmup(lote=lote)
+        print(f"Cascada cargada: {' -> '.join(n.nombre for n in niveles)}")
+        return cascada
+    except Exception as e:
+        print(f"Error al cargar la cascada: {e}")
+        return None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mide la latencia de un backend de inferencia")
+    parser.add_argument("--backend", choices=list(MODELOS), default=BACKEND_KERAS)
+    args = parser.parse_args()
+
+    motor = cargar_motor(backend=args.backend)
+    if motor is None:
+        return
+
+    rng = np.random.default_rng(0)
+    imagenes = rng.uniform(-1, 1, (8, motor.tamano, motor.tamano, 3)).astype(np.float32)
+    for _ in range(100):
+        motor.predict_one(imagenes[0])
+    print(f"predict_one: {motor.estadisticas()}")
+
+    for lote in (4, 8):
+        motor.latencias_ns.clear()
+        for _ in range(20):
+            motor.predict_batch(imagenes[:lote])
+        print(f"predict_batch x{lote}: {motor.estadisticas()}")
+
+
+if __name__ == "__main__":
+    main()
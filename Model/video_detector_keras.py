@@ -1,16 +1,24 @@
+import os
+import sys
+
+if __package__ in (None, ""):
+    # Ejecutado como script (python Model/video_detector_keras.py): los imports parten de la raíz del repositorio
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import cv2
-import numpy as np
-from PIL import Image
-import tensorflow as tf
+from Model.inferencia import InferenceEngine, KerasBackend, Preprocesador
 
-MODEL_PATH = "HyperWasteClassificator.keras"
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "HyperWasteClassificator.keras")
 camera = 1
 REMOVER_FONDO = False  # Variable para controlar si se remueve el fondo
 
 def cargar_modelo():
     """Carga el modelo de clasificación de desechos desde archivo local."""
     try:
-        model_clasificacion = tf.keras.models.load_model(MODEL_PATH)
+        # Este modelo espera píxeles en [0, 1]
+        preprocesador = Preprocesador(224, escala=1 / 255, desplazamiento=0.0)
+        model_clasificacion = InferenceEngine(KerasBackend(MODEL_PATH), preprocesador=preprocesador)
+        model_clasificacion.warmup()
         return model_clasificacion
     except Exception as e:
         print(f"Error al cargar el modelo: {e}")
@@ -19,18 +27,8 @@ def cargar_modelo():
 def clasificar_desecho(frame, model_clasificacion):
     """Clasifica el material de la imagen."""
     try:
-        # Convertir el frame a formato PIL
-        imagen_pil = Image.fromarray(frame).convert("RGB")
-        
-        # Redimensionar la imagen al tamaño esperado por el modelo (ajustar según sea necesario)
-        imagen_pil = imagen_pil.resize((224, 224))
-        
-        # Convertir a array numpy y normalizar
-        imagen_array = np.array(imagen_pil) / 255.0
-        imagen_array = np.expand_dims(imagen_array, axis=0)
-        
-        # Realizar la predicción
-        predicciones = model_clasificacion.predict(imagen_array, verbose=0)[0]
+        # Redimensionar a 224x224 y normalizar sin pasar por PIL
+        predicciones = model_clasificacion.predict_frame(frame)
         
         labels_clasificacion = {
             "0": "Baterias", "1": "Carton", "2": "Metal", 
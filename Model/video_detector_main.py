@@ -1,17 +1,27 @@
+import os
+import sys
+
+if __package__ in (None, ""):
+    # Ejecutado como script (python Model/video_detector_main.py): los imports parten de la raíz del repositorio
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import cv2
-import numpy as np
-from keras.models import load_model
+from Model.inferencia import cargar_motor
+from Model.zona_deteccion import RESOLUCION_CALIBRACION, cargar_zona, guardar_zona
 
 # Configuración
-MODEL_PATH = "keras_model.h5"
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keras_model.h5")
 camera = 0
 
 # Tamaño de la imagen para el modelo
 MODEL_IMAGE_SIZE = 224
 
 # Posición de la zona de detección (centro por defecto)
-zona_x = 320  # Centro horizontal (640/2)
-zona_y = 240  # Centro vertical (480/2)
+# Resolución del frame; se pide la misma que usa main.py y se actualiza con la
+# que entrega realmente la cámara
+ancho_frame, alto_frame = RESOLUCION_CALIBRACION
+zona_x = ancho_frame // 2  # Centro horizontal
+zona_y = alto_frame // 2  # Centro vertical
 
 # Diccionario de categorías
 labels_clasificacion = {
@@ -45,8 +55,8 @@ def dibujar_zona_deteccion(frame):
 def mostrar_coordenadas_configuracion(frame):
     """Muestra las coordenadas para configurar en main.py"""
     # Calcular coordenadas relativas al centro
-    center_x = 640 // 2
-    center_y = 480 // 2
+    center_x = ancho_frame // 2
+    center_y = alto_frame // 2
     offset_x = zona_x - center_x
     offset_y = zona_y - center_y
     
@@ -79,28 +89,13 @@ def dibujar_barra_progreso(frame, x, y, porcentaje, color):
     cv2.rectangle(frame, (x, y), (x + ancho_barra, y + alto_barra), (255, 255, 255), 1)
 
 def cargar_modelo():
-    """Carga el modelo de clasificación desde archivo local."""
-    try:
-        print("Cargando modelo...")
-        model = load_model(MODEL_PATH, compile=False)
-        print("Modelo cargado exitosamente")
-        return model
-    except Exception as e:
-        print(f"Error al cargar el modelo: {e}")
-        return None
+    """Carga el modelo de clasificación y lo calienta antes de abrir la cámara."""
+    return cargar_motor(MODEL_PATH, MODEL_IMAGE_SIZE)
 
 def procesar_imagen(model, frame):
     """Procesa una imagen con el modelo y retorna las predicciones."""
-    # Redimensionar la imagen para la predicción
-    image = cv2.resize(frame, (MODEL_IMAGE_SIZE, MODEL_IMAGE_SIZE), interpolation=cv2.INTER_AREA)
-    
-    # Preparar la imagen para el modelo
-    image_array = np.asarray(image, dtype=np.float32).reshape(1, MODEL_IMAGE_SIZE, MODEL_IMAGE_SIZE, 3)
-    image_array = (image_array / 127.5) - 1
-
-    # Realizar la predicción
-    prediction = model.predict(image_array, verbose=0)
-    return prediction[0]
+    # El motor redimensiona y normaliza en buffers reutilizados
+    return model.predict_frame(frame)
 
 def mostrar_resultados(frame, prediction):
     """Muestra los resultados de la clasificación en el frame."""
@@ -132,7 +127,7 @@ def mostrar_resultados(frame, prediction):
 
 def procesar_video():
     """Procesa el video de la cámara en tiempo real y clasifica los desechos."""
-    global zona_x, zona_y
+    global zona_x, zona_y, ancho_frame, alto_frame
     
     # Cargar modelo
     model = cargar_modelo()
@@ -146,14 +141,20 @@ def procesar_video():
         return
     print('Camera opened')
 
-    # Configurar la resolución de la cámara a 640x480 (igual que en main.py)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    # Configurar la misma resolución que main.py para que la zona coincida
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, RESOLUCION_CALIBRACION[0])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, RESOLUCION_CALIBRACION[1])
+
+    # Partir de la zona guardada anteriormente, si existe
+    zona = cargar_zona()
+    if zona is not None:
+        zona_x, zona_y = zona["zona_x"], zona["zona_y"]
+        print(f"Zona guardada cargada: ({zona_x}, {zona_y})")
 
     print("=== CONTROLES ===")
     print("Flechas: Mover zona de detección")
     print("ESPACIO: Tomar foto y clasificar")
-    print("ESC: Salir")
+    print("ESC: Salir y guardar la zona para main.py")
     print(f"Tamaño de zona: {MODEL_IMAGE_SIZE}x{MODEL_IMAGE_SIZE} píxeles")
     print("Zona de detección ajustable en tiempo real")
 
@@ -168,6 +169,7 @@ def procesar_video():
         if not ret:
             print("Error al capturar frame de la cámara")
             break
+        ancho_frame, alto_frame = frame.shape[1], frame.shape[0]
 
         # Crear una copia del frame para mostrar
         frame_mostrar = frame.copy()
@@ -231,26 +233,27 @@ def procesar_video():
             zona_y = max(MODEL_IMAGE_SIZE // 2, zona_y - 10)
             print(f"Zona movida arriba. Nueva posición: ({zona_x}, {zona_y})")
         elif key == 84:  # Flecha abajo
-            zona_y = min(480 - MODEL_IMAGE_SIZE // 2, zona_y + 10)
+            zona_y = min(alto_frame - MODEL_IMAGE_SIZE // 2, zona_y + 10)
             print(f"Zona movida abajo. Nueva posición: ({zona_x}, {zona_y})")
         elif key == 81:  # Flecha izquierda
             zona_x = max(MODEL_IMAGE_SIZE // 2, zona_x - 10)
             print(f"Zona movida izquierda. Nueva posición: ({zona_x}, {zona_y})")
         elif key == 83:  # Flecha derecha
-            zona_x = min(640 - MODEL_IMAGE_SIZE // 2, zona_x + 10)
+            zona_x = min(ancho_frame - MODEL_IMAGE_SIZE // 2, zona_x + 10)
             print(f"Zona movida derecha. Nueva posición: ({zona_x}, {zona_y})")
 
     cap.release()
     cv2.destroyAllWindows()
     
-    # Mostrar configuración final
+    # Mostrar configuración final y guardarla para main.py
     print("\n=== CONFIGURACION FINAL PARA MAIN.PY ===")
     print(f"ZONA_X = {zona_x}")
     print(f"ZONA_Y = {zona_y}")
+    guardar_zona(zona_x, zona_y, MODEL_IMAGE_SIZE, (ancho_frame, alto_frame))
     
     # Calcular coordenadas relativas al centro
-    center_x = 640 // 2
-    center_y = 480 // 2
+    center_x = ancho_frame // 2
+    center_y = alto_frame // 2
     offset_x = zona_x - center_x
     offset_y = zona_y - center_y
     print(f"Offset X: {offset_x:+d}")
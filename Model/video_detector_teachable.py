@@ -1,9 +1,15 @@
+import os
+import sys
+
+if __package__ in (None, ""):
+    # Ejecutado como script (python Model/video_detector_teachable.py): los imports parten de la raíz del repositorio
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import cv2
-import numpy as np
-from keras.models import load_model
+from Model.inferencia import cargar_motor
 
 # Configuración
-MODEL_PATH = "keras_model.h5"
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keras_model.h5")
 camera = 0
 
 # Tamaño de la imagen para el modelo
@@ -32,28 +38,13 @@ def dibujar_barra_progreso(frame, x, y, porcentaje, color):
     cv2.rectangle(frame, (x, y), (x + ancho_barra, y + alto_barra), (255, 255, 255), 1)
 
 def cargar_modelo():
-    """Carga el modelo de clasificación desde archivo local."""
-    try:
-        print("Cargando modelo...")
-        model = load_model(MODEL_PATH, compile=False)
-        print("Modelo cargado exitosamente")
-        return model
-    except Exception as e:
-        print(f"Error al cargar el modelo: {e}")
-        return None
+    """Carga el modelo de clasificación y lo calienta antes de abrir la cámara."""
+    return cargar_motor(MODEL_PATH, MODEL_IMAGE_SIZE)
 
 def procesar_imagen(model, frame):
     """Procesa una imagen con el modelo y retorna las predicciones."""
-    # Redimensionar la imagen para la predicción (700x700 -> 224x224)
-    image = cv2.resize(frame, (MODEL_IMAGE_SIZE, MODEL_IMAGE_SIZE), interpolation=cv2.INTER_AREA)
-    
-    # Preparar la imagen para el modelo
-    image_array = np.asarray(image, dtype=np.float32).reshape(1, MODEL_IMAGE_SIZE, MODEL_IMAGE_SIZE, 3)
-    image_array = (image_array / 127.5) - 1
-
-    # Realizar la predicción
-    prediction = model.predict(image_array, verbose=0)
-    return prediction[0]
+    # El motor redimensiona (700x700 -> 224x224) y normaliza en buffers reutilizados
+    return model.predict_frame(frame)
 
 def mostrar_resultados(frame, prediction):
     """Muestra los resultados de la clasificación en el frame."""
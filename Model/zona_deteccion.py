@@ -0,0 +1,112 @@
+import json
+import os
+
+ZONA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zona_deteccion.json")
+
+# Resolución que pide video_detector_main.py al ubicar la zona; es la misma
+# que DISPLAY_WIDTH x DISPLAY_HEIGHT de main.py para que el recorte no se escale
+RESOLUCION_CALIBRACION = (700, 700)
+
+# Resoluciones distintas a la de calibración ya advertidas
+_resoluciones_advertidas = set()
+
+
+def guardar_zona(zona_x, zona_y, tamano, resolucion=RESOLUCION_CALIBRACION, path=ZONA_PATH):
+    """
+    Guarda la zona de detección elegida por el operador.
+
+    Args:
+        zona_x (int): Centro horizontal de la zona en píxeles
+        zona_y (int): Centro vertical de la zona en píxeles
+        tamano (int): Lado de la zona en píxeles
+        resolucion (tuple): (ancho, alto) del frame en que se ubicó la zona
+        path (str): Archivo de configuración
+    """
+    zona = {
+        "zona_x": int(zona_x),
+        "zona_y": int(zona_y),
+        "tamano": int(tamano),
+        "resolucion": [int(resolucion[0]), int(resolucion[1])],
+    }
+    with open(path, "w") as f:
+        json.dump(zona, f, indent=4)
+    print(f"Zona de detección guardada en {path}")
+
+
+def cargar_zona(path=ZONA_PATH):
+    """
+    Carga la zona de detección guardada por video_detector_main.py.
+
+    Args:
+        path (str): Archivo de configuración
+
+    Returns:
+        dict: Zona con zona_x, zona_y, tamano y resolucion, o None si no hay una válida
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            zona = json.load(f)
+        return {
+            "zona_x": int(zona["zona_x"]),
+            "zona_y": int(zona["zona_y"]),
+            "tamano": int(zona["tamano"]),
+            "resolucion": tuple(zona.get("resolucion", RESOLUCION_CALIBRACION)),
+        }
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        print(f"Error al leer la zona de detección {path}: {e}")
+        return None
+
+
+def limites_zona(zona, ancho, alto):
+    """
+    Calcula las esquinas de la zona en un frame.
+
+    Si el frame no tiene la resolución de calibración se advierte una vez y
+    la zona se adapta: el centro conserva su posición relativa y el lado se
+    escala con un único factor, de modo que el recorte sigue siendo cuadrado
+    y el modelo no ve la imagen deformada. La zona se desplaza para quedar
+    dentro del frame en lugar de recortarse.
+
+    Args:
+        zona (dict): Zona de cargar_zona
+        ancho (int): Ancho del frame
+        alto (int): Alto del frame
+
+    Returns:
+        tuple: (x1, y1, x2, y2)
+    """
+    ancho_calibracion, alto_calibracion = zona["resolucion"]
+    escala_x = ancho / ancho_calibracion
+    escala_y = alto / alto_calibracion
+    if (ancho, alto) != (ancho_calibracion, alto_calibracion) and (ancho, alto) not in _resoluciones_advertidas:
+        _resoluciones_advertidas.add((ancho, alto))
+        print(
+            f"Advertencia: la zona se calibró en {ancho_calibracion}x{alto_calibracion} "
+            f"y el frame es de {ancho}x{alto}; recalibra con video_detector_main.py"
+        )
+
+    lado = min(round(zona["tamano"] * min(escala_x, escala_y)), ancho, alto)
+    x1 = round(zona["zona_x"] * escala_x) - lado // 2
+    y1 = round(zona["zona_y"] * escala_y) - lado // 2
+    x1 = min(max(0, x1), ancho - lado)
+    y1 = min(max(0, y1), alto - lado)
+    return x1, y1, x1 + lado, y1 + lado
+
+
+def recortar_zona(frame, zona):
+    """
+    Devuelve la zona de detección de un frame sin copiar píxeles.
+
+    Args:
+        frame (np.ndarray): Imagen BGR
+        zona (dict): Zona de cargar_zona; None devuelve el frame completo
+
+    Returns:
+        np.ndarray: Vista del frame limitada a la zona
+    """
+    if zona is None:
+        return frame
+    x1, y1, x2, y2 = limites_zona(zona, frame.shape[1], frame.shape[0])
+    return frame[y1:y2, x1:x2]
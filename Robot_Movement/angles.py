@@ -72,6 +72,20 @@ def pulsos(q1, q2, q3, q4, q5):
     ]
 
 
+def pulsos_batch(q):
+    """Vectorized pulse calculation for an (N, 5) array of joint angles"""
+    q = np.asarray(q, dtype=float)
+    pulses = np.empty_like(q)
+    for i, joint_name in enumerate(["q1", "q2", "q3", "q4", "q5"]):
+        cal = servo_calibration[joint_name]
+        pulses[:, i] = np.interp(
+            q[:, i],
+            [cal["min_angle"], cal["max_angle"]],
+            [cal["min_pulse"], cal["max_pulse"]],
+        )
+    return np.round(pulses, 5)
+
+
 if __name__ == "__main__":
     q1 = 0
     q2 = 45
@@ -1,23 +1,33 @@
-import time
-from .move_arm import mover_servo
-from .our_lugo_solution import solucion
+from .move_arm import move_pose
+from .poses import obtener_pose
 
+# Orden en que vuelven las articulaciones a la posición cero; moverlas todas
+# a la vez puede hacer chocar el brazo
+ORDEN_CALIBRACION = [2, 4, 6, 8, 0]
 
-def calibrar_brazo():
+
+def calibrar_brazo(esperar=True):
     """
     Realiza la calibración del brazo robótico moviendo cada servo a su posición cero.
+
+    Args:
+        esperar (bool): Si es False, inicia el movimiento y retorna sin esperar a que termine.
     """
     print("\nIniciando calibración del brazo robótico...")
 
     # Posiciones cero de cada servo (ajustar según sea necesario)
-    pulsos_finales, _ = solucion(6, 6, 1, 0, True, 14)
-
-    orden_servos = [2, 4, 6, 8, 0]
-
-    for i, pulso in enumerate(orden_servos):
-        print(f"\nCalibrando servo {pulso}...")
-        time.sleep(0.5)
-        mover_servo(pulso, pulsos_finales[pulso // 2])
+    pulsos_finales = obtener_pose("home")
+    if not pulsos_finales:
+        return False
+
+    # Las articulaciones se mueven de una en una en ORDEN_CALIBRACION
+    if not move_pose(pulsos_finales, orden=ORDEN_CALIBRACION, esperar=esperar):
+        print("\nError: El brazo no llegó a su posición cero.")
+        return False
+
+    if not esperar:
+        print("\nRegresando a la posición cero...")
+        return True
 
     print("\nCalibración completada. El brazo está en su posición cero.")
     return True
@@ -1,44 +1,50 @@
 from .our_lugo_solution import solucion
-import time
-from .move_arm import mover_servo
+from .move_arm import mover_servo, move_pose, esperar_movimiento
+from .poses import obtener_pose
+
+# Orden en que las articulaciones llegan sobre el contenedor, empezando por la base
+ORDEN_SOLTAR = [0, 8, 6, 4, 2]
 
 
 def mover(x, y, z=1, orientacion=0, custom_offset=None, cinta=False):
     pulsos_finales, _ = solucion(x, y, z, orientacion, cinta, custom_offset)
+    return soltar_en(pulsos_finales)
+
+
+def mover_a_pose(nombre):
+    return soltar_en(obtener_pose(nombre))
+
 
+def soltar_en(pulsos_finales):
     if not pulsos_finales:
         print("Error: La posición solicitada no es alcanzable por el robot")
         return False
 
     pulsos_finales[0] = pulsos_finales[0] - 15
-    orden_servos = [0, 8, 6, 4, 2]
-
     print("\nRealizando movimiento a posición final...")
 
-    for _, pulso in enumerate(orden_servos):
-        time.sleep(0.5)
-        mover_servo(pulso, pulsos_finales[pulso // 2])
+    if not move_pose(pulsos_finales, orden=ORDEN_SOLTAR):
+        return False
 
-    time.sleep(1)
+    # Abrir la pinza y esperar a que suelte el objeto
     mover_servo(10, 1008.00)
-
-    return True
+    return esperar_movimiento([10])
 
 
 def colocar_papel_y_carton():
-    return mover(0, 19, custom_offset=6, cinta=True)
+    return mover_a_pose("papel_y_carton")
 
 
 def colocar_plastico():
-    return mover(0, 1, custom_offset=13.8, cinta=True)
+    return mover_a_pose("plastico")
 
 
 def colocar_vidrio():
-    return mover(2.5, -0.5, custom_offset=13.8, cinta=True)
+    return mover_a_pose("vidrio")
 
 
 def colocar_metal_y_bateria():
-    return mover(18, -6, custom_offset=6, cinta=True)
+    return mover_a_pose("metal_y_bateria")
 
 
 def main():
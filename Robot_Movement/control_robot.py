@@ -1,10 +1,13 @@
 from our_lugo_solution import solucion
-import time
-from move_arm import mover_servo
+from move_arm import CANAL_PINZA, mover_servo, move_pose, esperar_movimiento
 from calibration import calibrar_brazo
 from math import sqrt
 from containers_movement import mover_carton
 
+# Orden de las articulaciones hacia la posición final de cada rutina
+ORDEN_AUTOMATICO = [8, 2, 4, 6, 0]
+ORDEN_MANUAL = [CANAL_PINZA, 0, 6, 4, 2, 8]
+
 
 def mover_brazo_robot(x, y, z, orientacion, usar_calibracion=False):
     """
@@ -20,8 +23,7 @@ def mover_brazo_robot(x, y, z, orientacion, usar_calibracion=False):
     """
     if usar_calibracion:
         print("\nRealizando calibración antes del movimiento...")
-        calibrar_brazo()
-        time.sleep(2)  # Esperar a que la calibración se complete
+        calibrar_brazo()  # Bloquea hasta que la calibración se complete
 
     # Obtener los pulsos para la posición final
     pulsos_finales, newQ5 = solucion(x, y, z, orientacion, cinta=True)
@@ -39,34 +41,27 @@ def mover_brazo_robot(x, y, z, orientacion, usar_calibracion=False):
     pulsos_finales[0] = pulsos_finales[0] - 15
     pulsos_finales[2] = pulsos_finales[2] - 200
 
-    orden_servos = [8, 2, 4, 6, 0]
-
     # Mover el servo adicional si es necesario
     newQ5 = 1008.00
     if newQ5 != 0:
         mover_servo(10, newQ5)
-
-    # Esperar un momento para que el movimiento se complete
-    time.sleep(1)
+        esperar_movimiento([10])
 
     # Segundo movimiento: posición final
     print("\nRealizando movimiento a posición final...")
-    # Mover cada servo a su posición final
-    for i, pulso in enumerate(orden_servos):
-        time.sleep(0.5)
-        mover_servo(pulso, pulsos_finales[pulso // 2])
+    # Mover las articulaciones a su posición final de una en una
+    move_pose(pulsos_finales, orden=ORDEN_AUTOMATICO)
 
-    time.sleep(1)
     mover_servo(4, pulsos_elevados[2])
-    time.sleep(0.5)
+    esperar_movimiento([4])
 
     newQ5 = 2208.00
     if newQ5 != 0:
         mover_servo(10, newQ5)
+        esperar_movimiento([10])
 
-    time.sleep(1)
     mover_servo(4, pulsos_finales[2])
-    time.sleep(1)
+    esperar_movimiento([4])
 
     mover_carton()
 
@@ -87,8 +82,7 @@ def mover_brazo_robot_manual(x, y, z, orientacion, usar_calibracion=False):
     """
     if usar_calibracion:
         print("\nRealizando calibración antes del movimiento...")
-        calibrar_brazo()
-        time.sleep(2)  # Esperar a que la calibración se complete
+        calibrar_brazo()  # Bloquea hasta que la calibración se complete
 
     # Obtener los pulsos para la posición final
     pulsos_finales, newQ5 = solucion(x, y, z, orientacion, cinta=True)
@@ -97,25 +91,15 @@ def mover_brazo_robot_manual(x, y, z, orientacion, usar_calibracion=False):
         print("Error: La posición solicitada no es alcanzable por el robot")
         return False
 
-    orden_servos = [0, 6, 4, 2, 8]
-
-    # Esperar un momento para que el movimiento se complete
-    time.sleep(1)
-
     # Segundo movimiento: posición final
     print("\nRealizando movimiento a posición final...")
-    # Mover cada servo a su posición final
-    mover_servo(10, 1008.00)
-    time.sleep(0.5)
-    for i, pulso in enumerate(orden_servos):
-        time.sleep(0.5)
-        mover_servo(pulso, pulsos_finales[pulso // 2])
-
-    time.sleep(1)
+    # Abrir la pinza y mover las articulaciones de una en una
+    move_pose(pulsos_finales, pinza=1008.00, orden=ORDEN_MANUAL)
 
     mover_servo(10, 2208.00)
-    time.sleep(1)
+    esperar_movimiento([10])
     mover_servo(4, 1120.00)
+    esperar_movimiento([4])
     
     return True
 
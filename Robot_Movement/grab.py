@@ -1,26 +1,36 @@
-import time
-from Robot_Movement.move_arm import mover_servo
-from Robot_Movement.our_lugo_solution import solucion
+from Robot_Movement.move_arm import CANAL_PINZA, mover_servo, move_pose, esperar_movimiento
+from Robot_Movement.poses import obtener_pose
+from Robot_Movement.ik_grid import obtener_grilla
 
+# Orden de la pose de agarre: la pinza se abre antes de mover el brazo y las
+# articulaciones llegan de una en una
+ORDEN_AGARRE = [CANAL_PINZA, 0, 4, 2, 6, 8]
 
-def grab_object():
-    print("\nAgarrando un objeto...")
 
-    pulsos_finales, _ = solucion(15, 10, 1, 0, True)
+def grab_object(x=None, y=None):
+    """
+    Agarra un objeto en la pose fija de agarre o en un punto de la cinta.
 
-    orden_servos = [0, 4, 2, 6, 8]
+    Args:
+        x (float): Coordenada X en cm del punto de agarre (opcional, p. ej. desde visión)
+        y (float): Coordenada Y en cm del punto de agarre (opcional)
+    """
+    print("\nAgarrando un objeto...")
 
-    mover_servo(10, 1008.00)
-    time.sleep(0.5)
+    if x is None or y is None:
+        pulsos_finales = obtener_pose("agarre")
+    else:
+        pulsos_finales = obtener_grilla().resolver(x, y)
+    if not pulsos_finales:
+        return False
 
-    for i, pulso in enumerate(orden_servos):
-        time.sleep(0.5)
-        mover_servo(pulso, pulsos_finales[pulso // 2])
+    # Abrir la pinza y llevar el brazo a la pose de agarre articulación por articulación
+    if not move_pose(pulsos_finales, pinza=1008.00, orden=ORDEN_AGARRE):
+        return False
 
-    time.sleep(1)
+    # Cerrar la pinza y esperar a que sujete el objeto antes de levantarlo
     mover_servo(10, 1900.00)
-
-    return True
+    return esperar_movimiento([10])
 
 
 if __name__ == "__main__":
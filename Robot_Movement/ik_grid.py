@@ -0,0 +1,201 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from Robot_Movement.angles import angulos_pulsos
+from Robot_Movement.our_lugo_solution import cinta_offset, huella_calibracion, solucion_batch
+
+# Ejes de la grilla: coordenadas en cm y offsets de la cinta
+X_EJE = (-5.0, 30.0, 0.25)
+Y_EJE = (-15.0, 25.0, 0.25)
+OFFSET_EJE = (4.0, 16.0, 0.5)
+
+# Diferencia máxima de pulsos entre esquinas de una celda antes de usar la solución exacta.
+# Cerca del origen (q1 indefinido) y del borde del alcance la celda deja de ser suave;
+# con 120 us el error de interpolación queda por debajo de ~8 us en el resto.
+UMBRAL_DISCONTINUIDAD = 120.0
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+GRID_PATH = os.path.join(DIRECTORIO, "ik_grid.npy")
+META_PATH = os.path.join(DIRECTORIO, "ik_grid.json")
+
+
+def _eje(inicio, fin, paso):
+    return np.arange(inicio, fin + paso / 2, paso)
+
+
+class IKGrid:
+    def __init__(self, grid_path=GRID_PATH, meta_path=META_PATH):
+        """
+        Grilla precalculada de pulsos q1..q4 sobre (x, y, offset)
+
+        La grilla se guarda como .npy y se abre con memmap, de modo que solo se
+        leen de disco las celdas consultadas. Si la calibración o los ejes
+        cambian, se reconstruye automáticamente.
+
+        Args:
+            grid_path: Ruta del archivo .npy con los pulsos
+            meta_path: Ruta del archivo con la huella y los ejes de la grilla
+        """
+        self.grid_path = grid_path
+        self.meta_path = meta_path
+        self.xs = _eje(*X_EJE)
+        self.ys = _eje(*Y_EJE)
+        self.offsets = _eje(*OFFSET_EJE)
+        self.pulsos = None
+        self.consultas = 0
+        self.respaldos = 0
+        self._cargar()
+
+    def _metadatos(self):
+        return {
+            "huella": huella_calibracion(),
+            "x": list(X_EJE),
+            "y": list(Y_EJE),
+            "offset": list(OFFSET_EJE),
+        }
+
+    def _cargar(self):
+        """Abre la grilla desde disco o la reconstruye si está desactualizada"""
+        metadatos = self._metadatos()
+        if os.path.exists(self.grid_path) and os.path.exists(self.meta_path):
+            with open(self.meta_path, "r") as f:
+                try:
+                    if json.load(f) == metadatos:
+                        self.pulsos = np.load(self.grid_path, mmap_mode="r")
+                        return
+                except json.JSONDecodeError:
+                    pass
+
+        self.construir()
+        with open(self.meta_path, "w") as f:
+            json.dump(metadatos, f, indent=4)
+        self.pulsos = np.load(self.grid_path, mmap_mode="r")
+
+    def construir(self):
+        """Calcula la grilla completa con solucion_batch y la escribe en disco"""
+        print("Construyendo grilla de cinemática inversa...")
+        inicio = time.monotonic()
+        forma = (len(self.offsets), len(self.xs), len(self.ys))
+        grilla = np.lib.format.open_memmap(
+            self.grid_path, mode="w+", dtype=np.float32, shape=forma + (4,)
+        )
+
+        xx, yy = np.meshgrid(self.xs, self.ys, indexing="ij")
+        for k, offset in enumerate(self.offsets):
+            pulsos, _ = solucion_batch(xx.ravel(), yy.ravel(), 0, True, offset)
+            grilla[k] = pulsos[:, :4].reshape(len(self.xs), len(self.ys), 4)
+
+        grilla.flush()
+        del grilla
+        print(f"Grilla construida en {time.monotonic() - inicio:.2f} s: {forma}")
+
+    @staticmethod
+    def _celda(eje, valor):
+        """Índice inferior y fracción dentro de la celda, o None si está fuera del eje"""
+        paso = eje[1] - eje[0]
+        posicion = (valor - eje[0]) / paso
+        indice = int(np.floor(posicion))
+        if indice < 0 or indice >= len(eje) - 1:
+            if indice == len(eje) - 1 and posicion == indice:
+                return indice - 1, 1.0
+            return None
+        return indice, posicion - indice
+
+    def _interpolar(self, x, y, offset):
+        """Interpolación trilineal; None si la celda sale de la grilla o no es suave"""
+        celdas = [
+            self._celda(self.offsets, offset),
+            self._celda(self.xs, x),
+            self._celda(self.ys, y),
+        ]
+        if any(c is None for c in celdas):
+            return None
+        (k, fk), (i, fi), (j, fj) = celdas
+
+        esquinas = np.asarray(self.pulsos[k : k + 2, i : i + 2, j : j + 2], dtype=np.float64)
+        if np.isnan(esquinas).any():
+            return None
+        rango = esquinas.max(axis=(0, 1, 2)) - esquinas.min(axis=(0, 1, 2))
+        if (rango > UMBRAL_DISCONTINUIDAD).any():
+            return None
+
+        # Bilineal en (x, y) para cada offset y lineal entre los dos offsets
+        c = esquinas[:, 0] * (1 - fi) + esquinas[:, 1] * fi
+        c = c[:, 0] * (1 - fj) + c[:, 1] * fj
+        return c[0] * (1 - fk) + c[1] * fk
+
+    def resolver(self, x, y, orientacion=0, offset=None):
+        """
+        Devuelve los pulsos para un punto de agarre sobre la cinta.
+
+        Usa la grilla cuando el punto cae dentro de ella y lejos de puntos
+        singulares; en otro caso resuelve exactamente con solucion_batch.
+
+        Args:
+            x (float): Coordenada X en cm
+            y (float): Coordenada Y en cm
+            orientacion (float): Orientación de la pinza en grados
+            offset (float): Offset de la cinta; None usa cinta_offset
+
+        Returns:
+            list: Pulsos q1..q5 o None si el punto no es alcanzable
+        """
+        self.consultas += 1
+        offset = cinta_offset if offset is None else offset
+
+        pulsos = self._interpolar(x, y, offset)
+        if pulsos is None:
+            self.respaldos += 1
+            exactos, alcanzable = solucion_batch(x, y, orientacion, True, offset)
+            if not alcanzable[0]:
+                return None
+            return [float(p) for p in exactos[0]]
+
+        return [round(float(p), 5) for p in pulsos] + [angulos_pulsos(orientacion, "q5")]
+
+
+_grilla = None
+
+
+def obtener_grilla():
+    """
+    Devuelve la grilla compartida, cargándola o construyéndola la primera vez.
+
+    Returns:
+        IKGrid: Grilla lista para consultar
+    """
+    global _grilla
+    if _grilla is None:
+        _grilla = IKGrid()
+    return _grilla
+
+
+def main():
+    grilla = obtener_grilla()
+
+    # Comparar contra la solución exacta en puntos aleatorios
+    rng = np.random.default_rng(0)
+    n = 2000
+    xs = rng.uniform(X_EJE[0], X_EJE[1], n)
+    ys = rng.uniform(Y_EJE[0], Y_EJE[1], n)
+    offsets = rng.uniform(OFFSET_EJE[0], OFFSET_EJE[1], n)
+    exactos, alcanzable = solucion_batch(xs, ys, 0, True, offsets)
+
+    errores = []
+    inicio = time.perf_counter()
+    for i in range(n):
+        pulsos = grilla.resolver(xs[i], ys[i], 0, offsets[i])
+        if pulsos is not None and alcanzable[i]:
+            errores.append(np.abs(np.array(pulsos) - exactos[i]).max())
+    duracion = time.perf_counter() - inicio
+
+    print(f"Consultas: {grilla.consultas}, resueltas exactamente: {grilla.respaldos}")
+    print(f"Tiempo por consulta: {duracion / n * 1e6:.1f} us")
+    print(f"Error máximo: {max(errores):.3f} us, error medio: {np.mean(errores):.3f} us")
+
+
+if __name__ == "__main__":
+    main()
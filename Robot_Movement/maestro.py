@@ -0,0 +1,313 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import serial
+
+# Puerto y velocidad por defecto de la Pololu Maestro (ver control_brazo.cpp)
+MAESTRO_PORT = os.environ.get("MAESTRO_PORT", "COM5")
+MAESTRO_BAUDRATE = 115200
+
+# Rango aceptado por la Maestro (mismo que validaba control_brazo.exe)
+CANAL_MAXIMO = 11
+PULSO_MINIMO_US = 250
+PULSO_MAXIMO_US = 2500
+
+# Comandos del protocolo serial de la Maestro
+CMD_SET_TARGET = 0x84
+CMD_SET_MULTIPLE_TARGETS = 0x9F
+CMD_SET_SPEED = 0x87
+CMD_SET_ACCELERATION = 0x89
+CMD_GET_POSITION = 0x90
+CMD_GET_MOVING_STATE = 0x93
+
+
+class MaestroController:
+    def __init__(
+        self,
+        port: str = MAESTRO_PORT,
+        baudrate: int = MAESTRO_BAUDRATE,
+        timeout: float = 0.1,
+        device_number: Optional[int] = None,
+    ):
+        """
+        Controlador persistente de la Pololu Maestro
+
+        Abre el puerto serial una sola vez y envía los comandos binarios
+        directamente, en lugar de lanzar control_brazo.exe por cada movimiento.
+
+        Args:
+            port: Puerto serial de comandos de la Maestro (ej: 'COM5', '/dev/ttyACM0')
+            baudrate: Velocidad de comunicación
+            timeout: Tiempo de espera para operaciones de lectura
+            device_number: Número de dispositivo para usar el protocolo Pololu.
+                Si es None se usa el protocolo compacto.
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.device_number = device_number
+        self.serial_connection: Optional[serial.Serial] = None
+        self.is_connected = False
+        # Último objetivo enviado por canal, en unidades de 0.25 us
+        self.targets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def connect(self) -> bool:
+        """
+        Abre el puerto serial de la Maestro
+
+        Returns:
+            bool: True si la conexión fue exitosa, False en caso contrario
+        """
+        try:
+            self.serial_connection = serial.Serial(
+                port=self.port, baudrate=self.baudrate, timeout=self.timeout
+            )
+            self.is_connected = True
+            print(f"Conectado a la Maestro en {self.port}")
+            return True
+        except serial.SerialException as e:
+            print(f"Error al conectar con la Maestro: {e}")
+            self.is_connected = False
+            return False
+
+    def disconnect(self):
+        """Cierra la conexión con la Maestro"""
+        if self.serial_connection and self.serial_connection.is_open:
+            self.serial_connection.close()
+            print("Desconectado de la Maestro")
+        self.is_connected = False
+
+    def _comando(self, comando: int, datos: bytes = b"") -> bytes:
+        """Arma un comando en protocolo compacto o Pololu según la configuración"""
+        if self.device_number is None:
+            return bytes([comando]) + datos
+        return bytes([0xAA, self.device_number, comando & 0x7F]) + datos
+
+    def _escribir(self, mensaje: bytes) -> bool:
+        """Escribe un mensaje completo en el puerto serial"""
+        if not self.is_connected or not self.serial_connection:
+            print("No hay conexión con la Maestro")
+            return False
+
+        try:
+            with self._lock:
+                self.serial_connection.write(mensaje)
+            return True
+        except serial.SerialException as e:
+            print(f"Error al escribir en la Maestro: {e}")
+            self.is_connected = False
+            return False
+
+    def _consultar(self, mensaje: bytes, longitud: int) -> Optional[bytes]:
+        """Envía un comando de lectura y espera la respuesta completa"""
+        if not self.is_connected or not self.serial_connection:
+            print("No hay conexión con la Maestro")
+            return None
+
+        try:
+            with self._lock:
+                self.serial_connection.write(mensaje)
+                respuesta = self.serial_connection.read(longitud)
+        except serial.SerialException as e:
+            print(f"Error al leer de la Maestro: {e}")
+            self.is_connected = False
+            return None
+
+        if len(respuesta) != longitud:
+            print("Error: La Maestro no respondió a tiempo")
+            return None
+        return respuesta
+
+    @staticmethod
+    def _validar(canal: int, posicion_us: float) -> bool:
+        """Verifica que el canal y la posición estén dentro del rango de la Maestro"""
+        if not (0 <= canal <= CANAL_MAXIMO) or not (
+            PULSO_MINIMO_US <= posicion_us <= PULSO_MAXIMO_US
+        ):
+            print(
+                f"Error: Numero de servo debe estar entre 0 y {CANAL_MAXIMO}, "
+                f"y la posicion entre {PULSO_MINIMO_US} y {PULSO_MAXIMO_US} us."
+            )
+            return False
+        return True
+
+    @staticmethod
+    def _siete_bits(valor: int) -> bytes:
+        """Divide un valor de 14 bits en dos bytes de 7 bits"""
+        return bytes([valor & 0x7F, (valor >> 7) & 0x7F])
+
+    @staticmethod
+    def _cuartos_us(posicion_us: float) -> int:
+        """Convierte microsegundos a unidades de 0.25 us"""
+        return int(round(posicion_us * 4))
+
+    def _objetivo(self, posicion_us: float) -> bytes:
+        """Convierte microsegundos a unidades de 0.25 us en dos bytes de 7 bits"""
+        return self._siete_bits(self._cuartos_us(posicion_us))
+
+    def set_target(self, canal: int, posicion_us: float) -> bool:
+        """
+        Establece el objetivo de un servo
+
+        Args:
+            canal: Canal de la Maestro (0-11)
+            posicion_us: Posición deseada en microsegundos
+
+        Returns:
+            bool: True si el comando se envió exitosamente
+        """
+        if not self._validar(canal, posicion_us):
+            return False
+
+        if not self._escribir(
+            self._comando(CMD_SET_TARGET, bytes([canal]) + self._objetivo(posicion_us))
+        ):
+            return False
+        self.targets[canal] = self._cuartos_us(posicion_us)
+        return True
+
+    def set_multiple_targets(self, objetivos: Dict[int, float]) -> bool:
+        """
+        Establece el objetivo de varios servos en una sola escritura
+
+        Los canales consecutivos se agrupan en un comando "Set Multiple Targets"
+        y los grupos se concatenan en un único mensaje, de modo que toda la pose
+        llega a la Maestro en la misma trama.
+
+        Args:
+            objetivos: Diccionario {canal: posición en microsegundos}
+
+        Returns:
+            bool: True si el comando se envió exitosamente
+        """
+        if not objetivos:
+            return True
+
+        for canal, posicion_us in objetivos.items():
+            if not self._validar(canal, posicion_us):
+                return False
+
+        # Agrupar canales consecutivos (los del brazo son 0, 2, 4, ... y quedan separados)
+        grupos = []
+        for canal in sorted(objetivos):
+            if grupos and canal == grupos[-1][-1] + 1:
+                grupos[-1].append(canal)
+            else:
+                grupos.append([canal])
+
+        mensaje = b""
+        for grupo in grupos:
+            if len(grupo) == 1:
+                datos = bytes([grupo[0]]) + self._objetivo(objetivos[grupo[0]])
+                mensaje += self._comando(CMD_SET_TARGET, datos)
+            else:
+                datos = bytes([len(grupo), grupo[0]])
+                for canal in grupo:
+                    datos += self._objetivo(objetivos[canal])
+                mensaje += self._comando(CMD_SET_MULTIPLE_TARGETS, datos)
+
+        if not self._escribir(mensaje):
+            return False
+        for canal, posicion_us in objetivos.items():
+            self.targets[canal] = self._cuartos_us(posicion_us)
+        return True
+
+    def set_speed(self, canal: int, velocidad: int) -> bool:
+        """
+        Limita la velocidad de un canal
+
+        Args:
+            canal: Canal de la Maestro (0-11)
+            velocidad: Límite en unidades de 0.25 us / 10 ms (0 = sin límite)
+        """
+        return self._escribir(
+            self._comando(CMD_SET_SPEED, bytes([canal]) + self._siete_bits(velocidad))
+        )
+
+    def set_acceleration(self, canal: int, aceleracion: int) -> bool:
+        """
+        Limita la aceleración de un canal
+
+        Args:
+            canal: Canal de la Maestro (0-11)
+            aceleracion: Límite en unidades de 0.25 us / 10 ms / 80 ms (0-255, 0 = sin límite)
+        """
+        return self._escribir(
+            self._comando(
+                CMD_SET_ACCELERATION, bytes([canal]) + self._siete_bits(aceleracion)
+            )
+        )
+
+    def get_position(self, canal: int) -> Optional[int]:
+        """
+        Lee la posición actual que la Maestro está enviando a un canal
+
+        Returns:
+            int: Posición en unidades de 0.25 us o None si hubo un error
+        """
+        respuesta = self._consultar(self._comando(CMD_GET_POSITION, bytes([canal])), 2)
+        if respuesta is None:
+            return None
+        return respuesta[0] | (respuesta[1] << 8)
+
+    def get_moving_state(self) -> Optional[bool]:
+        """
+        Indica si algún canal sigue moviéndose hacia su objetivo
+
+        Returns:
+            bool: True si hay servos en movimiento, None si hubo un error
+        """
+        respuesta = self._consultar(self._comando(CMD_GET_MOVING_STATE), 1)
+        if respuesta is None:
+            return None
+        return respuesta[0] != 0
+
+    def wait_until_settled(
+        self,
+        canales: Optional[Iterable[int]] = None,
+        timeout: float = 3.0,
+        intervalo: float = 0.01,
+    ) -> bool:
+        """
+        Bloquea hasta que los servos lleguen a su objetivo
+
+        Con canales se compara la posición de cada uno contra el último objetivo
+        enviado; sin canales se usa el estado de movimiento global de la Maestro.
+        La Maestro solo conoce el pulso que genera, por lo que la espera es
+        significativa únicamente en canales con límite de velocidad o aceleración.
+
+        Args:
+            canales: Canales a esperar o None para esperar a todos
+            timeout: Tiempo máximo de espera en segundos
+            intervalo: Tiempo entre consultas en segundos
+
+        Returns:
+            bool: True si los servos se detuvieron, False si se agotó el tiempo o hubo un error
+        """
+        pendientes = None if canales is None else [c for c in canales if c in self.targets]
+        limite = time.monotonic() + timeout
+
+        while True:
+            if pendientes is None:
+                en_movimiento = self.get_moving_state()
+                if en_movimiento is None:
+                    return False
+                if not en_movimiento:
+                    return True
+            else:
+                for canal in list(pendientes):
+                    posicion = self.get_position(canal)
+                    if posicion is None:
+                        return False
+                    if posicion == self.targets[canal]:
+                        pendientes.remove(canal)
+                if not pendientes:
+                    return True
+
+            if time.monotonic() >= limite:
+                print(f"Advertencia: Los servos no se detuvieron en {timeout} s")
+                return False
+            time.sleep(intervalo)
@@ -0,0 +1,361 @@
+import argparse
+import math
+import os
+import pty
+import select
+import threading
+import time
+import tty
+
+# Periodo de actualización de la Maestro: velocidad y aceleración se expresan por cada 10 ms
+PERIODO_ACTUALIZACION = 0.01
+NUMERO_CANALES = 12
+
+# Longitud de datos de cada comando (sin contar el byte de comando)
+LONGITUD_DATOS = {
+    0x84: 3,  # Set Target
+    0x87: 3,  # Set Speed
+    0x89: 3,  # Set Acceleration
+    0x90: 1,  # Get Position
+    0x93: 0,  # Get Moving State
+    0xA1: 0,  # Get Errors
+    0xA2: 0,  # Go Home
+}
+CMD_SET_MULTIPLE_TARGETS = 0x9F
+NOMBRES_COMANDOS = {
+    0x84: "set_target",
+    0x87: "set_speed",
+    0x89: "set_acceleration",
+    0x90: "get_position",
+    0x93: "get_moving_state",
+    0x9F: "set_multiple_targets",
+    0xA1: "get_errors",
+    0xA2: "go_home",
+}
+
+
+class CanalEmulado:
+    def __init__(self):
+        """Estado de un canal: objetivo, posición y límites en unidades de la Maestro"""
+        self.target = 0
+        self.position = 0.0
+        self.speed = 0
+        self.acceleration = 0
+        self.velocity = 0.0
+
+    def actualizar(self):
+        """Avanza la posición un periodo de 10 ms respetando velocidad y aceleración"""
+        distancia = self.target - self.position
+        if self.target == 0 or self.position == 0 or (
+            self.speed == 0 and self.acceleration == 0
+        ):
+            # Sin límites (o canal apagado) la Maestro salta directamente al objetivo
+            self.position = float(self.target)
+            self.velocity = 0.0
+            return
+
+        if distancia == 0:
+            self.velocity = 0.0
+            return
+
+        direccion = 1 if distancia > 0 else -1
+        limite = self.speed if self.speed else math.inf
+
+        if self.acceleration:
+            # La aceleración se aplica cada 80 ms; por periodo de 10 ms es un octavo
+            incremento = self.acceleration / 8
+            # Velocidad máxima que todavía permite frenar antes del objetivo
+            frenado = math.sqrt(2 * incremento * abs(distancia))
+            deseada = min(limite, frenado)
+            rapidez = min(abs(self.velocity) + incremento, deseada)
+        else:
+            rapidez = limite
+
+        paso = min(rapidez, abs(distancia))
+        self.position += direccion * paso
+        self.velocity = direccion * paso
+
+    @property
+    def moving(self) -> bool:
+        return round(self.position) != self.target
+
+
+class MaestroEmulator:
+    def __init__(self, numero_canales: int = NUMERO_CANALES, log_path: str = None, verbose: bool = False):
+        """
+        Emulador por software de la Pololu Maestro sobre un pseudo-terminal
+
+        Expone un pty que habla el protocolo serial compacto y Pololu de la
+        Maestro, modela la rampa de cada canal con sus límites de velocidad y
+        aceleración, y registra cada comando recibido con su marca de tiempo.
+        Solo funciona en sistemas POSIX (Linux/Mac).
+
+        Args:
+            numero_canales: Cantidad de canales emulados
+            log_path: Archivo opcional donde escribir el registro de comandos
+            verbose: Si es True imprime cada comando recibido
+        """
+        self.canales = [CanalEmulado() for _ in range(numero_canales)]
+        self.log_path = log_path
+        self.verbose = verbose
+        self.registro = []
+        self.port = None
+        self._master_fd = None
+        self._slave_fd = None
+        self._log_file = None
+        self._buffer = b""
+        self._inicio = None
+        self._activo = False
+        self._lock = threading.Lock()
+        self._hilos = []
+
+    def start(self) -> str:
+        """
+        Abre el pseudo-terminal e inicia los hilos de lectura y simulación
+
+        Returns:
+            str: Ruta del puerto serial emulado (ej: '/dev/pts/3')
+        """
+        self._master_fd, self._slave_fd = pty.openpty()
+        tty.setraw(self._master_fd)
+        self.port = os.ttyname(self._slave_fd)
+        if self.log_path:
+            self._log_file = open(self.log_path, "w")
+        self._inicio = time.monotonic()
+        self._activo = True
+
+        for objetivo in (self._bucle_lectura, self._bucle_simulacion):
+            hilo = threading.Thread(target=objetivo, daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+
+        print(f"Maestro emulada en {self.port}")
+        return self.port
+
+    def stop(self):
+        """Detiene el emulador y cierra el pseudo-terminal"""
+        self._activo = False
+        for hilo in self._hilos:
+            hilo.join(timeout=1)
+        self._hilos = []
+        for fd in (self._master_fd, self._slave_fd):
+            if fd is not None:
+                os.close(fd)
+        self._master_fd = self._slave_fd = None
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+    def _registrar(self, comando: int, datos: tuple):
+        """Guarda un comando con el tiempo transcurrido desde el inicio"""
+        t = time.monotonic() - self._inicio
+        entrada = (t, NOMBRES_COMANDOS.get(comando, hex(comando)), datos)
+        self.registro.append(entrada)
+        linea = f"{t:10.6f} {entrada[1]} {' '.join(str(d) for d in datos)}"
+        if self._log_file:
+            self._log_file.write(linea + "\n")
+        if self.verbose:
+            print(linea)
+
+    def _bucle_simulacion(self):
+        """Actualiza todos los canales cada 10 ms sobre plazos monotónicos"""
+        siguiente = time.monotonic()
+        while self._activo:
+            with self._lock:
+                for canal in self.canales:
+                    canal.actualizar()
+            siguiente += PERIODO_ACTUALIZACION
+            espera = siguiente - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+            else:
+                siguiente = time.monotonic()
+
+    def _bucle_lectura(self):
+        """Lee bytes del pty y ejecuta los comandos completos"""
+        while self._activo:
+            listos, _, _ = select.select([self._master_fd], [], [], 0.1)
+            if not listos:
+                continue
+            try:
+                datos = os.read(self._master_fd, 1024)
+            except OSError:
+                break
+            self._buffer += datos
+            self._procesar_buffer()
+
+    def _procesar_buffer(self):
+        """Decodifica todos los comandos completos que haya en el buffer"""
+        while self._buffer:
+            inicio = self._buffer[0]
+            if inicio == 0xAA:
+                # Protocolo Pololu: 0xAA, número de dispositivo, comando sin el bit alto
+                if len(self._buffer) < 3:
+                    return
+                comando = self._buffer[2] | 0x80
+                cabecera = 3
+            elif inicio & 0x80:
+                comando = inicio
+                cabecera = 1
+            else:
+                # Byte de datos sin comando: se descarta como haría la Maestro
+                self._buffer = self._buffer[1:]
+                continue
+
+            if comando == CMD_SET_MULTIPLE_TARGETS:
+                if len(self._buffer) < cabecera + 1:
+                    return
+                longitud = 2 + 2 * self._buffer[cabecera]
+            elif comando in LONGITUD_DATOS:
+                longitud = LONGITUD_DATOS[comando]
+            else:
+                self._buffer = self._buffer[cabecera:]
+                continue
+
+            if len(self._buffer) < cabecera + longitud:
+                return
+            datos = self._buffer[cabecera : cabecera + longitud]
+            self._buffer = self._buffer[cabecera + longitud :]
+            self._ejecutar(comando, datos)
+
+    def _ejecutar(self, comando: int, datos: bytes):
+        """Aplica un comando sobre el estado de los canales y responde si corresponde"""
+        respuesta = None
+        with self._lock:
+            if comando == CMD_SET_MULTIPLE_TARGETS:
+                cantidad, primero = datos[0], datos[1]
+                valores = [
+                    datos[2 + 2 * i] | (datos[3 + 2 * i] << 7) for i in range(cantidad)
+                ]
+                for i, valor in enumerate(valores):
+                    self._fijar_objetivo(primero + i, valor)
+                registro = (primero, *valores)
+            elif comando in (0x84, 0x87, 0x89):
+                canal = datos[0]
+                valor = datos[1] | (datos[2] << 7)
+                if canal < len(self.canales):
+                    if comando == 0x84:
+                        self._fijar_objetivo(canal, valor)
+                    elif comando == 0x87:
+                        self.canales[canal].speed = valor
+                    else:
+                        self.canales[canal].acceleration = valor
+                registro = (canal, valor)
+            elif comando == 0x90:
+                canal = datos[0]
+                posicion = (
+                    int(round(self.canales[canal].position)) if canal < len(self.canales) else 0
+                )
+                respuesta = bytes([posicion & 0xFF, (posicion >> 8) & 0xFF])
+                registro = (canal,)
+            elif comando == 0x93:
+                respuesta = bytes([int(any(c.moving for c in self.canales))])
+                registro = ()
+            elif comando == 0xA1:
+                respuesta = b"\x00\x00"
+                registro = ()
+            else:  # Go Home: todos los canales se apagan
+                for i in range(len(self.canales)):
+                    self._fijar_objetivo(i, 0)
+                registro = ()
+
+        self._registrar(comando, registro)
+        if respuesta is not None:
+            os.write(self._master_fd, respuesta)
+
+    def _fijar_objetivo(self, canal: int, valor: int):
+        """Cambia el objetivo de un canal; un canal apagado arranca desde el objetivo"""
+        if canal >= len(self.canales):
+            return
+        estado = self.canales[canal]
+        estado.target = valor
+        if estado.position == 0:
+            estado.position = float(valor)
+
+    def posicion_us(self, canal: int) -> float:
+        """Devuelve la posición actual de un canal en microsegundos"""
+        with self._lock:
+            return self.canales[canal].position / 4
+
+
+def benchmark(emulador: MaestroEmulator):
+    """
+    Ejecuta las secuencias de movimiento contra el emulador y mide su duración.
+
+    Args:
+        emulador: Emulador ya iniciado
+    """
+    from Robot_Movement import move_arm
+    from Robot_Movement.calibration import calibrar_brazo
+    from Robot_Movement.grab import grab_object
+    from Robot_Movement.containers_movement import (
+        colocar_papel_y_carton,
+        colocar_plastico,
+        colocar_vidrio,
+        colocar_metal_y_bateria,
+    )
+
+    controlador = move_arm.conectar(emulador.port)
+    if controlador is None:
+        return
+
+    # Latencia de escritura de un comando en el driver
+    muestras = []
+    for _ in range(200):
+        inicio = time.perf_counter_ns()
+        controlador.set_target(10, 1008.00)
+        muestras.append(time.perf_counter_ns() - inicio)
+    muestras.sort()
+
+    secuencias = [
+        ("calibrar_brazo", calibrar_brazo),
+        ("grab_object", grab_object),
+        ("calibrar_brazo", calibrar_brazo),
+        ("colocar_papel_y_carton", colocar_papel_y_carton),
+        ("calibrar_brazo", calibrar_brazo),
+        ("colocar_plastico", colocar_plastico),
+        ("colocar_vidrio", colocar_vidrio),
+        ("colocar_metal_y_bateria", colocar_metal_y_bateria),
+    ]
+    tiempos = []
+    for nombre, secuencia in secuencias:
+        inicio = time.monotonic()
+        secuencia()
+        tiempos.append((nombre, time.monotonic() - inicio))
+
+    print("\n=== BENCHMARK MAESTRO EMULADA ===")
+    print(f"set_target p50: {muestras[len(muestras) // 2] / 1000:.1f} us")
+    print(f"set_target p99: {muestras[int(len(muestras) * 0.99)] / 1000:.1f} us")
+    for nombre, duracion in tiempos:
+        print(f"{nombre:<25} {duracion:6.3f} s")
+    print(f"{'Total':<25} {sum(d for _, d in tiempos):6.3f} s")
+    print(f"Comandos recibidos: {len(emulador.registro)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulador de la Pololu Maestro sobre un pty")
+    parser.add_argument("--log", help="Archivo donde registrar los comandos recibidos")
+    parser.add_argument("--verbose", action="store_true", help="Imprimir cada comando recibido")
+    parser.add_argument(
+        "--bench", action="store_true", help="Medir las secuencias de movimiento contra el emulador"
+    )
+    args = parser.parse_args()
+
+    emulador = MaestroEmulator(log_path=args.log, verbose=args.verbose)
+    emulador.start()
+
+    try:
+        if args.bench:
+            benchmark(emulador)
+        else:
+            print(f"Usa MAESTRO_PORT={emulador.port} para conectar el brazo. Ctrl+C para salir.")
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nDeteniendo emulador...")
+    finally:
+        emulador.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,188 @@
-import subprocess
-import os
+import atexit
+import time
+
+from Robot_Movement.maestro import MaestroController
+from Robot_Movement.trajectory import EjecutorTrayectoria, Trayectoria, TrayectoriaEscalonada
+
+# Canales de la Maestro para las articulaciones q1..q5 y la pinza
+CANALES_BRAZO = [0, 2, 4, 6, 8]
+CANAL_PINZA = 10
+
+# Límites de velocidad (0.25 us / 10 ms) y aceleración por canal. Con límites
+# la Maestro conoce el perfil del movimiento y puede reportar cuándo termina.
+VELOCIDADES = {0: 60, 2: 40, 4: 60, 6: 60, 8: 80, 10: 80}
+ACELERACIONES = {0: 0, 2: 0, 4: 0, 6: 0, 8: 0, 10: 0}
+
+# Tiempo que tarda el servo en alcanzar el pulso una vez la Maestro terminó la rampa
+MARGEN_ASENTAMIENTO = 0.15
+TIMEOUT_MOVIMIENTO = 4.0
+
+# Perfil de las trayectorias sincronizadas ('trapezoidal', 'quintica') o None
+# para enviar la pose final directamente y dejar la rampa a la Maestro
+PERFIL_MOVIMIENTO = "trapezoidal"
+
+_controlador = None
+_ejecutor = None
+
+
+def conectar(port=None):
+    """
+    Abre la conexión con la Maestro y configura los límites de cada canal.
+
+    Args:
+        port (str): Puerto serial a usar. Si es None se usa MAESTRO_PORT.
+
+    Returns:
+        MaestroController: Controlador conectado o None si no se pudo conectar
+    """
+    global _controlador, _ejecutor
+    if _controlador is not None:
+        _ejecutor.cancelar()
+        _controlador.disconnect()
+        # Cada reconexión registra su propio cierre; el del controlador viejo sobra
+        atexit.unregister(_controlador.disconnect)
+        _controlador = None
+
+    controlador = MaestroController() if port is None else MaestroController(port=port)
+    if not controlador.connect():
+        return None
+    for canal, velocidad in VELOCIDADES.items():
+        controlador.set_speed(canal, velocidad)
+    for canal, aceleracion in ACELERACIONES.items():
+        controlador.set_acceleration(canal, aceleracion)
+    _controlador = controlador
+    _ejecutor = EjecutorTrayectoria(controlador)
+    atexit.register(controlador.disconnect)
+    return _controlador
+
+
+def obtener_controlador():
+    """
+    Devuelve el controlador de la Maestro, abriendo el puerto la primera vez.
+
+    Returns:
+        MaestroController: Controlador conectado o None si no se pudo conectar
+    """
+    if _controlador is None:
+        return conectar()
+    return _controlador
+
 
 def mover_servo(numero_servo, posicion_us):
     """
-    Ejecuta el archivo C++ compilado para mover un servo de la Pololu Maestro.
+    Mueve un servo de la Pololu Maestro usando la conexión persistente.
 
     Args:
         numero_servo (int): El número del servo a mover (0, 2, 4, 6, 8, 10).
         posicion_us (int): La posición deseada del servo en microsegundos.
     """
-    try:
-        # Obtener la ruta del directorio donde está este archivo
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Construir la ruta completa al ejecutable
-        exe_path = os.path.join(current_dir, "control_brazo.exe")
-        
-        comando = [exe_path, str(numero_servo), str(posicion_us)]
-        resultado = subprocess.run(comando, capture_output=True, text=True, check=True)
+    controlador = obtener_controlador()
+    if controlador is None:
+        print(f"Error: No se pudo mover el servo {numero_servo}, la Maestro no está conectada")
+        return False
+
+    _ejecutor.cancelar()
+    if controlador.set_target(numero_servo, posicion_us):
         print(f"Servo {numero_servo} movido a posición {posicion_us}")
-        print(resultado.stdout)
-
-    except subprocess.CalledProcessError as e:
-        print(f"Error al ejecutar el programa C++: {e}")
-        print(f"Salida del error: {e.stderr}")
-    except FileNotFoundError:
-        print(f"Error: No se encontró el archivo {exe_path}")
-        print("Asegúrate de que control_brazo.exe esté en el directorio Robot_Movement/")
\ No newline at end of file
+        return True
+    return False
+
+
+def esperar_movimiento(canales=None, timeout=TIMEOUT_MOVIMIENTO):
+    """
+    Espera a que los servos indicados terminen de moverse.
+
+    Args:
+        canales (list): Canales a esperar, o None para esperar a todos.
+        timeout (float): Tiempo máximo de espera en segundos.
+
+    Returns:
+        bool: True si los servos se detuvieron, False si se agotó el tiempo.
+    """
+    controlador = obtener_controlador()
+    if controlador is None:
+        return False
+
+    # Una trayectoria en curso termina en un tiempo conocido; se espera a que
+    # acabe con el timeout como margen sobre su duración
+    if _ejecutor.en_curso and not _ejecutor.esperar(_ejecutor.trayectoria.duracion + timeout):
+        print(f"Advertencia: La trayectoria no terminó en {timeout} s")
+        return False
+
+    asentado = controlador.wait_until_settled(canales, timeout)
+    time.sleep(MARGEN_ASENTAMIENTO)
+    return asentado
+
+
+def move_pose(
+    pulsos,
+    pinza=None,
+    orden=None,
+    esperar=True,
+    timeout=TIMEOUT_MOVIMIENTO,
+    perfil=PERFIL_MOVIMIENTO,
+):
+    """
+    Mueve el brazo a una pose completa.
+
+    Por defecto todas las articulaciones (y la pinza, si se indica) siguen una
+    trayectoria sincronizada que se transmite a la Maestro, de modo que llegan
+    juntas en el tiempo mínimo. Sin perfil, o si aún no se conoce la pose
+    actual, la pose final se envía en una sola trama con "Set Multiple
+    Targets". Si se pasa un orden, los canales se mueven uno por uno para
+    evitar choques: con perfil como una trayectoria escalonada que también
+    puede ejecutarse sin bloquear; sin perfil esperando a que cada canal
+    llegue antes de mover el siguiente. Los canales de la pose que no están
+    en el orden se mueven juntos al final.
+
+    Args:
+        pulsos (list): Pulsos de q1..q5 en microsegundos, como los devuelve solucion().
+        pinza (float): Posición opcional de la pinza (canal 10) en microsegundos.
+        orden (list): Orden de canales para mover la pose de forma escalonada.
+        esperar (bool): Si es True, bloquea hasta que la pose se complete.
+        timeout (float): Tiempo máximo de espera por movimiento en segundos.
+        perfil (str): 'trapezoidal', 'quintica' o None para no generar trayectoria.
+    """
+    objetivos = {canal: pulsos[canal // 2] for canal in CANALES_BRAZO}
+    if pinza is not None:
+        objetivos[CANAL_PINZA] = pinza
+
+    if orden is not None:
+        omitidos = [canal for canal in orden if canal not in objetivos]
+        if omitidos:
+            print(f"Advertencia: Los canales {omitidos} del orden no forman parte de la pose, se omiten")
+            orden = [canal for canal in orden if canal in objetivos]
+
+    controlador = obtener_controlador()
+    if controlador is None:
+        print("Error: No se pudo mover el brazo, la Maestro no está conectada")
+        return False
+
+    _ejecutor.cancelar()
+    if perfil is not None and all(c in controlador.targets for c in objetivos):
+        # Partir del último objetivo enviado a cada canal (unidades de 0.25 us)
+        inicio = {c: controlador.targets[c] / 4 for c in objetivos}
+        if orden:
+            trayectoria = TrayectoriaEscalonada(inicio, objetivos, orden, perfil)
+            print(f"Trayectoria escalonada {orden} de {trayectoria.duracion:.2f} s hacia: {objetivos}")
+        else:
+            trayectoria = Trayectoria(inicio, objetivos, perfil)
+            print(f"Trayectoria {perfil} de {trayectoria.duracion:.2f} s hacia: {objetivos}")
+        _ejecutor.ejecutar(trayectoria, bloquear=False)
+    else:
+        if orden:
+            # Sin pose inicial conocida no hay trayectoria: se espera cada canal
+            for canal in orden:
+                if not mover_servo(canal, objetivos.pop(canal)):
+                    return False
+                if not esperar_movimiento([canal], timeout):
+                    return False
+            if not objetivos:
+                return True
+        if not controlador.set_multiple_targets(objetivos):
+            return False
+        print(f"Pose enviada: {objetivos}")
+
+    if esperar:
+        return esperar_movimiento(list(objetivos), timeout)
+    return True
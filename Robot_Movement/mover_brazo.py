@@ -1,29 +1,11 @@
-import subprocess
-
-def mover_servo(numero_servo, posicion_us):
-    """
-    Ejecuta el archivo C++ compilado para mover un servo de la Pololu Maestro.
-
-    Args:
-        numero_servo (int): El número del servo a mover (0, 2, 4, 6, 8, 10).
-        posicion_us (int): La posición deseada del servo en microsegundos.
-    """
-    try:
-        # Construye el comando para ejecutar el archivo C++ con los parámetros
-        comando = ["./control_brazo.exe", str(numero_servo), str(posicion_us)]
-
-        # Ejecuta el comando y captura la salida
-        resultado = subprocess.run(comando, capture_output=True, text=True, check=True)
-
-        # Imprime la salida del programa C++
-        print(resultado.stdout)
-
-    except subprocess.CalledProcessError as e:
-        # Si el programa C++ devuelve un error, imprime el error
-        print(f"Error al ejecutar el programa C++: {e}")
-        print(f"Salida del error: {e.stderr}")
-    except FileNotFoundError:
-        print("Error: No se encontró el archivo control_brazo.exe. Asegúrate de que esté en el mismo directorio.")
+import os
+import sys
+
+if __package__ in (None, ""):
+    # Ejecutado como script (python Robot_Movement/mover_brazo.py): los imports parten de la raíz del repositorio
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Robot_Movement.move_arm import mover_servo
 
 if __name__ == "__main__":
     servo_rangos = {
@@ -1,5 +1,8 @@
 from math import acos, sqrt, degrees, asin, atan2
-from Robot_Movement.angles import angulos_pulsos, pulsos, servo_calibration
+import hashlib
+import json
+import numpy as np
+from Robot_Movement.angles import angulos_pulsos, pulsos, pulsos_batch, servo_calibration
 
 # Calibrated link lengths (measure these precisely with calipers)
 e1, e2, e3, e4, e5, cinta_offset = (
@@ -12,6 +15,18 @@ e1, e2, e3, e4, e5, cinta_offset = (
 )  # Updated with precise measurements
 
 
+def huella_calibracion():
+    """Hash of servo_calibration and the link lengths, used to invalidate cached IK results"""
+    datos = json.dumps(
+        {
+            "servo_calibration": servo_calibration,
+            "links": [e1, e2, e3, e4, e5, cinta_offset],
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(datos.encode()).hexdigest()
+
+
 def solucion(x, y, z, orientacion, cinta=False, custom_offset=None):
 
     # Apply calibration
@@ -65,3 +80,71 @@ def solucion(x, y, z, orientacion, cinta=False, custom_offset=None):
 
 
     return pulses, newQ5
+
+
+def solucion_batch(xs, ys, orientaciones=0, cinta=False, offsets=None):
+    """
+    Vectorized version of solucion for many (x, y) targets at once.
+
+    Args:
+        xs, ys: Arrays of target coordinates in cm
+        orientaciones: Scalar or array of orientations in degrees
+        cinta: Scalar or array of booleans, as in solucion
+        offsets: Scalar or array of custom offsets; 0 or NaN uses cinta_offset
+
+    Returns:
+        pulses: (N, 5) array of pulses for q1..q5 (NaN where unreachable)
+        alcanzable: (N,) boolean reachability mask
+    """
+    xs, ys, orientaciones, cinta = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(xs, dtype=float)),
+        np.asarray(ys, dtype=float),
+        np.asarray(orientaciones, dtype=float),
+        np.asarray(cinta, dtype=bool),
+    )
+
+    # Apply calibration (same fallback as solucion: a falsy offset uses cinta_offset)
+    if offsets is None:
+        offset = np.full(xs.shape, cinta_offset)
+    else:
+        offsets = np.broadcast_to(np.asarray(offsets, dtype=float), xs.shape)
+        offset = np.where(np.isnan(offsets) | (offsets == 0), cinta_offset, offsets)
+    m = np.where(cinta, offset, 0)
+    a = e4 + e5 + m - e1
+
+    # Calculate base parameters
+    b = np.hypot(xs, ys)
+    c = np.hypot(a, b)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        q1 = np.degrees(np.arctan2(ys, xs))
+
+        alpha1 = np.arcsin(a / c)
+        alpha2 = np.arccos((c**2 + e2**2 - e3**2) / (2 * c * e2))
+        q2 = np.degrees(alpha2 + alpha1)
+
+        q3 = np.degrees(np.arccos((e2**2 + e3**2 - c**2) / (2 * e2 * e3)))
+
+        beta1 = np.arcsin(b / c)
+        beta2 = np.arccos((c**2 + e3**2 - e2**2) / (2 * c * e3))
+        q4 = np.degrees(beta1 + beta2)
+
+    # Reachable when the geometry holds and no acos/asin left its domain
+    angulos = np.stack([q1, q2, q3, q4, orientaciones], axis=1)
+    alcanzable = (a < c) & (b < c) & np.isfinite(angulos).all(axis=1)
+
+    # Ensure joints stay within limits
+    angulos[:, 1] = np.clip(
+        angulos[:, 1],
+        servo_calibration["q2"]["min_angle"],
+        servo_calibration["q2"]["max_angle"],
+    )
+    angulos[:, 2] = np.clip(
+        angulos[:, 2],
+        servo_calibration["q3"]["min_angle"],
+        servo_calibration["q3"]["max_angle"],
+    )
+
+    pulses = pulsos_batch(np.where(alcanzable[:, None], angulos, 0))
+    pulses[~alcanzable] = np.nan
+    return pulses, alcanzable
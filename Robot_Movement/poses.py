@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+
+from Robot_Movement.our_lugo_solution import huella_calibracion, solucion_batch
+
+# Poses fijas del brazo: (x, y, orientacion, cinta, custom_offset)
+POSES = {
+    "home": (6, 6, 0, True, 14),
+    "agarre": (15, 10, 0, True, None),
+    "papel_y_carton": (0, 19, 0, True, 6),
+    "plastico": (0, 1, 0, True, 13.8),
+    "vidrio": (2.5, -0.5, 0, True, 13.8),
+    "metal_y_bateria": (18, -6, 0, True, 6),
+}
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "poses_cache.json")
+
+
+def huella_poses():
+    """
+    Calcula la huella de la calibración y de las poses definidas.
+
+    Returns:
+        str: Hash que cambia si cambia servo_calibration, las longitudes o POSES
+    """
+    datos = json.dumps({"calibracion": huella_calibracion(), "poses": POSES}, sort_keys=True)
+    return hashlib.sha256(datos.encode()).hexdigest()
+
+
+def resolver_poses():
+    """
+    Resuelve todas las poses con una sola llamada a solucion_batch.
+
+    Returns:
+        dict: {nombre: lista de pulsos q1..q5}; las poses inalcanzables se omiten
+    """
+    nombres = list(POSES)
+    xs, ys, orientaciones, cintas, offsets = zip(*(POSES[n] for n in nombres))
+    offsets = [float("nan") if o is None else o for o in offsets]
+
+    pulsos, alcanzable = solucion_batch(xs, ys, orientaciones, cintas, offsets)
+
+    resueltas = {}
+    for i, nombre in enumerate(nombres):
+        if not alcanzable[i]:
+            print(f"Error: La pose '{nombre}' no es alcanzable por el robot")
+            continue
+        resueltas[nombre] = [float(p) for p in pulsos[i]]
+    return resueltas
+
+
+def cache_valida(cache, huella):
+    """
+    Comprueba que la caché leída corresponda a las poses actuales y tenga la forma esperada.
+
+    Args:
+        cache: Contenido del archivo de caché
+        huella (str): Huella actual de huella_poses()
+
+    Returns:
+        bool: True si la caché puede usarse tal cual
+    """
+    if not isinstance(cache, dict) or cache.get("huella") != huella:
+        return False
+    poses = cache.get("poses")
+    if not isinstance(poses, dict):
+        return False
+    return all(
+        isinstance(pulsos, list)
+        and len(pulsos) == 5
+        and all(isinstance(p, (int, float)) and not isinstance(p, bool) for p in pulsos)
+        for pulsos in poses.values()
+    )
+
+
+def cargar_poses(cache_path=CACHE_PATH):
+    """
+    Carga las poses desde el archivo de caché o las recalcula si está desactualizado.
+
+    Args:
+        cache_path (str): Ruta del archivo de caché
+
+    Returns:
+        dict: {nombre: lista de pulsos q1..q5}
+    """
+    huella = huella_poses()
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r") as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Caché de poses ilegible, se recalcula: {e}")
+            cache = None
+        if cache_valida(cache, huella):
+            return cache["poses"]
+
+    resueltas = resolver_poses()
+    try:
+        with open(cache_path, "w") as f:
+            json.dump({"huella": huella, "poses": resueltas}, f, indent=4)
+    except OSError as e:
+        print(f"No se pudo guardar la caché de poses: {e}")
+    return resueltas
+
+
+_poses = None
+
+
+def obtener_poses():
+    """
+    Devuelve las poses resueltas, cargándolas o calculándolas la primera vez.
+
+    Returns:
+        dict: {nombre: lista de pulsos q1..q5}
+    """
+    global _poses
+    if _poses is None:
+        _poses = cargar_poses()
+    return _poses
+
+
+def obtener_pose(nombre):
+    """
+    Devuelve los pulsos de una pose con nombre.
+
+    Args:
+        nombre (str): Nombre de la pose (ver POSES)
+
+    Returns:
+        list: Copia de los pulsos q1..q5, o None si la pose no existe o no es alcanzable
+    """
+    pulsos = obtener_poses().get(nombre)
+    if pulsos is None:
+        print(f"Error: La pose '{nombre}' no está disponible")
+        return None
+    return list(pulsos)
+
@@ -0,0 +1,268 @@
+import math
+import threading
+import time
+
+# Frecuencia de envío de objetivos: la Maestro genera un pulso cada 20 ms
+FRECUENCIA_STREAMING = 50
+
+# Aceleración máxima por canal en us/s^2
+ACELERACIONES_MAXIMAS = {0: 8000, 2: 6000, 4: 8000, 6: 8000, 8: 12000, 10: 12000}
+
+# Fracciones de aceleración probadas para el perfil trapezoidal sincronizado
+FRACCIONES_ACELERACION = [0.05 * i for i in range(1, 11)]
+
+# Velocidad y aceleración normalizadas máximas del perfil quíntico 10t^3 - 15t^4 + 6t^5
+QUINTICA_VELOCIDAD = 1.875
+QUINTICA_ACELERACION = 10 / math.sqrt(3)
+
+
+def velocidades_maximas():
+    """
+    Convierte los límites de velocidad de la Maestro a us/s.
+
+    Returns:
+        dict: {canal: velocidad máxima en us/s}
+    """
+    from Robot_Movement.move_arm import VELOCIDADES
+
+    # Unidades de la Maestro: 0.25 us cada 10 ms
+    return {canal: v * 0.25 / 0.01 for canal, v in VELOCIDADES.items() if v > 0}
+
+
+class Trayectoria:
+    def __init__(self, inicio, fin, perfil="trapezoidal", velocidades=None, aceleraciones=None):
+        """
+        Trayectoria sincronizada en espacio articular entre dos poses
+
+        Todas las articulaciones comparten la misma forma normalizada s(t/T),
+        de modo que arrancan y llegan juntas. La duración T es la mínima que
+        respeta los límites de velocidad y aceleración de cada canal.
+
+        Args:
+            inicio: Diccionario {canal: pulso en us} de la pose inicial
+            fin: Diccionario {canal: pulso en us} de la pose final
+            perfil: 'trapezoidal' o 'quintica'
+            velocidades: {canal: us/s}; por defecto los límites de move_arm
+            aceleraciones: {canal: us/s^2}; por defecto ACELERACIONES_MAXIMAS
+        """
+        if perfil not in ("trapezoidal", "quintica"):
+            raise ValueError(f"Perfil desconocido: {perfil}")
+
+        self.inicio = {canal: inicio.get(canal, fin[canal]) for canal in fin}
+        self.fin = dict(fin)
+        self.perfil = perfil
+        velocidades = velocidades or velocidades_maximas()
+        aceleraciones = aceleraciones or ACELERACIONES_MAXIMAS
+
+        distancias = {c: abs(self.fin[c] - self.inicio[c]) for c in self.fin}
+        limites = [
+            (d, velocidades.get(c, math.inf), aceleraciones.get(c, math.inf))
+            for c, d in distancias.items()
+            if d > 0
+        ]
+
+        self.fraccion = 0.0
+        self.duracion = 0.0
+        if not limites:
+            return
+
+        if perfil == "quintica":
+            self.duracion = max(
+                max(QUINTICA_VELOCIDAD * d / v, math.sqrt(QUINTICA_ACELERACION * d / a))
+                for d, v, a in limites
+            )
+        else:
+            # Para cada fracción de aceleración fa la velocidad pico normalizada es
+            # 1 / (1 - fa) y la aceleración 1 / (fa (1 - fa)); se elige la más rápida
+            mejores = []
+            for fa in FRACCIONES_ACELERACION:
+                duracion = max(
+                    max(d / (v * (1 - fa)), math.sqrt(d / (a * fa * (1 - fa))))
+                    for d, v, a in limites
+                )
+                mejores.append((duracion, fa))
+            self.duracion, self.fraccion = min(mejores)
+
+    def _forma(self, tau):
+        """Posición normalizada s(tau) en [0, 1] para tau en [0, 1]"""
+        if tau <= 0:
+            return 0.0
+        if tau >= 1:
+            return 1.0
+
+        if self.perfil == "quintica":
+            return tau**3 * (10 - 15 * tau + 6 * tau**2)
+
+        fa = self.fraccion
+        pico = 1 / (1 - fa)
+        if tau < fa:
+            return 0.5 * pico / fa * tau**2
+        if tau <= 1 - fa:
+            return pico * (tau - fa / 2)
+        resto = 1 - tau
+        return 1 - 0.5 * pico / fa * resto**2
+
+    def muestrear(self, t):
+        """
+        Evalúa la trayectoria en el tiempo t.
+
+        Args:
+            t (float): Tiempo en segundos desde el inicio
+
+        Returns:
+            dict: {canal: pulso en us}
+        """
+        s = 1.0 if self.duracion == 0 else self._forma(t / self.duracion)
+        return {c: self.inicio[c] + (self.fin[c] - self.inicio[c]) * s for c in self.fin}
+
+
+class TrayectoriaEscalonada:
+    def __init__(self, inicio, fin, orden, perfil="trapezoidal", velocidades=None, aceleraciones=None):
+        """
+        Mueve los canales de uno en uno siguiendo un orden
+
+        Cada canal del orden recorre su propio tramo mientras el resto queda
+        quieto; los canales que no están en el orden se mueven juntos en un
+        último tramo. Sirve para las poses en que mover todas las
+        articulaciones a la vez haría chocar el brazo.
+
+        Args:
+            inicio: Diccionario {canal: pulso en us} de la pose inicial
+            fin: Diccionario {canal: pulso en us} de la pose final
+            orden: Lista de canales en el orden en que se mueven
+            perfil: 'trapezoidal' o 'quintica'
+            velocidades: {canal: us/s}; por defecto los límites de move_arm
+            aceleraciones: {canal: us/s^2}; por defecto ACELERACIONES_MAXIMAS
+        """
+        self.inicio = {canal: inicio.get(canal, fin[canal]) for canal in fin}
+        self.fin = dict(fin)
+
+        grupos = [[canal] for canal in orden if canal in self.fin]
+        resto = [canal for canal in self.fin if canal not in orden]
+        if resto:
+            grupos.append(resto)
+
+        self.tramos = []
+        pose = dict(self.inicio)
+        for grupo in grupos:
+            tramo = Trayectoria(
+                {c: pose[c] for c in grupo},
+                {c: self.fin[c] for c in grupo},
+                perfil,
+                velocidades,
+                aceleraciones,
+            )
+            self.tramos.append(tramo)
+            pose.update(tramo.fin)
+        self.duracion = sum(tramo.duracion for tramo in self.tramos)
+
+    def muestrear(self, t):
+        """
+        Evalúa la trayectoria en el tiempo t.
+
+        Args:
+            t (float): Tiempo en segundos desde el inicio
+
+        Returns:
+            dict: {canal: pulso en us}
+        """
+        pose = dict(self.inicio)
+        for tramo in self.tramos:
+            pose.update(tramo.muestrear(t))
+            t -= tramo.duracion
+            if t < 0:
+                break
+        return pose
+
+
+class EjecutorTrayectoria:
+    def __init__(self, controlador, frecuencia=FRECUENCIA_STREAMING):
+        """
+        Envía una trayectoria a la Maestro a frecuencia fija sobre plazos monotónicos
+
+        Mientras se transmite, los canales quedan sin límite de velocidad para
+        que la Maestro siga exactamente los objetivos intermedios; al terminar
+        se restauran los límites de move_arm.
+
+        Args:
+            controlador: MaestroController conectado
+            frecuencia: Objetivos enviados por segundo
+        """
+        self.controlador = controlador
+        self.periodo = 1 / frecuencia
+        self.trayectoria = None
+        self.retraso_maximo = 0.0
+        self._hilo = None
+        self._cancelar = threading.Event()
+        self._completada = False
+
+    def ejecutar(self, trayectoria, bloquear=True):
+        """
+        Inicia la transmisión de una trayectoria, cancelando la anterior si existe.
+
+        Args:
+            trayectoria: Trayectoria a ejecutar
+            bloquear: Si es True espera a que la trayectoria termine
+
+        Returns:
+            bool: True si la trayectoria se envió completa (o se inició sin bloquear)
+        """
+        self.cancelar()
+        self.trayectoria = trayectoria
+        self._cancelar.clear()
+        self._completada = False
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+        if bloquear:
+            return self.esperar()
+        return True
+
+    def esperar(self, timeout=None):
+        """Espera a que termine la trayectoria en curso"""
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+            if self._hilo.is_alive():
+                return False
+        return self._completada
+
+    def cancelar(self):
+        """Detiene la trayectoria en curso en el último objetivo enviado"""
+        if self._hilo is not None and self._hilo.is_alive():
+            self._cancelar.set()
+            self._hilo.join()
+
+    @property
+    def en_curso(self):
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def _bucle(self):
+        from Robot_Movement.move_arm import ACELERACIONES, VELOCIDADES
+
+        trayectoria = self.trayectoria
+        canales = list(trayectoria.fin)
+        for canal in canales:
+            self.controlador.set_speed(canal, 0)
+            self.controlador.set_acceleration(canal, 0)
+
+        try:
+            inicio = time.monotonic()
+            siguiente = inicio
+            while not self._cancelar.is_set():
+                ahora = time.monotonic()
+                t = ahora - inicio
+                self.retraso_maximo = max(self.retraso_maximo, ahora - siguiente)
+                if not self.controlador.set_multiple_targets(trayectoria.muestrear(t)):
+                    return
+                if t >= trayectoria.duracion:
+                    self._completada = True
+                    return
+
+                siguiente += self.periodo
+                espera = siguiente - time.monotonic()
+                if espera > 0:
+                    self._cancelar.wait(espera)
+        finally:
+            for canal in canales:
+                self.controlador.set_speed(canal, VELOCIDADES.get(canal, 0))
+                self.controlador.set_acceleration(canal, ACELERACIONES.get(canal, 0))
@@ -1,9 +1,17 @@
 import cv2
 import numpy as np
-from keras.models import load_model
-from Cinta_Arduino.communication import ArduinoCommunication
+from Cinta_Arduino.communication import (
+    ArduinoCommunication,
+    PROTOCOL_BINARY,
+    PROTOCOL_TEXT,
+)
+from Model.camera_capture import CameraCapture
+from Model.detector_movimiento import EVENTO_QUIETO, METODO_DIFERENCIA, DetectorMovimiento
+from Model.zona_deteccion import cargar_zona, limites_zona, recortar_zona
+from Model.inferencia import AGREGACION_MEDIA, AGREGACION_VOTO, BACKEND_KERAS, cargar_cascada, cargar_motor
 from Robot_Movement.grab import grab_object
 from Robot_Movement.calibration import calibrar_brazo
+from Robot_Movement.move_arm import esperar_movimiento
 from Robot_Movement.containers_movement import (
     colocar_papel_y_carton,
     colocar_plastico,
@@ -12,11 +20,54 @@ from Robot_Movement.containers_movement import (
 )
 import time
 import threading
+import queue
 
-# Configuración del modelo
-MODEL_PATH = "Model/keras_model.h5"
+# Configuración del modelo. MODEL_BACKEND puede ser 'keras', 'tflite_fp16',
+# 'tflite_int8' (Model/convertir_tflite.py) u 'onnx' (Model/convertir_onnx.py);
+# solo 'keras' importa Keras al iniciar y 'onnx' no necesita TensorFlow
+MODEL_BACKEND = BACKEND_KERAS
+MODEL_PATH = None  # None usa el modelo por defecto del backend
 MODEL_IMAGE_SIZE = 224
 
+# Cascada opcional de modelos (reemplaza MODEL_BACKEND): cada objeto pasa
+# primero por el nivel rápido y solo escala al siguiente si la confianza no
+# alcanza su 'umbral'. Las salidas deben seguir el orden de labels_clasificacion;
+# un modelo con otro orden se declara con 'etiquetas' en todos los niveles. Ej.:
+# MODEL_CASCADA = [
+#     {"backend": "tflite_int8", "umbral": 0.9},
+#     {"backend": "keras"},
+# ]
+MODEL_CASCADA = None
+
+# Frames por objeto: se clasifican en un solo lote y sus probabilidades se
+# combinan (AGREGACION_MEDIA promedia logits, AGREGACION_VOTO vota) antes del
+# umbral de confianza. 1 clasifica un único frame como antes
+FRAMES_RAFAGA = 5
+AGREGACION_RAFAGA = AGREGACION_MEDIA
+
+# Confianza mínima para clasificar. Con AGREGACION_VOTO el valor es la
+# fracción de frames que votan por la clase y alcanza con igualar el umbral:
+# con 5 frames, 0.6 equivale a una mayoría de 3 de 5
+UMBRAL_CONFIANZA = 0.6
+UMBRAL_VOTO = 0.6
+
+# Protocolo del Arduino de la cinta. Con PROTOCOL_BINARY (binary_protocol.ino)
+# el host detiene y arranca la cinta con comandos confirmados
+ARDUINO_PROTOCOL = PROTOCOL_TEXT
+
+# Origen de los disparos: DISPARO_SENSOR usa solo el haz del Arduino,
+# DISPARO_VISION solo el detector de movimiento de la cámara y DISPARO_FUSION
+# arma con el haz y clasifica el primer frame en que el objeto quedó quieto
+DISPARO_SENSOR = "sensor"
+DISPARO_VISION = "vision"
+DISPARO_FUSION = "fusion"
+FUENTE_DISPARO = DISPARO_SENSOR
+METODO_MOVIMIENTO = METODO_DIFERENCIA  # o METODO_MOG2
+
+# Tiempo máximo que DISPARO_FUSION espera a que el objeto quede quieto
+# después del flanco antes de usar RETRASO_CAPTURA
+ESPERA_QUIETO = 2.0
+
 # Tamaño de la pantalla de visualización
 DISPLAY_WIDTH = 700
 DISPLAY_HEIGHT = 700
@@ -41,11 +92,45 @@ funciones_movimiento = {
     "Vidrio": colocar_vidrio,
 }
 
+# Categorías cuyo contenedor está bajo y requieren pasar por la posición cero
+# después de agarrar; el resto se coloca directamente desde la pose de agarre
+paso_intermedio = {
+    "Baterias": True,
+    "Carton": True,
+    "Metal": True,
+    "Papel": True,
+    "Plastico": False,
+    "Vidrio": False,
+}
+
+# Estados del ciclo de clasificación
+ESTADO_ESPERANDO = "Esperando objeto"
+ESTADO_CLASIFICANDO = "Clasificando..."
+ESTADO_AGARRANDO = "Agarrando objeto"
+ESTADO_COLOCANDO = "Colocando objeto"
+
+# Disparos del sensor pendientes de procesar
+MAX_DISPAROS_EN_COLA = 5
+MAX_REINTENTOS_CLASIFICACION = 2
+
+# Tiempo entre la interrupción del haz y el frame usado para clasificar
+RETRASO_CAPTURA = 1.0
+
 # Variables globales
 clasifying = False
-arduino = ArduinoCommunication(port="COM7")
-model = None
+estado_sistema = ESTADO_ESPERANDO
+cola_disparos = queue.Queue(maxsize=MAX_DISPAROS_EN_COLA)
+disparos_en_espera = 0
+disparos_descartados = 0
+objetos_clasificados = 0
+arduino = ArduinoCommunication(port="COM7", protocol=ARDUINO_PROTOCOL)
+motor = None
+detector = None
+zona_deteccion = None  # Zona de Model/zona_deteccion.json; None usa el frame completo
 cap = None
+captura = None
+ultimo_frame_ns = 0
+ultimo_instante_clasificado = 0  # Último frame usado por clasificar_objeto
 
 # Estado de las categorías para la interfaz visual
 categoria_activa = None
@@ -67,38 +152,13 @@ errores_camara = 0
 MAX_ERRORES_CAMARA = 10
 
 
-def cargar_modelo():
-    """Carga el modelo de clasificación desde archivo local."""
-    try:
-        print("Cargando modelo...")
-        model = load_model(MODEL_PATH, compile=False)
-        print("Modelo cargado exitosamente")
-        return model
-    except Exception as e:
-        print(f"Error al cargar el modelo: {e}")
-        return None
-
-
-def procesar_imagen(frame):
-    """Procesa una imagen con el modelo y retorna las predicciones."""
-    global model
-    if model is None:
+def procesar_imagen(frames):
+    """Procesa una ráfaga de imágenes en un solo lote y retorna las predicciones agregadas."""
+    if motor is None:
         return None
 
-    # Redimensionar la imagen para la predicción (700x700 -> 224x224)
-    image = cv2.resize(
-        frame, (MODEL_IMAGE_SIZE, MODEL_IMAGE_SIZE), interpolation=cv2.INTER_AREA
-    )
-
-    # Preparar la imagen para el modelo
-    image_array = np.asarray(image, dtype=np.float32).reshape(
-        1, MODEL_IMAGE_SIZE, MODEL_IMAGE_SIZE, 3
-    )
-    image_array = (image_array / 127.5) - 1
-
-    # Realizar la predicción
-    prediction = model.predict(image_array, verbose=0)
-    return prediction[0]
+    # El motor redimensiona (700x700 -> 224x224) y normaliza según su backend
+    return motor.predict_burst(frames, AGREGACION_RAFAGA)
 
 
 def obtener_clasificacion(prediction):
@@ -110,8 +170,12 @@ def obtener_clasificacion(prediction):
     max_index = np.argmax(prediction)
     max_prob = prediction[max_index]
 
-    # Solo clasificar si la probabilidad es mayor al 70%
-    if max_prob > 0.6:
+    # Solo clasificar con suficiente confianza (o mayoría de votos en la ráfaga)
+    if AGREGACION_RAFAGA == AGREGACION_VOTO:
+        confiable = max_prob >= UMBRAL_VOTO
+    else:
+        confiable = max_prob > UMBRAL_CONFIANZA
+    if confiable:
         categoria = labels_clasificacion[str(max_index)]
         return categoria, max_prob
     return None, 0
@@ -208,8 +272,8 @@ def dibujar_categorias(frame):
 
 
 def inicializar_camara():
-    """Inicializa la cámara."""
-    global cap
+    """Inicializa la cámara y el hilo de captura."""
+    global cap, captura, detector
 
     # Intentar diferentes índices de cámara
     for camera_index in [0, 1, 2]:
@@ -224,9 +288,16 @@ def inicializar_camara():
             # Dar tiempo a la cámara para inicializarse completamente
             time.sleep(1)
 
-            # Verificar que realmente se puede leer un frame
-            ret, test_frame = cap.read()
-            if ret and test_frame is not None:
+            # Verificar que realmente se puede leer un frame; desde aquí
+            # solo el hilo de captura lee la cámara
+            captura = CameraCapture(cap)
+            if FUENTE_DISPARO != DISPARO_SENSOR:
+                # El detector analiza cada frame dentro del hilo de captura
+                if detector is None:
+                    detector = DetectorMovimiento(zona_deteccion, METODO_MOVIMIENTO)
+                detector.reiniciar()
+                captura.agregar_observador(detector.procesar)
+            if captura.start():
                 print(f"Cámara {camera_index} inicializada exitosamente")
                 print(
                     f"Resolución configurada: {DISPLAY_WIDTH}x{DISPLAY_HEIGHT} píxeles"
@@ -247,10 +318,13 @@ def inicializar_camara():
 
 def reinicializar_camara():
     """Reinicializa la cámara si hay problemas."""
-    global cap, errores_camara
+    global cap, captura, errores_camara
     print("Reinicializando cámara...")
 
-    if cap is not None:
+    if captura is not None:
+        captura.stop()
+        captura = None
+    elif cap is not None:
         cap.release()
 
     time.sleep(2)  # Esperar antes de reintentar
@@ -259,93 +333,250 @@ def reinicializar_camara():
     return inicializar_camara()
 
 
-def procesar_clasificacion():
-    """Procesa la clasificación y mueve el robot."""
-    global clasifying, categoria_activa
+def clasificar_objeto(instante_ns=None):
+    """
+    Clasifica la ráfaga de frames capturada alrededor del instante de un disparo.
+
+    Sin instante (reintentos) se esperan frames nuevos, posteriores a los
+    del intento anterior. Retorna la categoría o None.
+    """
+    global ultimo_instante_clasificado
+    print("Fase 1: Clasificando objeto...")
+    if captura is None:
+        print("Error al capturar frame para clasificación: cámara no disponible")
+        return None
+
+    if instante_ns is None:
+        frames, instantes = captura.posteriores(ultimo_instante_clasificado, FRAMES_RAFAGA)
+    else:
+        frames, instantes = captura.rafaga(instante_ns, FRAMES_RAFAGA, timeout=RETRASO_CAPTURA + 1)
+        if not frames:
+            # Un disparo que esperó al brazo puede ser más viejo que el buffer;
+            # la cinta está detenida, así que se usan frames nuevos del objeto
+            atraso = (time.monotonic_ns() - instante_ns) / 1e9
+            print(f"El instante del disparo ({atraso:.1f} s atrás) ya no está en el buffer; se usan frames nuevos")
+            frames, instantes = captura.posteriores(time.monotonic_ns(), FRAMES_RAFAGA)
+    if not frames:
+        print("Error al capturar frame para clasificación")
+        return None
+    ultimo_instante_clasificado = instantes[-1]
+
+    print(f"Imágenes capturadas: {len(frames)} de {frames[0].shape[1]}x{frames[0].shape[0]} píxeles")
+
+    # Recortar la zona de agarre como vista, sin copiar ni redimensionar el resto del frame
+    frames = [recortar_zona(frame, zona_deteccion) for frame in frames]
+    print(
+        f"Zona {frames[0].shape[1]}x{frames[0].shape[0]} -> "
+        f"{MODEL_IMAGE_SIZE}x{MODEL_IMAGE_SIZE} píxeles para el modelo"
+    )
+
+    # Procesar la ráfaga completa con el modelo (se redimensiona internamente)
+    prediction = procesar_imagen(frames)
+
+    if prediction is None:
+        print("Error al procesar la imagen")
+        return None
+
+    clasificacion, probabilidad = obtener_clasificacion(prediction)
+
+    if not clasificacion:
+        print("No se pudo clasificar el objeto con suficiente confianza")
+        return None
+
+    print(
+        f"Objeto clasificado como: {clasificacion} (Probabilidad: {probabilidad:.2%})"
+    )
+
+    # Verificar que existe función de movimiento para esta clasificación
+    if clasificacion not in funciones_movimiento:
+        print(f"No hay función de movimiento definida para {clasificacion}")
+        return None
+
+    return clasificacion
+
+
+def leer_frame_interfaz():
+    """
+    Espera el siguiente frame del hilo de captura para la interfaz.
+
+    Retorna el frame (vista del buffer) o None si la cámara no entregó uno nuevo.
+    """
+    global ultimo_frame_ns
+    if captura is None or not captura.activa:
+        return None
+
+    frame, instante = captura.siguiente(ultimo_frame_ns, timeout=0.5, copiar=False)
+    if frame is None:
+        return None
+    ultimo_frame_ns = instante
+    return frame
 
+
+def cambiar_estado(estado, categoria=None):
+    """Actualiza el estado del ciclo y la categoría activa de forma thread-safe."""
+    global clasifying, estado_sistema, categoria_activa
     with lock_clasificacion:
-        if clasifying:
-            return
-        clasifying = True
-    print("Iniciando proceso de clasificación...")
+        estado_sistema = estado
+        clasifying = estado != ESTADO_ESPERANDO
+        categoria_activa = categoria
 
+
+def registrar_disparo(instante_ns):
+    """
+    Encola un disparo en lugar de descartarlo si el brazo está ocupado.
+
+    El instante es el del flanco del sensor o, con DISPARO_VISION, el del
+    frame estable; instante_clasificacion lo convierte en el frame a usar.
+    """
+    global disparos_en_espera, disparos_descartados
+    with lock_clasificacion:
+        if clasifying:
+            disparos_en_espera += 1
     try:
-        # PRIMERA FASE: Clasificación del objeto
-        print("Fase 1: Clasificando objeto...")
-        time.sleep(1)
-
-        # Obtener frame completo de la cámara
-        ret, frame = cap.read()
-        if not ret:
-            print("Error al capturar frame para clasificación")
-            return
+        cola_disparos.put_nowait(instante_ns)
+        print(f"Objeto detectado, disparos en cola: {cola_disparos.qsize()}")
+    except queue.Full:
+        with lock_clasificacion:
+            disparos_descartados += 1
+        print("Cola de disparos llena, objeto descartado")
 
-        print(f"Imagen capturada: {frame.shape[1]}x{frame.shape[0]} píxeles")
-        print(
-            f"Redimensionando a: {MODEL_IMAGE_SIZE}x{MODEL_IMAGE_SIZE} píxeles para el modelo"
-        )
 
-        # Procesar imagen completa con el modelo (se redimensiona internamente)
-        prediction = procesar_imagen(frame)
+def escuchar_sensor():
+    """Encola un disparo en cuanto el sensor reporta un flanco de subida."""
+    for flanco in arduino.edges():
+        if flanco.kind == "rising":
+            registrar_disparo(flanco.received_ns)
 
-        if prediction is None:
-            print("Error al procesar la imagen")
-            return
 
-        clasificacion, probabilidad = obtener_clasificacion(prediction)
+def escuchar_vision():
+    """Encola un disparo cada vez que la cámara ve un objeto llegar y quedarse quieto."""
+    for evento in detector.eventos():
+        if evento.tipo == EVENTO_QUIETO:
+            registrar_disparo(evento.instante_ns)
 
-        if not clasificacion:
-            print("No se pudo clasificar el objeto con suficiente confianza")
-            return
 
-        print(
-            f"Objeto clasificado como: {clasificacion} (Probabilidad: {probabilidad:.2%})"
-        )
+def instante_clasificacion(instante_ns):
+    """
+    Calcula el instante del frame a clasificar para un disparo de la cola.
 
-        # Actualizar categoría activa para la interfaz visual
-        with lock_clasificacion:
-            categoria_activa = clasificacion
+    Con DISPARO_FUSION espera aquí, en el hilo del ciclo y no en el del
+    sensor, el primer frame estable posterior al flanco.
+    """
+    if FUENTE_DISPARO == DISPARO_VISION:
+        return instante_ns
+    if FUENTE_DISPARO == DISPARO_FUSION and detector is not None:
+        evento = detector.esperar_evento(EVENTO_QUIETO, timeout=ESPERA_QUIETO, despues_ns=instante_ns)
+        if evento is not None:
+            return evento.instante_ns
+        print("El objeto no quedó quieto a tiempo, se usa el retraso fijo")
+    return instante_ns + int(RETRASO_CAPTURA * 1e9)
 
-        # SEGUNDA FASE: Movimiento del robot
-        print("Fase 2: Iniciando movimiento del robot...")
 
-        # Verificar que existe función de movimiento para esta clasificación
-        if clasificacion not in funciones_movimiento:
-            print(f"No hay función de movimiento definida para {clasificacion}")
-            return
+def objeto_presente():
+    """Indica si el objeto sigue en la zona de agarre según la fuente de disparo."""
+    if FUENTE_DISPARO == DISPARO_VISION and detector is not None:
+        return detector.objeto_presente
+    return bool(arduino.get_temp_value())
+
+
+def detener_cinta():
+    """Deshabilita la cinta para que no arranque al liberarse el haz durante el agarre."""
+    if ARDUINO_PROTOCOL == PROTOCOL_BINARY:
+        arduino.stop_belt()
 
-        # Capturar objeto
-        print("Capturando objeto...")
-        grab_object()
-        time.sleep(0.5)
-
-        # Calibrar brazo
-        print("Calibrando brazo...")
-        calibrar_brazo()
-        time.sleep(0.5)
-
-        # Mover objeto a su ubicación correspondiente
-        print(f"Movimiento objeto a ubicación de {clasificacion}...")
-        funciones_movimiento[clasificacion]()
-        print("Objeto colocado exitosamente")
-        time.sleep(0.5)
-
-        # Calibrar brazo nuevamente
-        print("Calibrando brazo final...")
-        calibrar_brazo()
-        time.sleep(0.5)
-
-    except Exception as e:
-        print(f"Error durante el proceso de clasificación: {e}")
-    finally:
-        with lock_clasificacion:
-            clasifying = False
-            categoria_activa = None  # Resetear categoría activa inmediatamente
-        print("Proceso de clasificación completado")
+
+def reanudar_cinta():
+    """Arranca la cinta de nuevo cuando la pinza ya dejó la zona de agarre."""
+    if ARDUINO_PROTOCOL == PROTOCOL_BINARY:
+        arduino.start_belt()
+
+
+def procesar_clasificacion():
+    """
+    Máquina de estados del ciclo de clasificación.
+
+    Toma disparos de la cola y, para cada uno, clasifica el objeto, lo agarra,
+    lo coloca en su contenedor e inicia el regreso a la posición cero sin
+    esperarlo. La clasificación del siguiente objeto se solapa con ese regreso;
+    el brazo solo se espera justo antes de volver a agarrar.
+    """
+    global objetos_clasificados
+    inicio = time.monotonic()
+
+    while True:
+        instante_ns = cola_disparos.get()
+        cambiar_estado(ESTADO_CLASIFICANDO)
+        cinta_reanudada = False
+
+        try:
+            # El sketch ya detuvo el motor al interrumpirse el haz. La parada
+            # confirmada se envía desde este hilo, el mismo que después envía
+            # el arranque, para que los dos comandos no se desordenen y el hilo
+            # del sensor nunca espere un ACK antes de encolar un disparo
+            detener_cinta()
+
+            # CLASIFICANDO: el brazo puede seguir regresando del ciclo anterior
+            clasificacion = None
+            for intento in range(MAX_REINTENTOS_CLASIFICACION + 1):
+                clasificacion = clasificar_objeto(
+                    instante_clasificacion(instante_ns) if intento == 0 else None
+                )
+                if clasificacion or not objeto_presente():
+                    break
+                print(f"Reintentando clasificación ({intento + 1}/{MAX_REINTENTOS_CLASIFICACION})")
+
+            if not clasificacion:
+                continue
+
+            # AGARRANDO: esperar a que el brazo termine de regresar
+            esperar_movimiento()
+            cambiar_estado(ESTADO_AGARRANDO, clasificacion)
+            print("Fase 2: Capturando objeto...")
+            if not grab_object():
+                print("Error al agarrar el objeto")
+                calibrar_brazo(esperar=False)
+                continue
+
+            # COLOCANDO
+            cambiar_estado(ESTADO_COLOCANDO, clasificacion)
+            if paso_intermedio.get(clasificacion, True):
+                print("Calibrando brazo...")
+                calibrar_brazo()
+                reanudar_cinta()
+                cinta_reanudada = True
+
+            print(f"Movimiento objeto a ubicación de {clasificacion}...")
+            funciones_movimiento[clasificacion]()
+            print("Objeto colocado exitosamente")
+            if not cinta_reanudada:
+                reanudar_cinta()
+                cinta_reanudada = True
+
+            # REGRESANDO: el brazo vuelve a la posición cero mientras se atiende el siguiente disparo
+            calibrar_brazo(esperar=False)
+
+            objetos_clasificados += 1
+            minutos = (time.monotonic() - inicio) / 60
+            print(
+                f"Objetos clasificados: {objetos_clasificados} "
+                f"({objetos_clasificados / minutos:.1f} por minuto)"
+            )
+
+        except Exception as e:
+            print(f"Error durante el proceso de clasificación: {e}")
+        finally:
+            # Si el ciclo falló la cinta vuelve a habilitarse; el sketch no la
+            # mueve mientras el objeto siga interrumpiendo el haz y la arranca
+            # en cuanto se libera
+            if not cinta_reanudada:
+                reanudar_cinta()
+            cambiar_estado(ESTADO_ESPERANDO)
+            cola_disparos.task_done()
+            print("Proceso de clasificación completado")
 
 
 def main():
-    global model, arduino, cap
+    global motor, arduino, cap, errores_camara, zona_deteccion
 
     print("Iniciando sistema de clasificación automática...")
     print(
@@ -353,11 +584,24 @@ def main():
     )
 
     # Cargar modelo
-    model = cargar_modelo()
-    if model is None:
+    if MODEL_CASCADA:
+        motor = cargar_cascada(MODEL_CASCADA, FRAMES_RAFAGA)
+    else:
+        motor = cargar_motor(MODEL_PATH, MODEL_IMAGE_SIZE, MODEL_BACKEND, FRAMES_RAFAGA)
+    if motor is None:
         print("No se pudo cargar el modelo. Saliendo...")
         return
 
+    # Zona de detección elegida con Model/video_detector_main.py
+    zona_deteccion = cargar_zona()
+    if zona_deteccion is None:
+        print("Sin zona de detección configurada, se clasifica el frame completo")
+    else:
+        print(
+            f"Zona de detección: centro ({zona_deteccion['zona_x']}, {zona_deteccion['zona_y']}), "
+            f"{zona_deteccion['tamano']} píxeles"
+        )
+
     # Inicializar cámara
     if not inicializar_camara():
         print("No se pudo inicializar la cámara.")
@@ -393,15 +637,29 @@ def main():
 
     print("Conectado exitosamente con Arduino")
 
-    # Función callback para procesar nuevos valores
-    def on_temp_update(temp_value):
-        return temp_value
-
     # Iniciar monitoreo
-    arduino.start_monitoring(callback=on_temp_update)
+    arduino.start_monitoring()
 
     calibrar_brazo()
-    time.sleep(1)
+
+    # Con el protocolo binario la cinta queda bajo control del host
+    if ARDUINO_PROTOCOL == PROTOCOL_BINARY and not arduino.start_belt():
+        print("Advertencia: Arduino no confirmó el arranque de la cinta")
+
+    # Hilo único del ciclo de clasificación para no congelar la interfaz
+    thread_clasificacion = threading.Thread(target=procesar_clasificacion)
+    thread_clasificacion.daemon = True
+    thread_clasificacion.start()
+
+    # Los disparos llegan por flancos del sensor o eventos de la cámara,
+    # sin depender del ritmo de la interfaz
+    if FUENTE_DISPARO == DISPARO_VISION and detector is not None:
+        thread_disparos = threading.Thread(target=escuchar_vision)
+    else:
+        thread_disparos = threading.Thread(target=escuchar_sensor)
+    thread_disparos.daemon = True
+    thread_disparos.start()
+    print(f"Fuente de disparo: {FUENTE_DISPARO}")
 
     print("Sistema listo. Presiona 'ESC' para salir")
     print("El sistema clasificará automáticamente cuando detecte un objeto")
@@ -413,8 +671,8 @@ def main():
                 frame = frame_prueba.copy()
             else:
                 try:
-                    ret, frame = cap.read()
-                    if not ret or frame is None:
+                    frame = leer_frame_interfaz()
+                    if frame is None:
                         errores_camara += 1
                         print(
                             f"Error al capturar frame de la cámara ({errores_camara}/{MAX_ERRORES_CAMARA}), reintentando..."
@@ -483,13 +741,19 @@ def main():
 
             # Mostrar estado actual
             with lock_clasificacion:
-                estado_actual = clasifying
-            estado = "Clasificando..." if estado_actual else "Esperando objeto"
+                estado = estado_sistema
             mostrar_estado(frame_mostrar, estado)
 
             # Dibujar categorías con sus cuadrados de colores
             dibujar_categorias(frame_mostrar)
 
+            # Marcar la zona que ve el modelo
+            if zona_deteccion is not None:
+                x1, y1, x2, y2 = limites_zona(
+                    zona_deteccion, frame_mostrar.shape[1], frame_mostrar.shape[0]
+                )
+                cv2.rectangle(frame_mostrar, (x1, y1), (x2, y2), (0, 255, 0), 2)
+
             # Mostrar instrucciones
             cv2.putText(
                 frame_mostrar,
@@ -505,31 +769,32 @@ def main():
             # Mostrar la imagen
             cv2.imshow("Sistema de Clasificacion Automatica", frame_mostrar)
 
-            # Verificar si hay un objeto para clasificar
-            temp = arduino.get_temp_value()
-            with lock_clasificacion:
-                clasificando_actual = clasifying
-            if temp and not clasificando_actual:
-                print("Objeto detectado, iniciando clasificación...")
-                # Procesar en un hilo separado para no congelar la interfaz
-                thread_clasificacion = threading.Thread(target=procesar_clasificacion)
-                thread_clasificacion.daemon = True
-                thread_clasificacion.start()
-
             # Capturar teclas
             key = cv2.waitKey(1) & 0xFF
             if key == 27:  # ESC
                 break
 
-            time.sleep(0.1)
-
     except KeyboardInterrupt:
         print("\nDeteniendo programa...")
     finally:
-        if cap:
+        if captura:
+            captura.stop()
+        elif cap:
             cap.release()
+        if detector is not None:
+            detector.detener()
+            print(f"Detector de movimiento: {detector.estadisticas()}")
         cv2.destroyAllWindows()
+        if ARDUINO_PROTOCOL == PROTOCOL_BINARY:
+            arduino.stop_belt()
+            print(f"Latencia de comandos de la cinta: {arduino.get_command_stats()}")
+            print(f"Enlace con Arduino: {arduino.get_link_stats()}")
         arduino.disconnect()
+        print(f"Latencia de inferencia: {motor.estadisticas()}")
+        print(
+            f"Objetos clasificados: {objetos_clasificados}, "
+            f"disparos en espera: {disparos_en_espera}, descartados: {disparos_descartados}"
+        )
         print("Programa terminado")
 
 
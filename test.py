@@ -1,4 +1,3 @@
-import time
 from Robot_Movement.calibration import calibrar_brazo
 from Robot_Movement.grab import grab_object
 from Robot_Movement.containers_movement import (
@@ -10,8 +9,7 @@ from Robot_Movement.containers_movement import (
 
 
 if __name__ == "__main__":
+    # Cada movimiento bloquea hasta que los servos se detienen
     calibrar_brazo()
-    time.sleep(2)
     colocar_vidrio()
-    time.sleep(2)
     calibrar_brazo()
\ No newline at end of file